@@ -1,2 +1,2 @@
 """API routes module."""
-from app.api.routes import health, documents, chat, agentic_chat
+from app.api.routes import health, documents, chat, agentic_chat, ingestion
@@ -3,14 +3,15 @@ API routes for Agentic SQL RAG.
 Alternative to document-map-based RAG.
 """
 from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from pydantic import BaseModel
 from typing import Optional
 import uuid
 
-from app.db.postgres import get_db
-from app.db.models import ChatHistory
+from app.db.postgres import get_db, get_session_maker
 from app.core.agentic_sql.agent import get_agentic_sql_agent
+from app.api.routes.chat import load_chat_history, save_chat_exchange, sse_event
 from sqlalchemy import select
 
 router = APIRouter()
@@ -30,6 +31,8 @@ class AgenticQueryResponse(BaseModel):
     iterations: int
     confidence: float
     session_id: str
+    rounds: list[dict] = []
+    usage: dict = {}
 
 
 @router.post("/query", response_model=AgenticQueryResponse)
@@ -42,28 +45,14 @@ async def agentic_query(
 
     The agent will:
     1. Analyze your question
-    2. Plan and execute SQL queries iteratively
+    2. Plan and execute SQL queries, refining over several rounds
+       until the results are sufficient
     3. Synthesize an answer from the results
 
     Returns the answer along with transparency into the queries executed.
     """
     # Get chat history if session provided
-    chat_history = []
-    if request.session_id:
-        result = await db.execute(
-            select(ChatHistory)
-            .where(
-                ChatHistory.session_id == request.session_id,
-                ChatHistory.workspace_id == request.workspace_id
-            )
-            .order_by(ChatHistory.created_at.desc())
-            .limit(10)
-        )
-        history_records = result.scalars().all()
-        chat_history = [
-            {"role": h.role, "content": h.content}
-            for h in reversed(history_records)
-        ]
+    chat_history = await load_chat_history(db, request.session_id, request.workspace_id)
 
     # Create agent and execute query
     agent = get_agentic_sql_agent(db, request.workspace_id)
@@ -73,24 +62,14 @@ async def agentic_query(
     session_id = request.session_id or f"agentic_{uuid.uuid4().hex[:12]}"
 
     # Store chat history
-    user_msg = ChatHistory(
+    await save_chat_exchange(
+        db,
         workspace_id=request.workspace_id,
         session_id=session_id,
-        role="user",
-        content=request.query
-    )
-    db.add(user_msg)
-
-    assistant_msg = ChatHistory(
-        workspace_id=request.workspace_id,
-        session_id=session_id,
-        role="assistant",
-        content=result["answer"],
+        query=request.query,
+        answer=result["answer"],
         citations=[{"sources": result["sources"], "queries": result["queries_executed"]}]
     )
-    db.add(assistant_msg)
-
-    await db.commit()
 
     return AgenticQueryResponse(
         answer=result["answer"],
@@ -99,7 +78,58 @@ async def agentic_query(
         reasoning_steps=result["reasoning_steps"],
         iterations=result["iterations"],
         confidence=result.get("confidence", 0.5),
-        session_id=session_id
+        session_id=session_id,
+        rounds=result["rounds"],
+        usage=result["usage"]
+    )
+
+
+@router.post("/query/stream")
+async def agentic_query_stream(request: AgenticQueryRequest) -> StreamingResponse:
+    """
+    Streaming variant of /query over Server-Sent Events.
+
+    Each event is a JSON object with a "type":
+    status, analysis and sql (per planning round), round (round statistics),
+    token (answer text), result (sources, queries, reasoning steps, usage),
+    done - or error.
+    Chat history is stored once the answer is complete.
+    """
+    session_id = request.session_id or f"agentic_{uuid.uuid4().hex[:12]}"
+
+    async def event_stream():
+        yield sse_event({"type": "status", "message": "Planning queries", "session_id": session_id})
+
+        try:
+            async with get_session_maker()() as db:
+                chat_history = await load_chat_history(db, request.session_id, request.workspace_id)
+                agent = get_agentic_sql_agent(db, request.workspace_id)
+
+                result = None
+                async for event in agent.query_stream(request.query, chat_history):
+                    if event["type"] == "result":
+                        result = event
+                    yield sse_event(event)
+
+                await save_chat_exchange(
+                    db,
+                    workspace_id=request.workspace_id,
+                    session_id=session_id,
+                    query=request.query,
+                    answer=result["answer"],
+                    citations=[{"sources": result["sources"], "queries": result["queries_executed"]}]
+                )
+                yield sse_event({"type": "done", "session_id": session_id})
+        except Exception as e:
+            yield sse_event({"type": "error", "message": str(e)})
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "Connection": "keep-alive",
+        },
     )
 
 
@@ -1,11 +1,16 @@
 """Chat/Query API routes."""
+import json
 from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, delete
 import uuid
 
-from app.db.postgres import get_db
+from app.config import get_settings
+from app.db.postgres import get_db, get_session_maker
 from app.db.models import ChatHistory
+from app.core.answer_cache import get_answer_cache
+from app.core.document_map import DocumentMapManager
 from app.core.gemini_client import get_gemini_client
 from app.core.retriever import IntelligentRetriever
 from app.schemas.chat import (
@@ -17,6 +22,11 @@ from app.schemas.chat import (
 
 router = APIRouter()
 
+NO_DOCUMENTS_ANSWER = (
+    "I couldn't find any relevant documents to answer your question. "
+    "Please upload some documents first."
+)
+
 
 @router.post("/query", response_model=ChatResponse)
 async def query_documents(
@@ -26,30 +36,36 @@ async def query_documents(
     """
     Query documents using intelligent retrieval.
 
-    1. Retrieve relevant documents via map consultation
-    2. Generate answer using Gemini
-    3. Store in chat history
+    1. Return a cached answer for repeated questions
+    2. Retrieve relevant documents via map consultation
+    3. Generate answer using Gemini
+    4. Store in chat history
     """
     gemini = get_gemini_client()
     retriever = IntelligentRetriever(db)
 
+    # Generate session ID if not provided
+    session_id = request.session_id or f"session_{uuid.uuid4().hex[:12]}"
+
     # Get chat history if session provided
-    chat_history = []
-    if request.session_id:
-        result = await db.execute(
-            select(ChatHistory)
-            .where(
-                ChatHistory.session_id == request.session_id,
-                ChatHistory.workspace_id == request.workspace_id
+    chat_history = await load_chat_history(db, request.session_id, request.workspace_id)
+
+    # Follow-up questions depend on history, so only fresh questions use the cache
+    cache_key, query_embedding = None, None
+    if not chat_history:
+        cached, cache_key, query_embedding = await lookup_cached_answer(db, request)
+        # Streamed answers are cached without a confidence; regenerate (and
+        # re-cache) them here rather than report a made-up one
+        if cached and "confidence" in cached:
+            await save_chat_exchange(
+                db,
+                workspace_id=request.workspace_id,
+                session_id=session_id,
+                query=request.query,
+                answer=cached["answer"],
+                citations=cached["citations"]
             )
-            .order_by(ChatHistory.created_at.desc())
-            .limit(10)
-        )
-        history_records = result.scalars().all()
-        chat_history = [
-            {"role": h.role, "content": h.content}
-            for h in reversed(history_records)
-        ]
+            return ChatResponse(**cached, session_id=session_id)
 
     # Retrieve relevant content
     retrieved = await retriever.retrieve(
@@ -60,7 +76,7 @@ async def query_documents(
 
     if not retrieved:
         return ChatResponse(
-            answer="I couldn't find any relevant documents to answer your question. Please upload some documents first.",
+            answer=NO_DOCUMENTS_ANSWER,
             citations=[],
             confidence=0.0,
             retrieved_docs=[]
@@ -73,37 +89,213 @@ async def query_documents(
         chat_history=chat_history
     )
 
-    # Generate session ID if not provided
-    session_id = request.session_id or f"session_{uuid.uuid4().hex[:12]}"
-
-    # Store user message
-    user_msg = ChatHistory(
+    await save_chat_exchange(
+        db,
         workspace_id=request.workspace_id,
         session_id=session_id,
-        role="user",
-        content=request.query
+        query=request.query,
+        answer=answer_result["answer"],
+        citations=answer_result.get("citations", [])
     )
-    db.add(user_msg)
 
-    # Store assistant response
-    assistant_msg = ChatHistory(
-        workspace_id=request.workspace_id,
-        session_id=session_id,
-        role="assistant",
-        content=answer_result["answer"],
-        citations=answer_result.get("citations", [])
+    answer = {
+        "answer": answer_result["answer"],
+        "citations": answer_result.get("citations", []),
+        "confidence": answer_result.get("confidence", 0.5),
+        "retrieved_docs": [r["id"] for r in retrieved]
+    }
+    get_answer_cache().set(cache_key, answer, query_embedding)
+
+    return ChatResponse(**answer, session_id=session_id)
+
+
+@router.post("/query/stream")
+async def query_documents_stream(request: ChatRequest) -> StreamingResponse:
+    """
+    Streaming variant of /query over Server-Sent Events.
+
+    Each event is a JSON object with a "type":
+    status, retrieval (selected doc ids), token (answer text),
+    citations (final), done - or error if anything fails.
+    Chat history is stored once the answer is complete.
+    """
+    gemini = get_gemini_client()
+    session_id = request.session_id or f"session_{uuid.uuid4().hex[:12]}"
+
+    async def event_stream():
+        yield sse_event({"type": "status", "message": "Consulting document map", "session_id": session_id})
+
+        try:
+            async with get_session_maker()() as db:
+                chat_history = await load_chat_history(db, request.session_id, request.workspace_id)
+
+                cache_key, query_embedding = None, None
+                if not chat_history:
+                    cached, cache_key, query_embedding = await lookup_cached_answer(db, request)
+                    if cached:
+                        yield sse_event({"type": "retrieval", "retrieved_docs": cached["retrieved_docs"], "cached": True})
+                        yield sse_event({"type": "token", "text": cached["answer"]})
+                        yield sse_event({
+                            "type": "citations",
+                            "citations": cached["citations"],
+                            "retrieved_docs": cached["retrieved_docs"]
+                        })
+                        await save_chat_exchange(
+                            db,
+                            workspace_id=request.workspace_id,
+                            session_id=session_id,
+                            query=request.query,
+                            answer=cached["answer"],
+                            citations=cached["citations"]
+                        )
+                        yield sse_event({"type": "done", "session_id": session_id})
+                        return
+
+                retrieved = await IntelligentRetriever(db).retrieve(
+                    query=request.query,
+                    workspace_id=request.workspace_id,
+                    max_documents=request.max_documents or 5
+                )
+                retrieved_docs = [r["id"] for r in retrieved]
+                yield sse_event({"type": "retrieval", "retrieved_docs": retrieved_docs})
+
+                if not retrieved:
+                    yield sse_event({"type": "token", "text": NO_DOCUMENTS_ANSWER})
+                    yield sse_event({"type": "citations", "citations": [], "retrieved_docs": []})
+                    yield sse_event({"type": "done", "session_id": session_id})
+                    return
+
+                answer_parts = []
+                async for text in gemini.stream_answer(
+                    query=request.query,
+                    retrieved_content=retrieved,
+                    chat_history=chat_history
+                ):
+                    answer_parts.append(text)
+                    yield sse_event({"type": "token", "text": text})
+
+                answer = "".join(answer_parts)
+                citations = gemini.extract_citations(answer, retrieved)
+                yield sse_event({
+                    "type": "citations",
+                    "citations": citations,
+                    "retrieved_docs": retrieved_docs
+                })
+
+                await save_chat_exchange(
+                    db,
+                    workspace_id=request.workspace_id,
+                    session_id=session_id,
+                    query=request.query,
+                    answer=answer,
+                    citations=citations
+                )
+                # Streaming does not compute a confidence, so none is cached
+                get_answer_cache().set(cache_key, {
+                    "answer": answer,
+                    "citations": citations,
+                    "retrieved_docs": retrieved_docs
+                }, query_embedding)
+                yield sse_event({"type": "done", "session_id": session_id})
+        except Exception as e:
+            yield sse_event({"type": "error", "message": str(e)})
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "Connection": "keep-alive",
+        },
     )
-    db.add(assistant_msg)
 
-    await db.commit()
 
-    return ChatResponse(
-        answer=answer_result["answer"],
-        citations=answer_result.get("citations", []),
-        confidence=answer_result.get("confidence", 0.5),
-        retrieved_docs=[r["id"] for r in retrieved],
-        session_id=session_id
+async def lookup_cached_answer(
+    db: AsyncSession,
+    request: ChatRequest
+) -> tuple[dict | None, tuple | None, list[float] | None]:
+    """
+    Look up a cached answer for request.
+
+    Returns:
+        (cached answer or None, cache key, query embedding) - pass the key
+        and embedding to AnswerCache.set once a fresh answer is generated.
+    """
+    cache = get_answer_cache()
+    if not cache.enabled:
+        return None, None, None
+
+    map_version = await DocumentMapManager(db).get_version(request.workspace_id)
+    cache_key = cache.make_key(
+        request.workspace_id, map_version, request.query, request.max_documents or 5
+    )
+
+    cached = cache.get(cache_key)
+    if cached or cache_key is None or not get_settings().answer_cache_semantic:
+        return cached, cache_key, None
+
+    try:
+        query_embedding = await get_gemini_client().embed_text(request.query)
+    except Exception as e:
+        print(f"[WARN] Answer cache embedding failed: {e}")
+        return None, cache_key, None
+
+    return cache.get_similar(cache_key, query_embedding), cache_key, query_embedding
+
+
+def sse_event(event: dict) -> str:
+    """Encode an event as a Server-Sent Events data line."""
+    return f"data: {json.dumps(event, default=str)}\n\n"
+
+
+async def load_chat_history(
+    db: AsyncSession,
+    session_id: str | None,
+    workspace_id: str
+) -> list[dict]:
+    """Load the last 10 messages of a session, oldest first."""
+    if not session_id:
+        return []
+
+    result = await db.execute(
+        select(ChatHistory)
+        .where(
+            ChatHistory.session_id == session_id,
+            ChatHistory.workspace_id == workspace_id
+        )
+        .order_by(ChatHistory.created_at.desc())
+        .limit(10)
     )
+    history_records = result.scalars().all()
+    return [
+        {"role": h.role, "content": h.content}
+        for h in reversed(history_records)
+    ]
+
+
+async def save_chat_exchange(
+    db: AsyncSession,
+    workspace_id: str,
+    session_id: str,
+    query: str,
+    answer: str,
+    citations: list[dict]
+) -> None:
+    """Store the user message and assistant response."""
+    db.add(ChatHistory(
+        workspace_id=workspace_id,
+        session_id=session_id,
+        role="user",
+        content=query
+    ))
+    db.add(ChatHistory(
+        workspace_id=workspace_id,
+        session_id=session_id,
+        role="assistant",
+        content=answer,
+        citations=citations
+    ))
+    await db.commit()
 
 
 @router.get("/history/{session_id}", response_model=ChatHistoryResponse)
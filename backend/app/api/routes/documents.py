@@ -5,21 +5,24 @@ from fastapi import APIRouter, UploadFile, File, HTTPException, Depends, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, delete
 from pydantic import BaseModel
-import tiktoken
 
 from app.db.postgres import get_db
 from app.db.models import Document, DocumentChunk
-from app.core.ocr_processor import get_ocr_processor, OCRProcessor
 from app.core.document_map import DocumentMapManager
-from app.core.agentic_sql.extractor import StructuredExtractor
+from app.core.ingestion import (
+    resolve_file_type,
+    process_file,
+    store_document,
+    extract_document
+)
 from app.core.agentic_sql.schemas import SQLDocument
+from app.db.weaviate import delete_document_vectors
 from app.schemas.document import (
     DocumentResponse,
     DocumentListResponse,
     DocumentUploadResponse,
     DocumentDeleteResponse
 )
-from app.config import get_settings
 
 router = APIRouter()
 
@@ -44,107 +47,6 @@ class ChunkListResponse(BaseModel):
     total: int
 
 
-async def process_markdown(file_bytes: bytes, filename: str) -> dict:
-    """
-    Process markdown/text files directly without OCR.
-
-    Returns same format as OCR processor for compatibility.
-    """
-    settings = get_settings()
-    tokenizer = tiktoken.get_encoding("cl100k_base")
-
-    # Decode content
-    try:
-        content = file_bytes.decode("utf-8")
-    except UnicodeDecodeError:
-        content = file_bytes.decode("latin-1")
-
-    # Count tokens
-    token_count = len(tokenizer.encode(content))
-
-    # Determine size class
-    size_class = "small" if token_count < settings.small_doc_threshold_tokens else "large"
-
-    result = {
-        "content": content,
-        "metadata": {
-            "filename": filename,
-            "token_count": token_count,
-            "file_type": "markdown"
-        },
-        "size_class": size_class,
-        "chunks": None
-    }
-
-    # Create chunks for large documents
-    if size_class == "large":
-        result["chunks"] = create_markdown_chunks(content, tokenizer, settings.chunk_size_tokens)
-
-    return result
-
-
-def create_markdown_chunks(content: str, tokenizer, max_tokens: int) -> list:
-    """Create chunks from markdown content using header boundaries."""
-    import re
-
-    # Split on markdown headers
-    header_pattern = r'\n(#{1,3}\s+.+)\n'
-    parts = re.split(header_pattern, content)
-
-    chunks = []
-    current_section = "Introduction"
-    current_content = ""
-
-    for part in parts:
-        if re.match(r'^#{1,3}\s+', part):
-            # This is a header
-            if current_content.strip():
-                chunks.append({
-                    "content": current_content.strip(),
-                    "section": current_section
-                })
-            current_section = part.strip('# \n')
-            current_content = part + "\n"
-        else:
-            test_content = current_content + part
-            test_tokens = len(tokenizer.encode(test_content))
-
-            if test_tokens > max_tokens and current_content.strip():
-                chunks.append({
-                    "content": current_content.strip(),
-                    "section": current_section
-                })
-                current_content = part
-            else:
-                current_content = test_content
-
-    if current_content.strip():
-        chunks.append({
-            "content": current_content.strip(),
-            "section": current_section
-        })
-
-    # Convert to expected format with metadata
-    enriched_chunks = []
-    for i, chunk in enumerate(chunks):
-        context_parts = [f"This is section '{chunk.get('section', 'Unknown')}' of the document."]
-        if i > 0:
-            context_parts.append(f"Previous section: '{chunks[i-1].get('section', 'Unknown')}'")
-        if i < len(chunks) - 1:
-            context_parts.append(f"Next section: '{chunks[i+1].get('section', 'Unknown')}'")
-
-        enriched_chunks.append({
-            "chunk_id": f"c{i+1}",
-            "position": f"{i+1}/{len(chunks)}",
-            "content": chunk["content"],
-            "section": chunk.get("section", f"Section {i+1}"),
-            "context": " ".join(context_parts),
-            "token_count": len(tokenizer.encode(chunk["content"]))
-        })
-
-    return enriched_chunks
-
-
 @router.post("/upload", response_model=DocumentUploadResponse)
 async def upload_document(
     file: UploadFile = File(...),
@@ -159,41 +61,26 @@ async def upload_document(
     Upload and process a document.
 
     1. OCR extraction using Gemini
-    2. Intelligence extraction for document map (if mode includes 'map')
-    3. Structured extraction to SQL tables (if mode includes 'sql')
-    4. Chunking if large document
-    5. Store in PostgreSQL
+    2. Chunking if large document
+    3. Store in PostgreSQL
+    4. Concurrently: intelligence extraction for document map (if mode
+       includes 'map') and structured extraction to SQL tables (if mode
+       includes 'sql')
 
     extraction_mode options:
     - "map_only": Only populate document map (original RAG)
     - "sql_only": Only populate SQL tables (agentic RAG)
     - "both": Populate both (default, recommended)
+
+    For large files or many files use the background queue (/api/ingestion/jobs).
     """
-    # Validate file type
-    allowed_types = {
-        "application/pdf": "pdf",
-        "image/png": "image",
-        "image/jpeg": "image",
-        "image/jpg": "image",
-        "image/webp": "image",
-        "text/markdown": "markdown",
-        "text/x-markdown": "markdown",
-        "text/plain": "text"  # Some systems send .md as text/plain
-    }
-
-    content_type = file.content_type
     filename = file.filename or ""
-
-    # Check if it's a markdown file by extension (some systems don't set correct MIME type)
-    if filename.lower().endswith(".md"):
-        file_type = "markdown"
-    elif content_type not in allowed_types:
+    file_type = resolve_file_type(filename, file.content_type)
+    if file_type is None:
         raise HTTPException(
             status_code=400,
-            detail=f"Unsupported file type: {content_type}. Supported: PDF, PNG, JPG, WEBP, MD"
+            detail=f"Unsupported file type: {file.content_type}. Supported: PDF, PNG, JPG, WEBP, MD"
         )
-    else:
-        file_type = allowed_types[content_type]
 
     # Read file
     file_bytes = await file.read()
@@ -202,72 +89,15 @@ async def upload_document(
     doc_id = f"doc_{uuid.uuid4().hex[:12]}"
 
     # Process document based on type
-    if file_type == "markdown":
-        # Markdown files - no OCR needed, just read the content
-        result = await process_markdown(file_bytes, filename)
-    elif file_type == "pdf":
-        ocr_processor = get_ocr_processor()
-        result = await ocr_processor.process_pdf(file_bytes, filename)
-    elif file_type == "text":
-        # Plain text files - similar to markdown
-        result = await process_markdown(file_bytes, filename)
-    else:
-        ocr_processor = get_ocr_processor()
-        result = await ocr_processor.process_image(file_bytes, filename, content_type)
-
-    # Store document
-    document = Document(
-        id=doc_id,
-        workspace_id=workspace_id,
-        filename=file.filename,
-        content=result["content"],
-        size_class=result["size_class"],
-        token_count=result["metadata"].get("token_count", 0),
-        doc_metadata=result["metadata"]
-    )
-    db.add(document)
-
-    # Store chunks if large document
-    if result["chunks"]:
-        for chunk in result["chunks"]:
-            db_chunk = DocumentChunk(
-                chunk_id=f"{doc_id}_{chunk['chunk_id']}",
-                document_id=doc_id,
-                content=chunk["content"],
-                section=chunk["section"],
-                context=chunk["context"],
-                position=chunk["position"],
-                token_count=chunk["token_count"]
-            )
-            db.add(db_chunk)
+    result = await process_file(file_bytes, filename, file.content_type, file_type)
 
-    await db.commit()
+    # Store document and chunks
+    await store_document(db, doc_id, workspace_id, file.filename, result)
 
-    doc_entry = None
-    sql_stats = None
-
-    # Update document map (original RAG)
-    if extraction_mode in ["map_only", "both"]:
-        map_manager = DocumentMapManager(db)
-        doc_entry = await map_manager.add_document(
-            workspace_id=workspace_id,
-            document_id=doc_id,
-            filename=file.filename,
-            content=result["content"],
-            size_class=result["size_class"],
-            chunks=result["chunks"]
-        )
-
-    # Extract to SQL tables (Agentic SQL RAG)
-    if extraction_mode in ["sql_only", "both"]:
-        extractor = StructuredExtractor(db)
-        sql_stats = await extractor.extract_and_store(
-            document_id=doc_id,
-            workspace_id=workspace_id,
-            filename=file.filename,
-            content=result["content"],
-            chunks=result["chunks"]
-        )
+    # Update document map, SQL tables and vectors concurrently
+    doc_entry, sql_stats = await extract_document(
+        doc_id, workspace_id, file.filename, result, extraction_mode
+    )
 
     return DocumentUploadResponse(
         id=doc_id,
@@ -387,6 +217,12 @@ async def delete_document(
     map_manager = DocumentMapManager(db)
     await map_manager.remove_document(workspace_id, document_id)
 
+    # Remove hybrid search vectors
+    try:
+        await delete_document_vectors(document_id)
+    except Exception as e:
+        print(f"[WARN] Could not delete vectors for {document_id}: {e}")
+
     return DocumentDeleteResponse(status="deleted", document_id=document_id)
 
 
@@ -1,13 +1,20 @@
 """Health check endpoints."""
 from fastapi import APIRouter
 
+from app.core.answer_cache import get_answer_cache
+from app.core.ocr_cache import get_ocr_cache
+
 router = APIRouter()
 
 
 @router.get("/health")
 async def health_check():
-    """Basic health check endpoint."""
-    return {"status": "healthy"}
+    """Basic health check endpoint with cache counters."""
+    return {
+        "status": "healthy",
+        "ocr_cache": get_ocr_cache().stats(),
+        "answer_cache": get_answer_cache().stats()
+    }
 
 
 @router.get("/ready")
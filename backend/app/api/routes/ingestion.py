@@ -0,0 +1,203 @@
+"""Background ingestion queue API routes."""
+import uuid
+from datetime import datetime
+from typing import Optional, List
+from fastapi import APIRouter, UploadFile, File, HTTPException, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, func
+
+from app.db.postgres import get_db
+from app.db.models import IngestionJob
+from app.core.ingestion import (
+    STAGES,
+    resolve_file_type,
+    enqueue_job,
+    get_ingestion_queue
+)
+from app.schemas.ingestion import (
+    IngestionJobResponse,
+    IngestionJobListResponse,
+    BulkIngestionResponse
+)
+
+router = APIRouter()
+
+
+def _job_response(job: IngestionJob) -> IngestionJobResponse:
+    """Convert job row to response schema."""
+    return IngestionJobResponse(
+        id=job.id,
+        workspace_id=job.workspace_id,
+        batch_id=job.batch_id,
+        filename=job.filename,
+        extraction_mode=job.extraction_mode,
+        status=job.status,
+        stages=job.stages or {},
+        document_id=job.document_id,
+        attempts=job.attempts or 0,
+        error=job.error,
+        created_at=job.created_at,
+        updated_at=job.updated_at
+    )
+
+
+@router.post("/jobs", response_model=IngestionJobResponse)
+async def create_job(
+    file: UploadFile = File(...),
+    workspace_id: str = "default",
+    extraction_mode: str = Query(
+        default="both",
+        description="Extraction mode: 'map_only', 'sql_only', or 'both'"
+    ),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Queue a document for background ingestion and return the job immediately.
+
+    Poll GET /jobs/{job_id} for per-stage progress (ocr, chunking, map, sql).
+    """
+    if resolve_file_type(file.filename, file.content_type) is None:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unsupported file type: {file.content_type}. Supported: PDF, PNG, JPG, WEBP, MD"
+        )
+
+    job = await enqueue_job(
+        db,
+        workspace_id=workspace_id,
+        filename=file.filename,
+        content_type=file.content_type,
+        file_bytes=await file.read(),
+        extraction_mode=extraction_mode
+    )
+    await db.commit()
+    get_ingestion_queue().notify()
+
+    return _job_response(job)
+
+
+@router.post("/jobs/bulk", response_model=BulkIngestionResponse)
+async def create_bulk_jobs(
+    files: List[UploadFile] = File(...),
+    workspace_id: str = "default",
+    extraction_mode: str = Query(
+        default="both",
+        description="Extraction mode: 'map_only', 'sql_only', or 'both'"
+    ),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Queue many documents at once under a shared batch id.
+
+    Unsupported files are reported in "rejected" instead of failing the batch.
+    """
+    batch_id = f"batch_{uuid.uuid4().hex[:12]}"
+    jobs = []
+    rejected = []
+
+    for file in files:
+        if resolve_file_type(file.filename, file.content_type) is None:
+            rejected.append({"filename": file.filename, "error": f"Unsupported file type: {file.content_type}"})
+            continue
+
+        jobs.append(await enqueue_job(
+            db,
+            workspace_id=workspace_id,
+            filename=file.filename,
+            content_type=file.content_type,
+            file_bytes=await file.read(),
+            extraction_mode=extraction_mode,
+            batch_id=batch_id
+        ))
+
+    await db.commit()
+    get_ingestion_queue().notify()
+
+    return BulkIngestionResponse(
+        batch_id=batch_id,
+        jobs=[_job_response(job) for job in jobs],
+        rejected=rejected
+    )
+
+
+@router.get("/jobs", response_model=IngestionJobListResponse)
+async def list_jobs(
+    workspace_id: str = "default",
+    status: Optional[str] = None,
+    batch_id: Optional[str] = None,
+    limit: int = Query(default=100, le=1000),
+    db: AsyncSession = Depends(get_db)
+):
+    """List ingestion jobs, newest first."""
+    filters = [IngestionJob.workspace_id == workspace_id]
+    if status:
+        filters.append(IngestionJob.status == status)
+    if batch_id:
+        filters.append(IngestionJob.batch_id == batch_id)
+
+    total = await db.scalar(select(func.count()).select_from(IngestionJob).where(*filters))
+    result = await db.execute(
+        select(IngestionJob)
+        .where(*filters)
+        .order_by(IngestionJob.created_at.desc())
+        .limit(limit)
+    )
+
+    return IngestionJobListResponse(
+        jobs=[_job_response(job) for job in result.scalars()],
+        total=total or 0
+    )
+
+
+@router.get("/jobs/{job_id}", response_model=IngestionJobResponse)
+async def get_job(job_id: str, db: AsyncSession = Depends(get_db)):
+    """Get job status and per-stage progress."""
+    job = await db.get(IngestionJob, job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return _job_response(job)
+
+
+@router.post("/jobs/{job_id}/retry", response_model=IngestionJobResponse)
+async def retry_job(
+    job_id: str,
+    stages: Optional[List[str]] = Query(
+        default=None,
+        description="Stages to re-run (default: the ones that did not finish)"
+    ),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Requeue a failed job.
+
+    Completed stages are kept; only failed/pending stages (or the given
+    stages) run again. Re-running ocr re-runs every later stage.
+    """
+    job = await db.get(IngestionJob, job_id, with_for_update=True)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    if job.status != "failed":
+        raise HTTPException(status_code=409, detail=f"Only failed jobs can be retried (job is {job.status})")
+
+    job_stages = dict(job.stages)
+    for stage in stages or []:
+        if stage not in STAGES or job_stages.get(stage) == "skipped":
+            raise HTTPException(status_code=400, detail=f"Unknown or skipped stage: {stage}")
+        job_stages[stage] = "pending"
+
+    # Every later stage consumes the OCR output
+    if job_stages["ocr"] != "done":
+        job.stage_result = None
+        for stage in STAGES[1:]:
+            if job_stages.get(stage, "skipped") != "skipped":
+                job_stages[stage] = "pending"
+
+    job.stages = {s: "pending" if state == "failed" else state for s, state in job_stages.items()}
+    job.status = "queued"
+    job.attempts = 0
+    job.error = None
+    job.available_at = datetime.utcnow()
+    await db.commit()
+    get_ingestion_queue().notify()
+
+    return _job_response(job)
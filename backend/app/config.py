@@ -23,6 +23,66 @@ class Settings(BaseSettings):
     chunk_size_tokens: int = 8000
     chunk_overlap_tokens: int = 500
 
+    # Map-reduce extraction: documents longer than one segment are extracted
+    # segment by segment concurrently, then merged and deduplicated
+    extraction_map_reduce_enabled: bool = True
+    extraction_segment_chars: int = 100000
+    extraction_max_concurrency: int = 4
+
+    # Page-parallel PDF OCR (PDFs longer than one range are split)
+    ocr_pages_per_range: int = 20
+    ocr_max_concurrency: int = 4
+    ocr_range_retry_rounds: int = 1
+
+    # OCR result cache (content-addressed, on local disk)
+    ocr_cache_enabled: bool = True
+    ocr_cache_dir: str | None = None  # defaults to {storage_path}/ocr_cache
+    ocr_cache_max_mb: int = 2048
+
+    # In-process document map cache (invalidated by the stored map version)
+    map_cache_enabled: bool = True
+
+    # Two-stage retrieval: BM25 pre-filter selects candidates for the map prompt
+    map_prefilter_threshold: int = 50  # only pre-filter maps with more documents
+    map_prefilter_top_k: int = 25
+
+    # Chat answer cache (keyed by case-folded query + document map version)
+    answer_cache_enabled: bool = True
+    answer_cache_max_entries: int = 1000
+    answer_cache_ttl_seconds: int = 3600
+    answer_cache_semantic: bool = False  # embed queries to match near-duplicates
+    answer_cache_similarity_threshold: float = 0.97  # negated questions embed close together
+
+    # Background ingestion queue (Postgres, SKIP LOCKED workers)
+    ingestion_workers: int = 2  # concurrent jobs per API process
+    ingestion_poll_seconds: float = 2.0
+    ingestion_max_attempts: int = 3
+    ingestion_retry_backoff_seconds: int = 30
+    ingestion_lock_timeout_seconds: int = 1800  # reclaim jobs from dead workers
+
+    # Hybrid retrieval: chunks are embedded into Weaviate on upload and searched
+    # with BM25 + vector search fused by reciprocal rank fusion (RRF)
+    vector_index_enabled: bool = True  # no-op while Weaviate is not connected
+    retrieval_mode: str = "map"  # map | hybrid (RRF only, no LLM) | hybrid_map (RRF picks map candidates)
+    hybrid_candidates: int = 50  # results taken from each of BM25 and vector search
+    hybrid_rrf_k: int = 60
+    embedding_batch_size: int = 100
+
+    # Weaviate async client; chunk inserts are gRPC insert_many batches whose
+    # size adapts to keep each batch near the target latency
+    weaviate_grpc_port: int = 50051
+    weaviate_batch_size: int = 100  # initial batch size
+    weaviate_batch_max: int = 1000
+    weaviate_batch_concurrency: int = 4
+    weaviate_batch_target_seconds: float = 1.0
+
+    # Agentic SQL: planned queries run concurrently on pooled read-only sessions
+    agent_max_rounds: int = 3  # plan -> execute -> reflect rounds before synthesis
+    agent_max_queries_per_round: int = 5
+    agent_result_token_budget: int = 8000  # summarized results per prompt
+    agent_query_concurrency: int = 4
+    agent_query_timeout_ms: int = 10000  # per-query statement_timeout
+
     # Gemini settings
     gemini_model: str = "gemini-3-flash-preview"
     gemini_research_model: str = "gemini-3-flash-preview"
@@ -34,6 +94,20 @@ class Settings(BaseSettings):
     research_max_sources_per_search: int = 15
     research_cache_ttl_hours: int = 24
 
+    # Claim embeddings: gemini (API) | local (ONNX model on CPU, needs fastembed).
+    # Switching provider or model requires re-embedding stored claims.
+    research_embedding_provider: str = "gemini"
+    research_embedding_local_model: str = "BAAI/bge-base-en-v1.5"  # 768-dim, matches pgvector column
+    research_embedding_batch_size: int = 100  # texts per API request / model batch
+    research_embedding_concurrency: int = 4  # concurrent Gemini requests
+    research_embedding_threads: int | None = None  # ONNX Runtime threads (default: all cores)
+
+    # Embedding cache (text hash + model + dimension -> float16 vector, SQLite, LRU)
+    research_embedding_cache_enabled: bool = True
+    research_embedding_cache_path: str | None = None  # defaults to {storage_path}/embedding_cache.sqlite3
+    research_embedding_cache_max_entries: int = 500000  # ~1.5 KB per 768-dim vector
+    research_dedup_block_size: int = 512  # claims per matrix product in bulk dedup (512 x n x 4 bytes)
+
     # Storage
     storage_path: str = "/app/storage"
 
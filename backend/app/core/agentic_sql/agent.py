@@ -2,14 +2,16 @@
 Agentic SQL RAG Agent.
 Uses Gemini for iterative query planning and execution.
 """
-from typing import Optional
+from typing import AsyncIterator, Optional
 import json
+import time
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.config import get_settings
 from app.core.gemini_client import get_gemini_client
 from app.core.agentic_sql.sql_tool import SQLQueryTool
 from app.core.agentic_sql.schemas import SQL_SCHEMA_DESCRIPTION
+from app.core.agentic_sql.result_summary import estimate_tokens, summarize_results
 
 
 AGENT_SYSTEM_PROMPT = """You are an intelligent document analyst with access to a SQL database containing structured information extracted from documents.
@@ -33,7 +35,7 @@ APPROACH:
    - Query sql_claims for factual statements
    - Query sql_metrics for numerical data
    - Query sql_entities to find information about specific companies/people
-   - Use sql_document_chunks as fallback for full text search
+   - Use search_text() for full text search instead of ILIKE on chunk_text or claim_text
 
 4. **Synthesize Answer**: Once you have sufficient data, compose a clear answer.
    - Cite specific data points from query results
@@ -65,6 +67,10 @@ FROM sql_entities e
 JOIN sql_documents d ON e.document_id = d.id
 WHERE e.entity_name ILIKE '%John Smith%'
 LIMIT 20;
+
+-- Ranked full-text search across chunks, claims and entities
+SELECT source, filename, section, content, rank
+FROM search_text('layoffs restructuring', '{workspace_id}', 10);
 ```
 
 Current workspace: {workspace_id}
@@ -79,12 +85,11 @@ class AgenticSQLAgent:
     """
     Agentic RAG using SQL queries and Gemini.
 
-    The agent iteratively:
-    1. Analyzes the question
-    2. Plans SQL queries
-    3. Executes queries
-    4. Evaluates results
-    5. Refines or synthesizes answer
+    The agent runs up to max_iterations rounds of:
+    1. Planning SQL queries (first round) or reflecting on the results so far
+    2. Executing the planned queries concurrently
+    and stops early once the model judges the results sufficient, then
+    synthesizes an answer. Results enter prompts as token-budgeted summaries.
     """
 
     def __init__(self, db: AsyncSession, workspace_id: str = "default"):
@@ -92,13 +97,17 @@ class AgenticSQLAgent:
         self.workspace_id = workspace_id
         self.settings = get_settings()
         self.gemini = get_gemini_client()
-        self.sql_tool = SQLQueryTool(db, workspace_id)
+        # Imported here: app.db.postgres imports this package's schemas
+        from app.db.postgres import get_session_maker
+
+        # Planned queries run concurrently, each on its own pooled read-only session
+        self.sql_tool = SQLQueryTool(db, workspace_id, get_session_maker())
 
     async def query(
         self,
         question: str,
         chat_history: Optional[list[dict]] = None,
-        max_iterations: int = 5
+        max_iterations: Optional[int] = None
     ) -> dict:
         """
         Answer a question using iterative SQL queries.
@@ -109,35 +118,230 @@ class AgenticSQLAgent:
                 "queries_executed": list[str],
                 "sources": list[str],
                 "reasoning_steps": list[str],
-                "iterations": int
+                "iterations": int,  (rounds run)
+                "rounds": list[dict],  (per-round queries, rows, latency, tokens)
+                "usage": dict  (totals including synthesis)
             }
         """
         from google.genai import types
 
-        queries_executed = []
-        sources = set()
-        reasoning_steps = []
-        all_results = []
+        state = self._new_state()
+        system_prompt = self._system_prompt()
+        async for _ in self._run_rounds(question, chat_history, max_iterations, system_prompt, state):
+            pass
+
+        # Generate final answer based on results
+        synthesis_prompt = f"""
+{self._synthesis_context(question, state["results"], system_prompt)}
+
+Based on the query results above, provide a JSON response with:
+{{
+    "answer": "Your comprehensive answer citing specific data from the results",
+    "confidence": 0.0-1.0,
+    "sources_used": ["list of document filenames used"],
+    "limitations": "Any gaps or limitations in the data"
+}}
+
+Be specific and cite actual values from the results. If the data is insufficient, say so clearly.
+"""
+
+        start = time.perf_counter()
+        final_response = await self.gemini.client.aio.models.generate_content(
+            model=self.gemini.model,
+            contents=[types.Part.from_text(text=synthesis_prompt)],
+            config=types.GenerateContentConfig(
+                response_mime_type="application/json"
+            )
+        )
+        synthesis_ms = (time.perf_counter() - start) * 1000
+
+        synthesis = self.gemini._parse_json_response(final_response.text)
+
+        return {
+            "answer": synthesis.get("answer", "I couldn't find sufficient information to answer this question."),
+            **self._result_fields(state, synthesis_ms, *self._usage(final_response, synthesis_prompt, final_response.text)),
+            "confidence": synthesis.get("confidence", 0.5),
+            "limitations": synthesis.get("limitations", "")
+        }
+
+    async def query_stream(
+        self,
+        question: str,
+        chat_history: Optional[list[dict]] = None,
+        max_iterations: Optional[int] = None
+    ) -> AsyncIterator[dict]:
+        """
+        Streaming variant of query.
+
+        Yields events as they happen:
+            {"type": "analysis", "round": int, "text": str}
+            {"type": "sql", "round": int, "sql": str, "purpose": str, "success": bool, "row_count": int}
+            {"type": "round", ...}  (per-round statistics, see query())
+            {"type": "token", "text": str}  (answer text, streamed)
+            {"type": "result", ...}  (same keys as query(), without confidence)
+        """
+        state = self._new_state()
+        system_prompt = self._system_prompt()
+        async for event in self._run_rounds(question, chat_history, max_iterations, system_prompt, state):
+            yield event
+
+        synthesis_prompt = f"""
+{self._synthesis_context(question, state["results"], system_prompt)}
+
+Based on the query results above, write your answer as plain text (not JSON).
+Be specific and cite actual values and document filenames from the results.
+If the data is insufficient, say so clearly and note any gaps or limitations.
+"""
+
+        start = time.perf_counter()
+        answer_parts = []
+        async for text in self.gemini.stream_text(synthesis_prompt):
+            answer_parts.append(text)
+            yield {"type": "token", "text": text}
+        synthesis_ms = (time.perf_counter() - start) * 1000
+        answer = "".join(answer_parts)
+
+        yield {
+            "type": "result",
+            "answer": answer or "I couldn't find sufficient information to answer this question.",
+            **self._result_fields(state, synthesis_ms, *self._usage(None, synthesis_prompt, answer))
+        }
+
+    @staticmethod
+    def _new_state() -> dict:
+        """Accumulators shared by the round loop and synthesis."""
+        return {
+            "queries_executed": [],
+            "sources": set(),
+            "reasoning_steps": [],
+            "results": [],  # successful and failed query results, in execution order
+            "rounds": []
+        }
+
+    async def _run_rounds(
+        self,
+        question: str,
+        chat_history: Optional[list[dict]],
+        max_rounds: Optional[int],
+        system_prompt: str,
+        state: dict
+    ) -> AsyncIterator[dict]:
+        """
+        Plan, execute and reflect until the model reports sufficient results,
+        proposes no new queries, or max_rounds is reached. Updates state and
+        yields analysis, sql and round events.
+        """
+        max_rounds = max_rounds or self.settings.agent_max_rounds
+
+        for round_number in range(1, max_rounds + 1):
+            start = time.perf_counter()
+            if round_number == 1:
+                plan, prompt_tokens, output_tokens = await self._plan(question, chat_history, system_prompt)
+            else:
+                plan, prompt_tokens, output_tokens = await self._reflect(
+                    question, chat_history, system_prompt, state["results"]
+                )
+            plan_ms = (time.perf_counter() - start) * 1000
+
+            analysis = plan.get("analysis", "Analyzing question")
+            state["reasoning_steps"].append(analysis)
+            yield {"type": "analysis", "round": round_number, "text": analysis}
+
+            # Skip queries already run in an earlier round
+            planned = [
+                (sql, purpose)
+                for sql, purpose in self._planned_queries(plan, self.settings.agent_max_queries_per_round)
+                if sql not in state["queries_executed"]
+            ]
+            sufficient = round_number > 1 and bool(plan.get("sufficient"))
+            if sufficient:
+                planned = []
+
+            start = time.perf_counter()
+            results = await self._run_queries(planned, state["sources"]) if planned else []
+            sql_ms = (time.perf_counter() - start) * 1000
+
+            for (sql, purpose), result in zip(planned, results):
+                state["queries_executed"].append(sql)
+                state["reasoning_steps"].append(f"Query: {purpose}")
+                state["results"].append(result)
+                yield {
+                    "type": "sql",
+                    "round": round_number,
+                    "sql": sql,
+                    "purpose": purpose,
+                    "success": "error" not in result,
+                    "row_count": len(result.get("data", []))
+                }
+
+            stats = {
+                "round": round_number,
+                "queries": len(planned),
+                "rows": sum(len(r.get("data", [])) for r in results),
+                "plan_ms": round(plan_ms, 1),
+                "sql_ms": round(sql_ms, 1),
+                "prompt_tokens": prompt_tokens,
+                "output_tokens": output_tokens,
+                "sufficient": sufficient
+            }
+            state["rounds"].append(stats)
+            yield {"type": "round", **stats}
+
+            if not planned:
+                break
+
+    def _result_fields(
+        self,
+        state: dict,
+        synthesis_ms: float,
+        synthesis_prompt_tokens: int,
+        synthesis_output_tokens: int
+    ) -> dict:
+        """Response fields shared by query() and query_stream()."""
+        rounds = state["rounds"]
+        return {
+            "queries_executed": state["queries_executed"],
+            "sources": list(state["sources"]),
+            "reasoning_steps": state["reasoning_steps"],
+            "iterations": len(rounds),
+            "rounds": rounds,
+            "usage": {
+                "prompt_tokens": sum(r["prompt_tokens"] for r in rounds) + synthesis_prompt_tokens,
+                "output_tokens": sum(r["output_tokens"] for r in rounds) + synthesis_output_tokens,
+                "plan_ms": round(sum(r["plan_ms"] for r in rounds), 1),
+                "sql_ms": round(sum(r["sql_ms"] for r in rounds), 1),
+                "synthesis_ms": round(synthesis_ms, 1)
+            }
+        }
 
-        # Build initial prompt
-        system_prompt = AGENT_SYSTEM_PROMPT.format(
+    def _system_prompt(self) -> str:
+        """Agent system prompt for this workspace."""
+        return AGENT_SYSTEM_PROMPT.format(
             schema_description=SQL_SCHEMA_DESCRIPTION,
             workspace_id=self.workspace_id
         )
 
-        # Include chat history context
-        history_context = ""
-        if chat_history:
-            history_context = "\n\nPrevious conversation:\n" + "\n".join([
-                f"{msg['role'].upper()}: {msg['content']}"
-                for msg in chat_history[-5:]
-            ])
-
-        # Initial planning call
+    @staticmethod
+    def _history_context(chat_history: Optional[list[dict]]) -> str:
+        """Recent chat history for planning prompts."""
+        if not chat_history:
+            return ""
+        return "\n\nPrevious conversation:\n" + "\n".join([
+            f"{msg['role'].upper()}: {msg['content']}"
+            for msg in chat_history[-5:]
+        ])
+
+    async def _plan(
+        self,
+        question: str,
+        chat_history: Optional[list[dict]],
+        system_prompt: str
+    ) -> tuple[dict, int, int]:
+        """Ask Gemini for an analysis and the SQL queries to run; returns (plan, prompt tokens, output tokens)."""
         planning_prompt = f"""
 {system_prompt}
 
-{history_context}
+{self._history_context(chat_history)}
 
 USER QUESTION: {question}
 
@@ -151,81 +355,112 @@ First, analyze this question and provide a JSON response with:
 
 Plan 1-3 queries to answer the question.
 """
+        return await self._generate_plan(planning_prompt)
 
-        response = await self.gemini.client.aio.models.generate_content(
-            model=self.gemini.model,
-            contents=[types.Part.from_text(text=planning_prompt)],
-            config=types.GenerateContentConfig(
-                response_mime_type="application/json"
-            )
-        )
-
-        plan = self.gemini._parse_json_response(response.text)
-        reasoning_steps.append(plan.get("analysis", "Analyzing question"))
-
-        # Execute planned queries
-        for query_plan in plan.get("queries", [])[:max_iterations]:
-            sql = query_plan.get("sql", "")
-            purpose = query_plan.get("purpose", "")
-
-            if sql:
-                queries_executed.append(sql)
-                reasoning_steps.append(f"Query: {purpose}")
-
-                result = await self.sql_tool.execute(sql, purpose)
-                result_data = json.loads(result)
-
-                if result_data.get("success"):
-                    all_results.append({
-                        "query": sql,
-                        "purpose": purpose,
-                        "data": result_data.get("data", [])
-                    })
-
-                    # Extract source documents
-                    for row in result_data.get("data", []):
-                        if "filename" in row:
-                            sources.add(row["filename"])
-
-        # Generate final answer based on results
-        synthesis_prompt = f"""
+    async def _reflect(
+        self,
+        question: str,
+        chat_history: Optional[list[dict]],
+        system_prompt: str,
+        results: list[dict]
+    ) -> tuple[dict, int, int]:
+        """Ask Gemini whether the results so far suffice, and for follow-up queries if not."""
+        reflection_prompt = f"""
 {system_prompt}
 
+{self._history_context(chat_history)}
+
 USER QUESTION: {question}
 
-QUERY RESULTS:
-{json.dumps(all_results, indent=2, default=str)}
+QUERIES RUN SO FAR AND THEIR RESULTS (summarized):
+{json.dumps(summarize_results(results, self.settings.agent_result_token_budget), default=str)}
 
-Based on the query results above, provide a JSON response with:
+Decide whether these results are sufficient to answer the question and provide a JSON response with:
 {{
-    "answer": "Your comprehensive answer citing specific data from the results",
-    "confidence": 0.0-1.0,
-    "sources_used": ["list of document filenames used"],
-    "limitations": "Any gaps or limitations in the data"
+    "sufficient": true/false,
+    "analysis": "What the results show and what is still missing",
+    "queries": [
+        {{"sql": "SELECT ...", "purpose": "Why this query"}}
+    ]
 }}
 
-Be specific and cite actual values from the results. If the data is insufficient, say so clearly.
+If results were empty or failed, fix the SQL or try other tables, broader filters or search_text().
+Do not repeat queries that were already run. Leave "queries" empty when sufficient is true.
 """
+        return await self._generate_plan(reflection_prompt)
 
-        final_response = await self.gemini.client.aio.models.generate_content(
+    async def _generate_plan(self, prompt: str) -> tuple[dict, int, int]:
+        """Run a planning prompt; returns (parsed JSON, prompt tokens, output tokens)."""
+        from google.genai import types
+
+        response = await self.gemini.client.aio.models.generate_content(
             model=self.gemini.model,
-            contents=[types.Part.from_text(text=synthesis_prompt)],
+            contents=[types.Part.from_text(text=prompt)],
             config=types.GenerateContentConfig(
                 response_mime_type="application/json"
             )
         )
 
-        synthesis = self.gemini._parse_json_response(final_response.text)
+        return (self.gemini._parse_json_response(response.text), *self._usage(response, prompt, response.text))
+
+    @staticmethod
+    def _usage(response, prompt: str, output: str) -> tuple[int, int]:
+        """(prompt, output) token counts from usage metadata, estimated when missing."""
+        usage = getattr(response, "usage_metadata", None)
+        prompt_tokens = getattr(usage, "prompt_token_count", None)
+        output_tokens = getattr(usage, "candidates_token_count", None)
+        return (
+            prompt_tokens if prompt_tokens is not None else estimate_tokens(prompt),
+            output_tokens if output_tokens is not None else estimate_tokens(output or "")
+        )
 
-        return {
-            "answer": synthesis.get("answer", "I couldn't find sufficient information to answer this question."),
-            "queries_executed": queries_executed,
-            "sources": list(sources),
-            "reasoning_steps": reasoning_steps,
-            "iterations": len(queries_executed),
-            "confidence": synthesis.get("confidence", 0.5),
-            "limitations": synthesis.get("limitations", "")
-        }
+    @staticmethod
+    def _planned_queries(plan: dict, max_queries: int) -> list[tuple[str, str]]:
+        """(sql, purpose) pairs from a plan, skipping entries without SQL."""
+        return [
+            (query_plan["sql"], query_plan.get("purpose", ""))
+            for query_plan in (plan.get("queries") or [])[:max_queries]
+            if query_plan.get("sql")
+        ]
+
+    async def _run_queries(
+        self,
+        planned: list[tuple[str, str]],
+        sources: set
+    ) -> list[dict]:
+        """
+        Execute planned queries concurrently.
+
+        Returns one entry per query: {"query", "purpose", "data"} or, for a
+        failed query, {"query", "purpose", "error"}.
+        """
+        results = []
+        for (sql, purpose), result_data in zip(planned, await self.sql_tool.execute_many(planned)):
+            if not result_data.get("success"):
+                results.append({"query": sql, "purpose": purpose, "error": result_data.get("error", "")})
+                continue
+
+            # Extract source documents
+            for row in result_data.get("data", []):
+                if "filename" in row:
+                    sources.add(row["filename"])
+
+            results.append({
+                "query": sql,
+                "purpose": purpose,
+                "data": result_data.get("data", [])
+            })
+        return results
+
+    def _synthesis_context(self, question: str, results: list[dict], system_prompt: str) -> str:
+        """Shared prompt head for answer synthesis, with budgeted result summaries."""
+        successful = [r for r in results if "error" not in r]
+        return f"""{system_prompt}
+
+USER QUESTION: {question}
+
+QUERY RESULTS (summarized):
+{json.dumps(summarize_results(successful, self.settings.agent_result_token_budget), default=str)}"""
 
 
 def get_agentic_sql_agent(db: AsyncSession, workspace_id: str = "default") -> AgenticSQLAgent:
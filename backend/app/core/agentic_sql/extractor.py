@@ -2,16 +2,26 @@
 Extract structured data from documents and populate SQL tables.
 Uses Gemini to decompose documents into relational data.
 """
+import asyncio
+import re
+from collections import Counter
 from datetime import datetime, date
 from typing import Optional
+from sqlalchemy import insert
 from sqlalchemy.ext.asyncio import AsyncSession
+from tenacity import retry, stop_after_attempt, wait_exponential
 
+from app.config import get_settings
+from app.core.chunker import split_into_segments
 from app.core.gemini_client import get_gemini_client
 from app.core.agentic_sql.schemas import (
     SQLDocument, SQLClaim, SQLMetric, SQLEntity, SQLTopic,
     SQLRelationship, SQLDocumentChunk
 )
 
+# Postgres accepts at most 32767 bind parameters per statement
+MAX_BIND_PARAMS = 32767
+
 
 STRUCTURED_EXTRACTION_PROMPT = """
 You are a data extraction specialist. Extract structured information from this document
@@ -111,6 +121,7 @@ class StructuredExtractor:
     def __init__(self, db: AsyncSession):
         self.db = db
         self.gemini = get_gemini_client()
+        self.settings = get_settings()
 
     async def extract_and_store(
         self,
@@ -169,14 +180,53 @@ class StructuredExtractor:
         }
 
     async def _extract_structured_data(self, filename: str, content: str) -> dict:
-        """Use Gemini to extract structured data."""
-        from google.genai import types
+        """
+        Use Gemini to extract structured data.
+
+        Documents longer than one segment are extracted with map-reduce
+        (when enabled), otherwise truncated to fit a single prompt.
+        """
+        if self.settings.extraction_map_reduce_enabled and len(content) > self.settings.extraction_segment_chars:
+            return await self._extract_map_reduce(filename, content)
 
         # Truncate for context limits
         max_chars = 300000
         if len(content) > max_chars:
             content = content[:int(max_chars * 0.7)] + "\n...\n" + content[-int(max_chars * 0.2):]
 
+        return await self._extract_segment(filename, content)
+
+    async def _extract_map_reduce(self, filename: str, content: str) -> dict:
+        """
+        Extract each segment concurrently, then merge the results.
+
+        Segments that fail after retries are skipped; fails only if all do.
+        """
+        segments = split_into_segments(content, self.settings.extraction_segment_chars)
+        semaphore = asyncio.Semaphore(self.settings.extraction_max_concurrency)
+
+        async def extract(index: int, segment: str) -> Optional[dict]:
+            label = f"{filename} (part {index + 1} of {len(segments)})"
+            async with semaphore:
+                try:
+                    return await self._extract_segment(label, segment)
+                except Exception as e:
+                    print(f"[WARN] Structured extraction failed for {label}: {e}")
+                    return None
+
+        parts = await asyncio.gather(*(extract(i, s) for i, s in enumerate(segments)))
+        parts = [p for p in parts if p]
+        if not parts:
+            raise RuntimeError(f"Structured extraction failed for all {len(segments)} parts of {filename}")
+
+        print(f"[OK] Extracted {filename} in {len(parts)}/{len(segments)} parts")
+        return merge_extractions(parts)
+
+    @retry(stop=stop_after_attempt(3), wait=wait_exponential(min=1, max=10))
+    async def _extract_segment(self, filename: str, content: str) -> dict:
+        """Run the structured extraction prompt on one piece of content."""
+        from google.genai import types
+
         prompt = STRUCTURED_EXTRACTION_PROMPT.format(
             filename=filename,
             content=content
@@ -196,8 +246,8 @@ class StructuredExtractor:
         self, doc_id: str, workspace_id: str,
         filename: str, metadata: dict, token_count: int
     ):
-        """Store document metadata."""
-        doc = SQLDocument(
+        """Store document metadata (inserted immediately so child rows can reference it)."""
+        await self.db.execute(insert(SQLDocument).values(
             id=doc_id,
             workspace_id=workspace_id,
             filename=filename,
@@ -211,81 +261,95 @@ class StructuredExtractor:
             confidence_level=metadata.get("confidence_level", "medium"),
             token_count=token_count,
             created_at=datetime.utcnow()
-        )
-        self.db.add(doc)
+        ))
 
     async def _store_claims(self, doc_id: str, claims: list) -> int:
         """Store extracted claims."""
-        for claim_data in claims:
-            claim = SQLClaim(
-                document_id=doc_id,
-                claim_text=claim_data.get("claim_text", ""),
-                claim_type=claim_data.get("claim_type", "fact"),
-                topic=claim_data.get("topic", ""),
-                confidence=claim_data.get("confidence", "medium"),
-                source_section=claim_data.get("source_section", ""),
-                is_quantitative=claim_data.get("is_quantitative", False),
-                can_be_verified=claim_data.get("can_be_verified", True)
-            )
-            self.db.add(claim)
-        return len(claims)
+        return await self._bulk_insert(SQLClaim, [
+            {
+                "document_id": doc_id,
+                "claim_text": claim_data.get("claim_text", ""),
+                "claim_type": claim_data.get("claim_type", "fact"),
+                "topic": claim_data.get("topic", ""),
+                "confidence": claim_data.get("confidence", "medium"),
+                "source_section": claim_data.get("source_section", ""),
+                "is_quantitative": claim_data.get("is_quantitative", False),
+                "can_be_verified": claim_data.get("can_be_verified", True)
+            }
+            for claim_data in claims
+        ])
 
     async def _store_metrics(self, doc_id: str, metrics: list) -> int:
         """Store extracted metrics."""
-        for metric_data in metrics:
-            metric = SQLMetric(
-                document_id=doc_id,
-                metric_name=metric_data.get("metric_name", ""),
-                value=metric_data.get("value", ""),
-                numeric_value=metric_data.get("numeric_value"),
-                unit=metric_data.get("unit", ""),
-                period=metric_data.get("period", ""),
-                period_start=self._parse_date(metric_data.get("period_start")),
-                period_end=self._parse_date(metric_data.get("period_end")),
-                context=metric_data.get("context", ""),
-                comparison_base=metric_data.get("comparison_base"),
-                entity_name=metric_data.get("entity_name", ""),
-                category=metric_data.get("category", "other")
-            )
-            self.db.add(metric)
-        return len(metrics)
+        return await self._bulk_insert(SQLMetric, [
+            {
+                "document_id": doc_id,
+                "metric_name": metric_data.get("metric_name", ""),
+                "value": metric_data.get("value", ""),
+                "numeric_value": metric_data.get("numeric_value"),
+                "unit": metric_data.get("unit", ""),
+                "period": metric_data.get("period", ""),
+                "period_start": self._parse_date(metric_data.get("period_start")),
+                "period_end": self._parse_date(metric_data.get("period_end")),
+                "context": metric_data.get("context", ""),
+                "comparison_base": metric_data.get("comparison_base"),
+                "entity_name": metric_data.get("entity_name", ""),
+                "category": metric_data.get("category", "other")
+            }
+            for metric_data in metrics
+        ])
 
     async def _store_entities(self, doc_id: str, entities: list) -> int:
         """Store extracted entities."""
-        for entity_data in entities:
-            entity = SQLEntity(
-                document_id=doc_id,
-                entity_name=entity_data.get("entity_name", ""),
-                entity_type=entity_data.get("entity_type", "organization"),
-                role=entity_data.get("role", "mentioned"),
-                title=entity_data.get("title"),
-                context=entity_data.get("context", "")
-            )
-            self.db.add(entity)
-        return len(entities)
+        return await self._bulk_insert(SQLEntity, [
+            {
+                "document_id": doc_id,
+                "entity_name": entity_data.get("entity_name", ""),
+                "entity_type": entity_data.get("entity_type", "organization"),
+                "role": entity_data.get("role", "mentioned"),
+                "title": entity_data.get("title"),
+                "context": entity_data.get("context", "")
+            }
+            for entity_data in entities
+        ])
 
     async def _store_topics(self, doc_id: str, topics: list) -> int:
         """Store document topics."""
-        for topic_data in topics:
-            topic = SQLTopic(
-                document_id=doc_id,
-                topic_name=topic_data.get("topic_name", ""),
-                is_primary=topic_data.get("is_primary", False)
-            )
-            self.db.add(topic)
-        return len(topics)
+        return await self._bulk_insert(SQLTopic, [
+            {
+                "document_id": doc_id,
+                "topic_name": topic_data.get("topic_name", ""),
+                "is_primary": topic_data.get("is_primary", False)
+            }
+            for topic_data in topics
+        ])
 
     async def _store_chunks(self, doc_id: str, chunks: list):
         """Store text chunks for fallback."""
-        for i, chunk in enumerate(chunks):
-            db_chunk = SQLDocumentChunk(
-                document_id=doc_id,
-                chunk_index=i,
-                section_name=chunk.get("section", ""),
-                chunk_text=chunk.get("content", ""),
-                token_count=chunk.get("token_count", 0)
-            )
-            self.db.add(db_chunk)
+        await self._bulk_insert(SQLDocumentChunk, [
+            {
+                "document_id": doc_id,
+                "chunk_index": i,
+                "section_name": chunk.get("section", ""),
+                "chunk_text": chunk.get("content", ""),
+                "token_count": chunk.get("token_count", 0)
+            }
+            for i, chunk in enumerate(chunks)
+        ])
+
+    async def _bulk_insert(self, model, rows: list[dict]) -> int:
+        """
+        Insert rows with one multi-row INSERT ... VALUES statement per batch.
+
+        Passing rows as execute() parameters would make the asyncpg dialect
+        run executemany (no RETURNING, so insertmanyvalues does not apply);
+        insert(model).values(rows) compiles to a single statement instead.
+        Batches stay under the Postgres bind parameter limit.
+        """
+        batch_size = max(1, MAX_BIND_PARAMS // len(model.__table__.columns))
+        for start in range(0, len(rows), batch_size):
+            await self.db.execute(insert(model).values(rows[start:start + batch_size]))
+        return len(rows)
 
     def _parse_date(self, date_str: Optional[str]) -> Optional[date]:
         """Parse date string to date object."""
@@ -297,6 +361,92 @@ class StructuredExtractor:
             return None
 
 
+def _normalize(value) -> str:
+    """Lowercase, punctuation-free, whitespace-collapsed form used for dedup keys."""
+    # Keep decimal points ("4.2") but drop sentence punctuation
+    text = re.sub(r"[^\w\s.%$]|\.(?!\d)", " ", str(value or "").lower())
+    return " ".join(text.split())
+
+
+def _merge_metadata(parts: list[dict]) -> dict:
+    """
+    Merge per-segment metadata.
+
+    Text fields come from the first segment that has them (usually the
+    opening, which carries the title and summary); document_type is the
+    majority vote and the period spans all segments.
+    """
+    metadatas = [p.get("metadata") or {} for p in parts]
+    merged = {}
+    for metadata in metadatas:
+        for key, value in metadata.items():
+            if key not in merged and value not in (None, ""):
+                merged[key] = value
+
+    types = Counter(
+        m["document_type"] for m in metadatas
+        if m.get("document_type") and m["document_type"] != "other"
+    )
+    if types:
+        merged["document_type"] = types.most_common(1)[0][0]
+
+    starts = [m["period_start"] for m in metadatas if m.get("period_start")]
+    ends = [m["period_end"] for m in metadatas if m.get("period_end")]
+    if starts:
+        merged["period_start"] = min(starts)
+    if ends:
+        merged["period_end"] = max(ends)
+    return merged
+
+
+def merge_extractions(parts: list[dict]) -> dict:
+    """
+    Merge per-segment extraction results into one, deduplicating claims,
+    metrics, entities and topics that appear in several segments.
+    """
+    claims: dict[str, dict] = {}
+    for part in parts:
+        for claim in part.get("claims") or []:
+            claims.setdefault(_normalize(claim.get("claim_text")), claim)
+
+    metrics: dict[tuple, dict] = {}
+    for part in parts:
+        for metric in part.get("metrics") or []:
+            key = tuple(_normalize(metric.get(f)) for f in ("metric_name", "value", "period", "entity_name"))
+            metrics.setdefault(key, metric)
+
+    entities: dict[tuple, dict] = {}
+    for part in parts:
+        for entity in part.get("entities") or []:
+            key = (_normalize(entity.get("entity_name")), entity.get("entity_type"))
+            existing = entities.get(key)
+            if existing is None:
+                entities[key] = dict(entity)
+                continue
+            # Keep the most specific role and any title found later
+            if existing.get("role") in (None, "", "mentioned") and entity.get("role"):
+                existing["role"] = entity["role"]
+            if not existing.get("title") and entity.get("title"):
+                existing["title"] = entity["title"]
+
+    topics: dict[str, dict] = {}
+    for part in parts:
+        for topic in part.get("topics") or []:
+            key = _normalize(topic.get("topic_name"))
+            if key in topics:
+                topics[key]["is_primary"] = topics[key].get("is_primary") or topic.get("is_primary", False)
+            else:
+                topics[key] = dict(topic)
+
+    return {
+        "metadata": _merge_metadata(parts),
+        "claims": [c for k, c in claims.items() if k],
+        "metrics": [m for k, m in metrics.items() if k[0]],
+        "entities": [e for k, e in entities.items() if k[0]],
+        "topics": [t for k, t in topics.items() if k]
+    }
+
+
 def get_structured_extractor(db: AsyncSession) -> StructuredExtractor:
     """Get structured extractor instance."""
     return StructuredExtractor(db)
@@ -0,0 +1,124 @@
+"""
+Token-budgeted summaries of SQL results for agent prompts.
+Results are compacted before entering a prompt: empty columns are dropped,
+constant columns are reported once, long text is truncated and rows are
+sampled down to the budget, with per-column aggregates over all rows.
+"""
+import json
+from collections import Counter
+from decimal import Decimal
+
+# Characters per token, matching the estimates used elsewhere in the app
+CHARS_PER_TOKEN = 4
+MAX_CELL_CHARS = 400
+TOP_VALUES = 5
+
+
+def estimate_tokens(value) -> int:
+    """Rough token count of a value once serialized into a prompt."""
+    return len(json.dumps(value, default=str)) // CHARS_PER_TOKEN
+
+
+def summarize_results(results: list[dict], token_budget: int) -> list[dict]:
+    """
+    Summarize query results to fit token_budget, split evenly across results.
+
+    Args:
+        results: Entries with "query", "purpose" and "data" (list of row dicts)
+            or "error"
+        token_budget: Approximate token budget for all results together
+
+    Returns:
+        List of compact result dicts, ready for json.dumps(default=str)
+    """
+    per_result = token_budget // max(1, len(results))
+    return [summarize_result(result, per_result) for result in results]
+
+
+def summarize_result(result: dict, token_budget: int) -> dict:
+    """Summarize a single query result to fit token_budget."""
+    summary = {"query": result["query"], "purpose": result.get("purpose", "")}
+    if "error" in result:
+        summary["error"] = result["error"]
+        return summary
+
+    rows = result.get("data", [])
+    summary["row_count"] = len(rows)
+    if not rows:
+        summary["rows"] = []
+        return summary
+
+    # Column pruning
+    columns, constants = [], {}
+    for column in rows[0]:
+        values = [row.get(column) for row in rows]
+        if all(v in (None, "") for v in values):
+            continue
+        if len(rows) > 1 and all(v == values[0] for v in values):
+            constants[column] = _truncate(values[0])
+            continue
+        columns.append(column)
+    if constants:
+        summary["constant_columns"] = constants
+
+    compact = [{column: _truncate(row.get(column)) for column in columns} for row in rows]
+
+    # Row sampling; each row also costs the ", " separating it in the list
+    fixed_chars = len(json.dumps({**summary, "rows": []}, default=str))
+    budget_chars = max(0, token_budget * CHARS_PER_TOKEN - fixed_chars)
+    avg_row_chars = sum(len(json.dumps(row, default=str)) + 2 for row in compact) / len(compact)
+    keep = max(1, int(budget_chars // max(avg_row_chars, 1)))
+
+    if keep >= len(compact):
+        summary["rows"] = compact
+        return summary
+
+    # Aggregates describe the omitted rows, so they share the budget
+    summary["aggregates"] = _aggregates(rows, columns)
+    budget_chars -= len(json.dumps(
+        {"aggregates": summary["aggregates"], "omitted_rows": len(compact)}, default=str
+    ))
+    keep = max(1, int(budget_chars // max(avg_row_chars, 1)))
+
+    # Ordered results keep their head; otherwise sample evenly across all rows
+    if "ORDER BY" in result["query"].upper():
+        summary["rows"] = compact[:keep]
+    else:
+        step = len(compact) / keep
+        summary["rows"] = [compact[int(i * step)] for i in range(keep)]
+    summary["omitted_rows"] = len(compact) - keep
+    return summary
+
+
+def _truncate(value):
+    """Shorten long text values."""
+    if isinstance(value, str) and len(value) > MAX_CELL_CHARS:
+        return value[:MAX_CELL_CHARS] + "..."
+    return value
+
+
+def _aggregates(rows: list[dict], columns: list[str]) -> dict:
+    """Min/max/mean/sum of numeric columns and top values of text columns, over all rows."""
+    aggregates = {}
+    for column in columns:
+        values = [row.get(column) for row in rows if row.get(column) is not None]
+        if not values:
+            continue
+
+        if all(isinstance(v, (int, float, Decimal)) and not isinstance(v, bool) for v in values):
+            numbers = [float(v) for v in values]
+            aggregates[column] = {
+                "min": min(numbers),
+                "max": max(numbers),
+                "mean": round(sum(numbers) / len(numbers), 4),
+                "sum": sum(numbers)
+            }
+        elif all(isinstance(v, str) for v in values):
+            counts = Counter(values)
+            # All-unique text (e.g. claim_text) has no useful distribution
+            if len(counts) < len(values):
+                aggregates[column] = {
+                    "distinct": len(counts),
+                    "top": [[_truncate(v), n] for v, n in counts.most_common(TOP_VALUES)]
+                }
+    return aggregates
@@ -158,6 +158,70 @@ class SQLDocumentChunk(Base):
     document = relationship("SQLDocument", back_populates="chunks")
 
 
+# Full-text search: generated tsvector columns with GIN indexes, trigram
+# indexes for fuzzy name matching and a ranked search_text() function.
+# Every statement is idempotent so it also upgrades databases created
+# before these existed (create_all never alters existing tables). Adding a
+# stored generated column rewrites the table once.
+SEARCH_SCHEMA_DDL = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+
+    """ALTER TABLE sql_document_chunks ADD COLUMN IF NOT EXISTS search_vector tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('english', coalesce(section_name, '')), 'A') ||
+        setweight(to_tsvector('english', coalesce(chunk_text, '')), 'B')
+    ) STORED""",
+    """ALTER TABLE sql_claims ADD COLUMN IF NOT EXISTS search_vector tsvector
+    GENERATED ALWAYS AS (to_tsvector('english', coalesce(claim_text, ''))) STORED""",
+    """ALTER TABLE sql_entities ADD COLUMN IF NOT EXISTS search_vector tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('english', coalesce(entity_name, '')), 'A') ||
+        setweight(to_tsvector('english', coalesce(context, '')), 'B')
+    ) STORED""",
+
+    "CREATE INDEX IF NOT EXISTS idx_chunks_search ON sql_document_chunks USING gin (search_vector)",
+    "CREATE INDEX IF NOT EXISTS idx_claims_search ON sql_claims USING gin (search_vector)",
+    "CREATE INDEX IF NOT EXISTS idx_entities_search ON sql_entities USING gin (search_vector)",
+    "CREATE INDEX IF NOT EXISTS idx_entities_name_trgm ON sql_entities USING gin (entity_name gin_trgm_ops)",
+    "CREATE INDEX IF NOT EXISTS idx_metrics_entity_trgm ON sql_metrics USING gin (entity_name gin_trgm_ops)",
+
+    """CREATE OR REPLACE FUNCTION search_text(
+        search_query text,
+        search_workspace text DEFAULT NULL,
+        result_limit integer DEFAULT 20
+    )
+    RETURNS TABLE (
+        source text, row_id integer, document_id varchar, filename varchar,
+        section varchar, content text, rank real
+    )
+    LANGUAGE sql STABLE AS $$
+        SELECT 'chunk', c.id, c.document_id, d.filename, c.section_name,
+               c.chunk_text, ts_rank_cd(c.search_vector, websearch_to_tsquery('english', search_query))
+        FROM sql_document_chunks c
+        JOIN sql_documents d ON d.id = c.document_id
+        WHERE c.search_vector @@ websearch_to_tsquery('english', search_query)
+          AND (search_workspace IS NULL OR d.workspace_id = search_workspace)
+        UNION ALL
+        SELECT 'claim', cl.id, cl.document_id, d.filename, cl.source_section,
+               cl.claim_text, ts_rank_cd(cl.search_vector, websearch_to_tsquery('english', search_query))
+        FROM sql_claims cl
+        JOIN sql_documents d ON d.id = cl.document_id
+        WHERE cl.search_vector @@ websearch_to_tsquery('english', search_query)
+          AND (search_workspace IS NULL OR d.workspace_id = search_workspace)
+        UNION ALL
+        SELECT 'entity', e.id, e.document_id, d.filename, e.entity_type,
+               e.entity_name || ' - ' || coalesce(e.context, ''),
+               ts_rank_cd(e.search_vector, websearch_to_tsquery('english', search_query))
+        FROM sql_entities e
+        JOIN sql_documents d ON d.id = e.document_id
+        WHERE e.search_vector @@ websearch_to_tsquery('english', search_query)
+          AND (search_workspace IS NULL OR d.workspace_id = search_workspace)
+        ORDER BY 7 DESC
+        LIMIT result_limit
+    $$""",
+]
+
+
 # Schema description for LLM
 SQL_SCHEMA_DESCRIPTION = """
 DATABASE SCHEMA:
@@ -237,10 +301,31 @@ Columns:
 - chunk_text: Full text
 - token_count: Size
 
+## Full-text search
+sql_document_chunks, sql_claims and sql_entities have an indexed
+search_vector column (english tsvector of section_name + chunk_text,
+claim_text, and entity_name + context respectively). Never scan text with
+ILIKE '%...%'; use the ranked search function instead:
+
+search_text(search_query, search_workspace DEFAULT NULL, result_limit DEFAULT 20)
+Returns rows (source, row_id, document_id, filename, section, content, rank)
+ranked best first, where source is 'chunk', 'claim' or 'entity'.
+search_query uses web search syntax: words are ANDed, "quoted phrases",
+OR, and -excluded terms.
+  SELECT * FROM search_text('revenue guidance "fiscal 2025"', 'my_workspace', 10);
+
+Or match a single table directly:
+  WHERE c.search_vector @@ websearch_to_tsquery('english', 'supply chain')
+  ORDER BY ts_rank_cd(c.search_vector, websearch_to_tsquery('english', 'supply chain')) DESC
+
+entity_name (sql_entities and sql_metrics) has trigram indexes, so
+ILIKE '%name%' and similarity(entity_name, 'name') > 0.3 are index-backed.
+
 COMMON QUERY PATTERNS:
 - Join metrics with documents for context
 - Filter by period_start/period_end for time ranges
 - Use entity_name to find all info about specific company/person
 - Use topics to find related documents
+- Use search_text() for keyword/fact lookups across chunks, claims and entities
 - Check confidence_level for reliability filtering
 """
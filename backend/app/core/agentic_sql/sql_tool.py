@@ -3,9 +3,11 @@ SQL execution tool for the Agentic SQL RAG.
 Provides read-only access to the structured document database.
 """
 from typing import Optional
-import json
+import asyncio
 from sqlalchemy import text
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.config import get_settings
 
 
 class SQLQueryTool:
@@ -23,6 +25,8 @@ class SQLQueryTool:
     - sql_entities: Named entities (entity_name, entity_type, role)
     - sql_topics: Document topics (topic_name, is_primary)
     - sql_document_chunks: Full text chunks (chunk_text, section_name)
+    - search_text(query, workspace_id, limit): Ranked full-text search over
+      chunks, claims and entities (SELECT * FROM search_text('...'))
 
     IMPORTANT:
     - Only SELECT queries allowed
@@ -31,63 +35,104 @@ class SQLQueryTool:
     - Filter by workspace_id when relevant
     """
 
-    def __init__(self, db: AsyncSession, workspace_id: str = "default"):
+    def __init__(
+        self,
+        db: AsyncSession,
+        workspace_id: str = "default",
+        session_maker: Optional[async_sessionmaker] = None
+    ):
         self.db = db
         self.workspace_id = workspace_id
-
-    async def execute(self, query: str, explanation: str = "") -> str:
-        """Execute query and return results as JSON string."""
+        # With a session maker each query gets its own pooled connection,
+        # so execute_many can run queries concurrently
+        self.session_maker = session_maker
+        self.settings = get_settings()
+
+    async def execute(self, query: str, explanation: str = "") -> dict:
+        """
+        Execute query in a read-only transaction with a statement timeout.
+
+        Returns:
+            {"success": True, "row_count", "columns", "data", "query_explanation"}
+            or {"error", "hint", "query_attempted"}. Values are raw Python
+            objects; serialize with default=str at the prompt boundary.
+        """
         # Validate query is SELECT only
         query_upper = query.strip().upper()
         if not query_upper.startswith("SELECT"):
-            return json.dumps({
+            return {
                 "error": "Only SELECT queries are allowed",
                 "hint": "Rewrite your query as a SELECT statement"
-            })
+            }
 
         # Check for dangerous keywords
         dangerous = ["INSERT", "UPDATE", "DELETE", "DROP", "TRUNCATE", "ALTER", "CREATE"]
         for keyword in dangerous:
             if keyword in query_upper:
-                return json.dumps({
+                return {
                     "error": f"Query contains forbidden keyword: {keyword}",
                     "hint": "Only read operations are permitted"
-                })
+                }
 
         # Ensure LIMIT clause
         if "LIMIT" not in query_upper:
             query = query.rstrip(";") + " LIMIT 50"
 
         try:
-            result = await self.db.execute(text(query))
-            rows = result.fetchall()
-            columns = list(result.keys())
-
-            # Convert to list of dicts
-            data = [dict(zip(columns, row)) for row in rows]
-
-            # Handle date serialization
-            for row in data:
-                for key, value in row.items():
-                    if hasattr(value, 'isoformat'):
-                        row[key] = value.isoformat()
-
-            return json.dumps({
+            if self.session_maker is not None:
+                async with self.session_maker() as session, session.begin():
+                    await session.execute(text("SET TRANSACTION READ ONLY"))
+                    rows, columns = await self._run(session, query)
+            else:
+                # Shared request session: the keyword check above is the guard
+                rows, columns = await self._run(self.db, query)
+
+            return {
                 "success": True,
-                "row_count": len(data),
+                "row_count": len(rows),
                 "columns": columns,
-                "data": data,
+                "data": [dict(zip(columns, row)) for row in rows],
                 "query_explanation": explanation
-            }, indent=2, default=str)
+            }
 
         except Exception as e:
-            return json.dumps({
+            if self.session_maker is None:
+                await self.db.rollback()
+            return {
                 "error": str(e),
                 "hint": "Check your SQL syntax and table/column names",
                 "query_attempted": query
-            })
-
-
-def get_sql_tool(db: AsyncSession, workspace_id: str = "default") -> SQLQueryTool:
+            }
+
+    async def execute_many(self, queries: list[tuple[str, str]]) -> list[dict]:
+        """
+        Execute (query, explanation) pairs, concurrently when a session maker
+        is available. Results are returned in input order.
+        """
+        if self.session_maker is None:
+            return [await self.execute(query, explanation) for query, explanation in queries]
+
+        semaphore = asyncio.Semaphore(self.settings.agent_query_concurrency)
+
+        async def run(query: str, explanation: str) -> dict:
+            async with semaphore:
+                return await self.execute(query, explanation)
+
+        return await asyncio.gather(*(run(q, e) for q, e in queries))
+
+    async def _run(self, session: AsyncSession, query: str) -> tuple[list, list[str]]:
+        """Run query under the statement timeout; returns (rows, columns)."""
+        await session.execute(text(
+            f"SET LOCAL statement_timeout = {int(self.settings.agent_query_timeout_ms)}"
+        ))
+        result = await session.execute(text(query))
+        return result.fetchall(), list(result.keys())
+
+
+def get_sql_tool(
+    db: AsyncSession,
+    workspace_id: str = "default",
+    session_maker: Optional[async_sessionmaker] = None
+) -> SQLQueryTool:
     """Get SQL tool instance."""
-    return SQLQueryTool(db, workspace_id)
+    return SQLQueryTool(db, workspace_id, session_maker)
@@ -0,0 +1,161 @@
+"""
+In-process cache of chat answers for repeated questions.
+Entries are keyed by workspace, document map version and the query text
+after case-folding and whitespace/trailing-punctuation cleanup only, so
+adding or deleting a document (which bumps the map version) invalidates
+every cached answer for that workspace. Words are never dropped or
+reordered: "revenue before 2020" and "revenue after 2020" are different
+questions. An optional semantic tier matches near-duplicate phrasings by
+query embedding similarity.
+"""
+import math
+import re
+import time
+from collections import OrderedDict
+from typing import Optional
+
+from app.config import get_settings
+
+# Punctuation that does not change a question's meaning when trailing
+TRAILING_PUNCTUATION = "?!.,;: \t\n"
+
+
+class AnswerCache:
+    """LRU + TTL cache for chat answers."""
+
+    def __init__(
+        self,
+        max_entries: int,
+        ttl_seconds: int,
+        similarity_threshold: float,
+        enabled: bool = True
+    ):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.similarity_threshold = similarity_threshold
+        self.enabled = enabled
+        self.hits = 0
+        self.semantic_hits = 0
+        self.misses = 0
+        # key -> {"value", "embedding", "expires_at"}, least recently used first
+        self._entries: OrderedDict[tuple, dict] = OrderedDict()
+
+    def make_key(
+        self,
+        workspace_id: str,
+        map_version: int,
+        query: str,
+        max_documents: int
+    ) -> Optional[tuple]:
+        """Build cache key; None when the query normalizes to nothing."""
+        normalized = normalize_question(query)
+        if not normalized:
+            return None
+        return (workspace_id, map_version, max_documents, normalized)
+
+    def get(self, key: Optional[tuple]) -> Optional[dict]:
+        """Return cached answer for exactly this key, updating recency on hit."""
+        if not self.enabled or key is None:
+            return None
+
+        entry = self._entries.get(key)
+        if entry and entry["expires_at"] > time.time():
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry["value"]
+
+        self.misses += 1
+        return None
+
+    def get_similar(self, key: Optional[tuple], embedding: list[float]) -> Optional[dict]:
+        """
+        Return the answer of the most similar cached query with the same
+        workspace, map version and max_documents, if above the threshold.
+        """
+        if not self.enabled or key is None:
+            return None
+
+        now = time.time()
+        best_key, best_score = None, self.similarity_threshold
+        for other_key, other in self._entries.items():
+            if other_key[:3] != key[:3] or other["embedding"] is None or other["expires_at"] <= now:
+                continue
+            score = _cosine_similarity(embedding, other["embedding"])
+            if score >= best_score:
+                best_key, best_score = other_key, score
+
+        if best_key is None:
+            return None
+
+        self._entries.move_to_end(best_key)
+        self.semantic_hits += 1
+        return self._entries[best_key]["value"]
+
+    def set(self, key: tuple, value: dict, embedding: Optional[list[float]] = None) -> None:
+        """Store answer, dropping stale map versions and least recently used entries."""
+        if not self.enabled or key is None:
+            return
+
+        workspace_id, map_version = key[0], key[1]
+        now = time.time()
+        for old_key in [
+            k for k, e in self._entries.items()
+            if (k[0] == workspace_id and k[1] != map_version) or e["expires_at"] <= now
+        ]:
+            del self._entries[old_key]
+
+        self._entries[key] = {
+            "value": value,
+            "embedding": embedding,
+            "expires_at": now + self.ttl_seconds
+        }
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def stats(self) -> dict:
+        """Return hit/miss counters (semantic hits are a subset of exact misses)."""
+        lookups = self.hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "semantic_hits": self.semantic_hits,
+            "misses": self.misses,
+            "hit_rate": round((self.hits + self.semantic_hits) / lookups, 3) if lookups else 0.0
+        }
+
+
+def normalize_question(query: str) -> str:
+    """Case-fold, collapse whitespace and strip trailing punctuation.
+
+    Word order, negations, comparatives and numbers are kept, so only
+    trivially different spellings of the same question share a key.
+    """
+    return re.sub(r"\s+", " ", query.casefold()).strip(TRAILING_PUNCTUATION)
+
+
+def _cosine_similarity(a: list[float], b: list[float]) -> float:
+    """Cosine similarity of two vectors."""
+    dot = sum(x * y for x, y in zip(a, b))
+    norm = math.sqrt(sum(x * x for x in a)) * math.sqrt(sum(y * y for y in b))
+    return dot / norm if norm else 0.0
+
+
+# Singleton instance
+_answer_cache: Optional[AnswerCache] = None
+
+
+def get_answer_cache() -> AnswerCache:
+    """Get singleton answer cache instance."""
+    global _answer_cache
+    if _answer_cache is None:
+        settings = get_settings()
+        _answer_cache = AnswerCache(
+            max_entries=settings.answer_cache_max_entries,
+            ttl_seconds=settings.answer_cache_ttl_seconds,
+            similarity_threshold=settings.answer_cache_similarity_threshold,
+            enabled=settings.answer_cache_enabled
+        )
+    return _answer_cache
@@ -1,14 +1,16 @@
 """
 Semantic chunking for large documents.
-Note: Primary chunking logic is in ocr_processor.py.
-This module provides utility functions for chunking operations.
+Shared by the OCR processor and the markdown upload path.
 """
 import re
-from typing import Optional
+from typing import Iterator, Optional
 import tiktoken
 
 from app.config import get_settings
 
+# Major markdown headers (h1-h3) mark section boundaries
+HEADER_PATTERN = re.compile(r'\n(#{1,3}\s+.+)\n')
+
 
 class SemanticChunker:
     """Utility class for semantic document chunking."""
@@ -75,6 +77,182 @@ class SemanticChunker:
 
         return chunks
 
+    def iter_chunks(
+        self,
+        text: str,
+        max_tokens: Optional[int] = None,
+        overlap_tokens: Optional[int] = None
+    ) -> Iterator[dict]:
+        """
+        Stream header-aware chunks of at most max_tokens tokens.
+
+        Each segment is tokenized exactly once and running token counts are
+        kept, so chunking is linear in document length. Chunks split because
+        of size (rather than at a header) start with the last overlap_tokens
+        tokens of the previous chunk; segments (and headers) larger than a
+        whole chunk are windowed by token, cutting on UTF-8 character
+        boundaries.
+
+        Args:
+            text: Markdown text to split
+            max_tokens: Maximum tokens per chunk (default from settings)
+            overlap_tokens: Overlap between size-split chunks (default from settings)
+
+        Yields:
+            {"content": str, "section": str, "token_count": int}
+        """
+        max_tokens = max_tokens or self.settings.chunk_size_tokens
+        if overlap_tokens is None:
+            overlap_tokens = self.settings.chunk_overlap_tokens
+        overlap_tokens = min(overlap_tokens, max_tokens // 2)
+
+        pieces: list[tuple[str, list[int]]] = []
+        current_tokens = 0
+        current_section = "Introduction"
+        has_content = False  # True once pieces hold more than carried overlap
+        header_only = False  # A lone header is never emitted on a size split
+
+        for section, segment, is_header in self._iter_segments(text):
+            ids = self.tokenizer.encode(segment)
+
+            if is_header:
+                if has_content:
+                    yield self._build_chunk(pieces, current_section, current_tokens)
+                pieces = []
+                current_tokens = 0
+            elif current_tokens + len(ids) > max_tokens and has_content and not header_only:
+                yield self._build_chunk(pieces, current_section, current_tokens)
+                pieces = self._overlap_tail(pieces, overlap_tokens)
+                current_tokens = sum(len(p[1]) for p in pieces)
+                has_content = False
+            current_section = section
+
+            # Window segments that do not fit in the remaining space, walking
+            # an offset so the token list is not copied per window
+            start = 0
+            while current_tokens + len(ids) - start > max_tokens:
+                if current_tokens >= max_tokens:
+                    # A header already fills the chunk; flush it so the window
+                    # below always makes progress
+                    yield self._build_chunk(pieces, current_section, current_tokens)
+                    pieces = self._overlap_tail(pieces, overlap_tokens)
+                    current_tokens = sum(len(p[1]) for p in pieces)
+                    continue
+                end = self._char_boundary(ids, start, start + max_tokens - current_tokens)
+                head = ids[start:end]
+                pieces.append((self.tokenizer.decode(head), head))
+                current_tokens += len(head)
+                yield self._build_chunk(pieces, current_section, current_tokens)
+                start = end
+                pieces = self._overlap_tail(pieces, overlap_tokens)
+                current_tokens = sum(len(p[1]) for p in pieces)
+
+            if start:
+                ids = ids[start:]
+                segment = self.tokenizer.decode(ids)
+            pieces.append((segment, ids))
+            current_tokens += len(ids)
+            header_only = is_header
+            if is_header or segment.strip():
+                has_content = True
+
+        if has_content:
+            yield self._build_chunk(pieces, current_section, current_tokens)
+
+    def _iter_segments(self, text: str) -> Iterator[tuple[str, str, bool]]:
+        """Yield (section, segment, is_header) triples split on major headers."""
+        section = "Introduction"
+        pos = 0
+        for match in HEADER_PATTERN.finditer(text):
+            if match.start() > pos:
+                yield section, text[pos:match.start()], False
+            header = match.group(1)
+            section = header.strip('# \n')
+            yield section, header + "\n", True
+            pos = match.end()
+        if pos < len(text):
+            yield section, text[pos:], False
+
+    def _overlap_tail(
+        self,
+        pieces: list[tuple[str, list[int]]],
+        overlap_tokens: int
+    ) -> list[tuple[str, list[int]]]:
+        """Return the last overlap_tokens tokens of pieces as a single piece."""
+        if overlap_tokens <= 0:
+            return []
+        tail: list[int] = []
+        for _, ids in reversed(pieces):
+            tail = ids[-(overlap_tokens - len(tail)):] + tail
+            if len(tail) >= overlap_tokens:
+                break
+        # Start the tail on a whole UTF-8 character
+        for skip in range(min(4, len(tail))):
+            try:
+                self.tokenizer.decode_bytes(tail[skip:]).decode("utf-8")
+            except UnicodeDecodeError:
+                continue
+            tail = tail[skip:]
+            break
+        return [(self.tokenizer.decode(tail), tail)] if tail else []
+
+    def _char_boundary(self, ids: list[int], start: int, end: int) -> int:
+        """
+        Move a token cut back so ids[start:cut] ends on a whole UTF-8 character.
+
+        A character spans at most 4 byte-level tokens, so at most 3 tokens are
+        given back; start is assumed to be on a character boundary.
+        """
+        for cut in range(end, max(start, end - 4), -1):
+            try:
+                self.tokenizer.decode_bytes(ids[start:cut]).decode("utf-8")
+            except UnicodeDecodeError:
+                continue
+            return cut
+        return end
+
+    @staticmethod
+    def _build_chunk(
+        pieces: list[tuple[str, list[int]]],
+        section: str,
+        token_count: int
+    ) -> dict:
+        """Assemble a chunk dict from buffered pieces."""
+        return {
+            "content": "".join(text for text, _ in pieces).strip(),
+            "section": section,
+            "token_count": token_count
+        }
+
+    def enrich_chunks(self, chunks: list[dict]) -> list[dict]:
+        """
+        Add ids, positions and neighbouring-section context to chunks.
+
+        Token counts already computed by iter_chunks are reused.
+        """
+        enriched = []
+        for i, chunk in enumerate(chunks):
+            context_parts = [f"This is section '{chunk.get('section', 'Unknown')}' of the document."]
+            if i > 0:
+                context_parts.append(f"Previous section: '{chunks[i-1].get('section', 'Unknown')}'")
+            if i < len(chunks) - 1:
+                context_parts.append(f"Next section: '{chunks[i+1].get('section', 'Unknown')}'")
+
+            token_count = chunk.get("token_count")
+            if token_count is None:
+                token_count = self.count_tokens(chunk["content"])
+
+            enriched.append({
+                "chunk_id": f"c{i+1}",
+                "position": f"{i+1}/{len(chunks)}",
+                "content": chunk["content"],
+                "section": chunk.get("section", f"Section {i+1}"),
+                "context": " ".join(context_parts),
+                "token_count": token_count
+            })
+
+        return enriched
+
     def split_by_headers(self, text: str) -> list[dict]:
         """
         Split text by markdown headers.
@@ -167,6 +345,38 @@ class SemanticChunker:
         return merged
 
 
+def split_into_segments(text: str, max_chars: int) -> list[str]:
+    """
+    Split text into segments of at most max_chars characters.
+
+    Used for map-reduce LLM extraction, where segments only need to fit the
+    prompt rather than be semantically tight. Each cut is made at the last
+    header, paragraph or line break in the second half of the window.
+
+    Args:
+        text: Text to split
+        max_chars: Maximum characters per segment
+
+    Returns:
+        List of non-empty segments covering the whole text
+    """
+    segments = []
+    start = 0
+    while len(text) - start > max_chars:
+        window = text[start:start + max_chars]
+        cut = -1
+        for boundary in ("\n#", "\n\n", "\n"):
+            cut = window.rfind(boundary, max_chars // 2)
+            if cut > 0:
+                break
+        if cut <= 0:
+            cut = max_chars
+        segments.append(text[start:start + cut])
+        start += cut
+    segments.append(text[start:])
+    return [s for s in segments if s.strip()]
+
+
 # Factory function
 def get_chunker() -> SemanticChunker:
     """Get semantic chunker instance."""
@@ -1,15 +1,35 @@
 """
 Living Document Map management.
 The map is the core of one-shot retrieval - it's an LLM-maintained index.
+
+The map is stored normalized: a small header row per workspace (corpus
+summary), one row per document entry and one row per cross-reference, so
+adding or removing a document only touches that document's rows.
+
+Parsed maps are cached per workspace in-process. Every write bumps the
+header's version, and readers poll that single row, so all workers drop
+stale maps without re-reading the entry and reference rows.
 """
 import json
 from datetime import datetime
 from typing import Optional
-from sqlalchemy import select
+from sqlalchemy import select, update, delete
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.db.models import DocumentMap as DocumentMapModel
+from app.db.models import (
+    DocumentMap as DocumentMapModel,
+    DocumentMapEntry,
+    DocumentMapReference
+)
+from app.config import get_settings
 from app.core.gemini_client import get_gemini_client
+from app.core.map_prefilter import MapPrefilter, build_candidate_map
+
+REF_TYPES = ("by_entity", "by_topic")
+
+# workspace_id -> {"version", "map", "prompt", "prefilter"}
+_map_cache: dict[str, dict] = {}
 
 
 class DocumentMapManager:
@@ -18,29 +38,106 @@ class DocumentMapManager:
     def __init__(self, db: AsyncSession):
         self.db = db
         self.gemini = get_gemini_client()
+        self.settings = get_settings()
 
     async def get_map(self, workspace_id: str = "default") -> dict:
-        """Get current document map for workspace."""
+        """
+        Get current document map for workspace, assembled from its rows.
+
+        The returned dict may be shared through the map cache - treat it as read-only.
+        """
         result = await self.db.execute(
-            select(DocumentMapModel).where(DocumentMapModel.workspace_id == workspace_id)
+            select(DocumentMapModel.map_data).where(DocumentMapModel.workspace_id == workspace_id)
         )
-        map_record = result.scalar_one_or_none()
+        map_data = result.scalar_one_or_none()
 
-        if map_record:
-            return json.loads(map_record.map_data)
+        header = json.loads(map_data) if map_data else {}
+        if "documents" in header:
+            header = await self._migrate_legacy_map(workspace_id, header)
 
-        # Return empty map structure
-        return {
+        version = header.get("version", 0)
+        cached = _map_cache.get(workspace_id)
+        if cached and cached["version"] == version:
+            return cached["map"]
+
+        entries = await self.db.execute(
+            select(DocumentMapEntry.entry)
+            .where(DocumentMapEntry.workspace_id == workspace_id)
+            .order_by(DocumentMapEntry.id)
+        )
+
+        refs = await self.db.execute(
+            select(
+                DocumentMapReference.ref_type,
+                DocumentMapReference.key,
+                DocumentMapReference.document_id
+            )
+            .where(DocumentMapReference.workspace_id == workspace_id)
+            .order_by(DocumentMapReference.id)
+        )
+        cross_references = {ref_type: {} for ref_type in REF_TYPES}
+        for ref_type, key, document_id in refs:
+            cross_references.setdefault(ref_type, {}).setdefault(key, []).append(document_id)
+
+        document_map = {
             "corpus_id": workspace_id,
-            "last_updated": datetime.utcnow().isoformat(),
-            "corpus_summary": "",
-            "documents": [],
-            "cross_references": {
-                "by_entity": {},
-                "by_topic": {}
-            }
+            "last_updated": header.get("last_updated", datetime.utcnow().isoformat()),
+            "corpus_summary": header.get("corpus_summary", ""),
+            "documents": list(entries.scalars()),
+            "cross_references": cross_references
         }
 
+        if self.settings.map_cache_enabled:
+            _map_cache[workspace_id] = {
+                "version": version,
+                "map": document_map,
+                "prompt": None,
+                "prefilter": None
+            }
+
+        return document_map
+
+    async def get_version(self, workspace_id: str = "default") -> int:
+        """Current map version (bumped on every add/remove) without loading the map."""
+        result = await self.db.execute(
+            select(DocumentMapModel.map_data).where(DocumentMapModel.workspace_id == workspace_id)
+        )
+        map_data = result.scalar_one_or_none()
+        return json.loads(map_data).get("version", 0) if map_data else 0
+
+    def get_map_prompt(self, workspace_id: str, document_map: dict) -> str:
+        """Render map for the retrieval prompt, reusing the cached rendering."""
+        cached = _map_cache.get(workspace_id)
+        if cached is None or cached["map"] is not document_map:
+            return self.gemini._format_map_for_prompt(document_map)
+
+        if cached["prompt"] is None:
+            cached["prompt"] = self.gemini._format_map_for_prompt(document_map)
+        return cached["prompt"]
+
+    def get_candidate_map(
+        self,
+        workspace_id: str,
+        document_map: dict,
+        query: str,
+        top_k: Optional[int] = None
+    ) -> dict:
+        """
+        Select the top_k documents most relevant to query with the local BM25 pre-filter.
+
+        Returns a map restricted to those documents and their cross-references.
+        """
+        cached = _map_cache.get(workspace_id)
+        if cached is not None and cached["map"] is document_map:
+            if cached["prefilter"] is None:
+                cached["prefilter"] = MapPrefilter(document_map["documents"])
+            prefilter = cached["prefilter"]
+        else:
+            prefilter = MapPrefilter(document_map["documents"])
+
+        doc_ids = prefilter.search(query, top_k or self.settings.map_prefilter_top_k)
+        return build_candidate_map(document_map, doc_ids)
+
     async def add_document(
         self,
         workspace_id: str,
@@ -48,21 +145,23 @@ class DocumentMapManager:
         filename: str,
         content: str,
         size_class: str,
-        chunks: Optional[list[dict]] = None
+        chunks: Optional[list[dict]] = None,
+        intelligence: Optional[dict] = None
     ) -> dict:
         """
         Add document to map with full intelligence extraction.
 
-        1. Extract document intelligence via Gemini
+        1. Extract document intelligence via Gemini (unless already extracted)
         2. Identify relationships to existing documents
-        3. Update cross-references
+        3. Insert cross-references
         4. Update corpus summary
         """
         # Get current map
         current_map = await self.get_map(workspace_id)
 
         # Extract intelligence from new document
-        intelligence = await self.gemini.extract_document_intelligence(content, filename)
+        if intelligence is None:
+            intelligence = await self.gemini.extract_document_intelligence(content, filename)
 
         # Build document entry
         doc_entry = {
@@ -97,105 +196,139 @@ class DocumentMapManager:
             # Add relationships
             doc_entry["relationships"] = map_updates.get("relationships", [])
 
-            # Merge cross-references
             new_refs = map_updates.get("new_cross_references", {})
-            self._merge_cross_references(current_map["cross_references"], new_refs)
-
-            # Update corpus summary
-            current_map["corpus_summary"] = map_updates.get(
+            corpus_summary = map_updates.get(
                 "updated_corpus_summary",
                 current_map["corpus_summary"]
             )
         else:
-            # First document - create initial summary
-            current_map["corpus_summary"] = f"Corpus containing: {filename}. {intelligence['essence']}"
-
-            # Initialize cross-references
-            for entity_type, entities in intelligence["entities"].items():
-                for entity in entities:
-                    if entity not in current_map["cross_references"]["by_entity"]:
-                        current_map["cross_references"]["by_entity"][entity] = []
-                    current_map["cross_references"]["by_entity"][entity].append(document_id)
-
-            for topic in intelligence["topics"]:
-                if topic not in current_map["cross_references"]["by_topic"]:
-                    current_map["cross_references"]["by_topic"][topic] = []
-                current_map["cross_references"]["by_topic"][topic].append(document_id)
-
-        # Add document to map
-        current_map["documents"].append(doc_entry)
-        current_map["last_updated"] = datetime.utcnow().isoformat()
+            # First document - create initial summary and cross-references
+            corpus_summary = f"Corpus containing: {filename}. {intelligence['essence']}"
+            new_refs = {
+                "by_entity": {
+                    entity: [document_id]
+                    for entities in intelligence["entities"].values()
+                    for entity in entities
+                },
+                "by_topic": {topic: [document_id] for topic in intelligence["topics"]}
+            }
 
-        # Persist map
-        await self._save_map(workspace_id, current_map)
+        # Persist only this document's rows plus the header
+        await self._insert_entry(workspace_id, document_id, doc_entry)
+        await self._insert_references(workspace_id, new_refs)
+        await self._save_header(workspace_id, corpus_summary)
+        await self.db.commit()
 
         return doc_entry
 
     async def remove_document(self, workspace_id: str, document_id: str) -> bool:
-        """Remove document from map and update cross-references."""
-        current_map = await self.get_map(workspace_id)
-
-        # Find and remove document
-        doc_to_remove = None
-        for i, doc in enumerate(current_map["documents"]):
-            if doc["id"] == document_id:
-                doc_to_remove = current_map["documents"].pop(i)
-                break
+        """Remove document from map and its cross-references."""
+        result = await self.db.execute(
+            delete(DocumentMapEntry).where(
+                DocumentMapEntry.workspace_id == workspace_id,
+                DocumentMapEntry.document_id == document_id
+            )
+        )
 
-        if not doc_to_remove:
+        if not result.rowcount:
             return False
 
-        # Clean cross-references
-        for entity, doc_ids in list(current_map["cross_references"]["by_entity"].items()):
-            if document_id in doc_ids:
-                doc_ids.remove(document_id)
-
-        for topic, doc_ids in list(current_map["cross_references"]["by_topic"].items()):
-            if document_id in doc_ids:
-                doc_ids.remove(document_id)
-
-        # Remove empty entries
-        current_map["cross_references"]["by_entity"] = {
-            k: v for k, v in current_map["cross_references"]["by_entity"].items() if v
-        }
-        current_map["cross_references"]["by_topic"] = {
-            k: v for k, v in current_map["cross_references"]["by_topic"].items() if v
-        }
+        await self.db.execute(
+            delete(DocumentMapReference).where(
+                DocumentMapReference.workspace_id == workspace_id,
+                DocumentMapReference.document_id == document_id
+            )
+        )
 
         # Update timestamp
-        current_map["last_updated"] = datetime.utcnow().isoformat()
-
-        # Persist
-        await self._save_map(workspace_id, current_map)
+        await self._save_header(workspace_id)
+        await self.db.commit()
 
         return True
 
-    def _merge_cross_references(self, existing: dict, new: dict) -> None:
-        """Merge new cross-references into existing."""
-        for ref_type in ["by_entity", "by_topic"]:
-            if ref_type in new:
-                for key, doc_ids in new[ref_type].items():
-                    if key not in existing[ref_type]:
-                        existing[ref_type][key] = []
-                    existing[ref_type][key].extend(doc_ids)
-                    # Deduplicate
-                    existing[ref_type][key] = list(set(existing[ref_type][key]))
-
-    async def _save_map(self, workspace_id: str, map_data: dict) -> None:
-        """Persist document map to database."""
-        result = await self.db.execute(
-            select(DocumentMapModel).where(DocumentMapModel.workspace_id == workspace_id)
+    async def _insert_entry(self, workspace_id: str, document_id: str, doc_entry: dict) -> None:
+        """Insert or replace a single document entry."""
+        stmt = insert(DocumentMapEntry).values(
+            workspace_id=workspace_id,
+            document_id=document_id,
+            entry=doc_entry
+        )
+        await self.db.execute(
+            stmt.on_conflict_do_update(
+                constraint="uq_map_entry_document",
+                set_={"entry": stmt.excluded.entry}
+            )
         )
-        map_record = result.scalar_one_or_none()
 
-        if map_record:
-            map_record.map_data = json.dumps(map_data)
-            map_record.updated_at = datetime.utcnow()
-        else:
-            map_record = DocumentMapModel(
+    async def _insert_references(self, workspace_id: str, refs: dict) -> None:
+        """Insert cross-reference rows, ignoring ones that already exist."""
+        rows = [
+            {
+                "workspace_id": workspace_id,
+                "ref_type": ref_type,
+                "key": str(key)[:500],
+                "document_id": doc_id
+            }
+            for ref_type in REF_TYPES
+            for key, doc_ids in refs.get(ref_type, {}).items()
+            for doc_id in set(doc_ids)
+        ]
+        if not rows:
+            return
+
+        await self.db.execute(
+            insert(DocumentMapReference)
+            .values(rows)
+            .on_conflict_do_nothing(constraint="uq_map_reference")
+        )
+
+    async def _save_header(self, workspace_id: str, corpus_summary: Optional[str] = None) -> None:
+        """Create the workspace header row if missing, update it and bump its version."""
+        now = datetime.utcnow()
+        await self.db.execute(
+            insert(DocumentMapModel)
+            .values(
                 workspace_id=workspace_id,
-                map_data=json.dumps(map_data)
+                map_data=json.dumps({"corpus_summary": "", "last_updated": now.isoformat()})
             )
-            self.db.add(map_record)
+            .on_conflict_do_nothing(index_elements=["workspace_id"])
+        )
 
+        # Row lock serializes header writers so versions never repeat
+        result = await self.db.execute(
+            select(DocumentMapModel.map_data)
+            .where(DocumentMapModel.workspace_id == workspace_id)
+            .with_for_update()
+        )
+        header = json.loads(result.scalar_one())
+        header["version"] = header.get("version", 0) + 1
+        header["last_updated"] = now.isoformat()
+        if corpus_summary is not None:
+            header["corpus_summary"] = corpus_summary
+
+        await self.db.execute(
+            update(DocumentMapModel)
+            .where(DocumentMapModel.workspace_id == workspace_id)
+            .values(map_data=json.dumps(header), updated_at=now)
+        )
+
+    async def _migrate_legacy_map(self, workspace_id: str, map_data: dict) -> dict:
+        """Split a pre-normalization JSON map into entry and reference rows."""
+        for doc in map_data.get("documents", []):
+            await self._insert_entry(workspace_id, doc["id"], doc)
+        await self._insert_references(workspace_id, map_data.get("cross_references", {}))
+
+        header = {
+            "corpus_summary": map_data.get("corpus_summary", ""),
+            "last_updated": map_data.get("last_updated", datetime.utcnow().isoformat()),
+            "version": 1
+        }
+        await self.db.execute(
+            update(DocumentMapModel)
+            .where(DocumentMapModel.workspace_id == workspace_id)
+            .values(map_data=json.dumps(header))
+        )
         await self.db.commit()
+
+        print(f"[OK] Migrated document map for {workspace_id} to row storage")
+        return header
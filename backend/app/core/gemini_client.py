@@ -1,14 +1,28 @@
 """
 Unified Gemini client for OCR, extraction, retrieval, and chat.
 """
+import asyncio
 import json
 import re
-from typing import Optional
+from collections import Counter
+from typing import AsyncIterator, Optional
 from google import genai
 from google.genai import types
 from tenacity import retry, stop_after_attempt, wait_exponential
 
 from app.config import get_settings
+from app.core.chunker import split_into_segments
+from app.core.ocr_cache import get_ocr_cache
+
+# Bump when the default OCR prompt changes to invalidate cached results
+OCR_PROMPT_VERSION = "pdf-v1"
+
+# Content limit for a single document intelligence prompt
+INTELLIGENCE_MAX_CHARS = 100000
+
+EMBEDDING_MODEL = "text-embedding-004"
+# Embedding input limit is ~2k tokens; longer texts are cut to their start
+EMBEDDING_MAX_CHARS = 8000
 
 
 class GeminiClient:
@@ -20,7 +34,6 @@ class GeminiClient:
         self.model = settings.gemini_model
         self._cached_map_id: Optional[str] = None
 
-    @retry(stop=stop_after_attempt(3), wait=wait_exponential(min=1, max=10))
     async def ocr_pdf(
         self,
         pdf_bytes: bytes,
@@ -29,6 +42,9 @@ class GeminiClient:
         """
         Extract text and structure from PDF using Gemini's native vision.
 
+        Results are served from the content-addressed OCR cache when the
+        same bytes were already processed with the same model and prompt.
+
         Returns:
             {
                 "content": str,  # Markdown formatted content
@@ -40,6 +56,27 @@ class GeminiClient:
                 }
             }
         """
+        cache = get_ocr_cache()
+        prompt_version = (
+            cache.prompt_version(extraction_prompt) if extraction_prompt else OCR_PROMPT_VERSION
+        )
+        cache_key = cache.make_key(pdf_bytes, f"gemini:{self.model}", prompt_version)
+
+        cached = cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        result = await self._ocr_pdf_uncached(pdf_bytes, extraction_prompt)
+        cache.set(cache_key, result)
+        return result
+
+    @retry(stop=stop_after_attempt(3), wait=wait_exponential(min=1, max=10))
+    async def _ocr_pdf_uncached(
+        self,
+        pdf_bytes: bytes,
+        extraction_prompt: Optional[str] = None
+    ) -> dict:
+        """Run Gemini vision OCR on PDF bytes (no caching)."""
         prompt = extraction_prompt or """
         Extract ALL content from this PDF document.
 
@@ -69,7 +106,6 @@ class GeminiClient:
 
         return self._parse_ocr_response(response.text)
 
-    @retry(stop=stop_after_attempt(3), wait=wait_exponential(min=1, max=10))
     async def extract_document_intelligence(
         self,
         content: str,
@@ -86,14 +122,44 @@ class GeminiClient:
                 "retrieval_hints": str,
                 "suggested_chunks": list[dict] | None
             }
+
+        Documents over INTELLIGENCE_MAX_CHARS are analyzed segment by
+        segment concurrently (map-reduce) when enabled, otherwise truncated.
         """
+        settings = get_settings()
+        if settings.extraction_map_reduce_enabled and len(content) > INTELLIGENCE_MAX_CHARS:
+            segments = split_into_segments(
+                content, min(settings.extraction_segment_chars, INTELLIGENCE_MAX_CHARS)
+            )
+            semaphore = asyncio.Semaphore(settings.extraction_max_concurrency)
+
+            async def extract(index: int, segment: str) -> Optional[dict]:
+                label = f"{filename} (part {index + 1} of {len(segments)})"
+                async with semaphore:
+                    try:
+                        return await self._extract_intelligence_segment(segment, label)
+                    except Exception as e:
+                        print(f"[WARN] Intelligence extraction failed for {label}: {e}")
+                        return None
+
+            parts = await asyncio.gather(*(extract(i, s) for i, s in enumerate(segments)))
+            parts = [p for p in parts if p]
+            if not parts:
+                raise RuntimeError(f"Intelligence extraction failed for all {len(segments)} parts of {filename}")
+            return self._merge_intelligence(parts)
+
+        return await self._extract_intelligence_segment(content[:INTELLIGENCE_MAX_CHARS], filename)
+
+    @retry(stop=stop_after_attempt(3), wait=wait_exponential(min=1, max=10))
+    async def _extract_intelligence_segment(self, content: str, filename: str) -> dict:
+        """Run the document intelligence prompt on one piece of content."""
         prompt = f"""
         Analyze this document and extract structured intelligence.
 
         Document filename: {filename}
 
         Content:
-        {content[:100000]}
+        {content}
 
         Provide a JSON response with:
         {{
@@ -128,11 +194,14 @@ class GeminiClient:
     async def consult_map_for_retrieval(
         self,
         query: str,
-        document_map: dict
+        document_map: dict,
+        map_prompt: Optional[str] = None
     ) -> dict:
         """
         One-shot retrieval: consult document map to select documents/chunks.
 
+        map_prompt, when given, is a pre-rendered _format_map_for_prompt output.
+
         Returns:
             {
                 "retrieve": ["doc_id", "doc_id_chunk_N", ...],
@@ -146,7 +215,7 @@ class GeminiClient:
         USER QUERY: {query}
 
         DOCUMENT MAP:
-        {self._format_map_for_prompt(document_map)}
+        {map_prompt or self._format_map_for_prompt(document_map)}
 
         Instructions:
         1. Analyze query intent and information needs
@@ -195,29 +264,13 @@ class GeminiClient:
                 "confidence": float
             }
         """
-        # Build context
-        context_parts = []
-        for doc in retrieved_content:
-            context_parts.append(f"""
-[Document: {doc['id']}]
-{doc.get('context', '')}
-
-{doc['content']}
----
-""")
-
-        history_text = ""
-        if chat_history:
-            history_text = "\n".join([
-                f"{msg['role'].upper()}: {msg['content']}"
-                for msg in chat_history[-5:]
-            ])
+        documents_text, history_text = self._format_answer_context(retrieved_content, chat_history)
 
         prompt = f"""
         Answer the user's question using ONLY the provided documents.
 
         DOCUMENTS:
-        {''.join(context_parts)}
+        {documents_text}
 
         {f'CHAT HISTORY:{chr(10)}{history_text}' if history_text else ''}
 
@@ -249,6 +302,99 @@ class GeminiClient:
 
         return self._parse_json_response(response.text)
 
+    async def stream_answer(
+        self,
+        query: str,
+        retrieved_content: list[dict],
+        chat_history: Optional[list[dict]] = None
+    ) -> AsyncIterator[str]:
+        """
+        Stream a plain-text answer using retrieved documents.
+
+        Same instructions as generate_answer, but the answer is produced as
+        text (not JSON) so tokens can be forwarded as they arrive. Use
+        extract_citations on the full text afterwards.
+        """
+        documents_text, history_text = self._format_answer_context(retrieved_content, chat_history)
+
+        prompt = f"""
+        Answer the user's question using ONLY the provided documents.
+
+        DOCUMENTS:
+        {documents_text}
+
+        {f'CHAT HISTORY:{chr(10)}{history_text}' if history_text else ''}
+
+        USER QUESTION: {query}
+
+        Instructions:
+        1. Answer directly and concisely
+        2. Cite sources inline using [doc_id] format
+        3. If information is insufficient, say so clearly
+        4. Do not hallucinate - only use provided content
+
+        Respond with the answer text only.
+        """
+
+        async for text in self.stream_text(prompt):
+            yield text
+
+    async def stream_text(self, prompt: str) -> AsyncIterator[str]:
+        """Stream text chunks for a prompt as Gemini generates them."""
+        stream = await self.client.aio.models.generate_content_stream(
+            model=self.model,
+            contents=[types.Part.from_text(text=prompt)]
+        )
+        async for chunk in stream:
+            if chunk.text:
+                yield chunk.text
+
+    async def embed_text(self, text: str, task_type: str = "SEMANTIC_SIMILARITY") -> list[float]:
+        """Embed a short text (e.g. a query) for similarity matching."""
+        result = await self.client.aio.models.embed_content(
+            model=EMBEDDING_MODEL,
+            contents=text[:EMBEDDING_MAX_CHARS],
+            config=types.EmbedContentConfig(task_type=task_type)
+        )
+        return result.embeddings[0].values
+
+    @retry(stop=stop_after_attempt(3), wait=wait_exponential(min=1, max=10))
+    async def _embed_batch(self, texts: list[str], task_type: str) -> list[list[float]]:
+        """Embed one batch of texts in a single request."""
+        result = await self.client.aio.models.embed_content(
+            model=EMBEDDING_MODEL,
+            contents=[text[:EMBEDDING_MAX_CHARS] for text in texts],
+            config=types.EmbedContentConfig(task_type=task_type)
+        )
+        return [embedding.values for embedding in result.embeddings]
+
+    async def embed_texts(
+        self,
+        texts: list[str],
+        task_type: str = "RETRIEVAL_DOCUMENT"
+    ) -> list[list[float]]:
+        """
+        Embed many texts, embedding_batch_size per request.
+
+        Returns:
+            One vector per text, in input order
+        """
+        batch_size = get_settings().embedding_batch_size
+        vectors = []
+        for start in range(0, len(texts), batch_size):
+            vectors.extend(await self._embed_batch(texts[start:start + batch_size], task_type))
+        return vectors
+
+    @staticmethod
+    def extract_citations(answer: str, retrieved_content: list[dict]) -> list[dict]:
+        """Build citations for [doc_id] markers in a streamed answer."""
+        cited = set(re.findall(r"\[([^\[\]]+)\]", answer))
+        return [
+            {"doc_id": doc["id"], "excerpt": doc["content"][:200]}
+            for doc in retrieved_content
+            if doc["id"] in cited
+        ]
+
     @retry(stop=stop_after_attempt(3), wait=wait_exponential(min=1, max=10))
     async def update_document_map(
         self,
@@ -304,6 +450,46 @@ class GeminiClient:
 
         return self._parse_json_response(response.text)
 
+    @staticmethod
+    def _merge_intelligence(parts: list[dict]) -> dict:
+        """
+        Merge per-segment document intelligence.
+
+        The essence comes from the first segment; topics, entities, hints and
+        chunk boundaries are unioned in document order, and document_type is
+        the majority vote.
+        """
+        def unique(values) -> list:
+            seen = set()
+            result = []
+            for value in values:
+                key = str(value).strip().lower()
+                if key and key not in seen:
+                    seen.add(key)
+                    result.append(value)
+            return result
+
+        entities: dict[str, list] = {}
+        for part in parts:
+            for kind, values in (part.get("entities") or {}).items():
+                entities.setdefault(kind, []).extend(values or [])
+
+        types_ = Counter(
+            p["document_type"] for p in parts
+            if p.get("document_type") and p["document_type"] != "other"
+        )
+
+        return {
+            "essence": next((p["essence"] for p in parts if p.get("essence")), ""),
+            "topics": unique(t for p in parts for t in p.get("topics") or []),
+            "entities": {kind: unique(values) for kind, values in entities.items()},
+            "retrieval_hints": " ".join(unique(p.get("retrieval_hints", "") for p in parts)),
+            "document_type": types_.most_common(1)[0][0] if types_ else "other",
+            "suggested_chunk_boundaries": [
+                b for p in parts for b in p.get("suggested_chunk_boundaries") or []
+            ]
+        }
+
     def _parse_ocr_response(self, text: str) -> dict:
         """Parse OCR response separating content and metadata."""
         # Try to find JSON metadata block
@@ -362,6 +548,31 @@ class GeminiClient:
         }
         return json.dumps(simplified, indent=2)
 
+    def _format_answer_context(
+        self,
+        retrieved_content: list[dict],
+        chat_history: Optional[list[dict]] = None
+    ) -> tuple[str, str]:
+        """Format retrieved documents and recent chat history for answer prompts."""
+        context_parts = []
+        for doc in retrieved_content:
+            context_parts.append(f"""
+[Document: {doc['id']}]
+{doc.get('context', '')}
+
+{doc['content']}
+---
+""")
+
+        history_text = ""
+        if chat_history:
+            history_text = "\n".join([
+                f"{msg['role'].upper()}: {msg['content']}"
+                for msg in chat_history[-5:]
+            ])
+
+        return "".join(context_parts), history_text
+
     def _format_existing_docs_summary(self, document_map: dict) -> str:
         """Format existing documents for map update prompt."""
         docs = document_map.get("documents", [])
@@ -0,0 +1,138 @@
+"""
+Hybrid chunk search over Weaviate.
+Chunks are embedded and indexed on upload; queries run BM25 and vector
+search and fuse the two rankings with reciprocal rank fusion (RRF), so
+retrieval latency and prompt size do not grow with the corpus.
+"""
+import asyncio
+from typing import Optional
+
+from app.config import get_settings
+from app.core.gemini_client import get_gemini_client
+from app.db.weaviate import (
+    get_weaviate_client,
+    store_chunk_vectors,
+    delete_document_vectors,
+    search_bm25_chunks,
+    search_similar_chunks
+)
+
+
+def reciprocal_rank_fusion(result_lists: list[list[dict]], k: int, key: str = "chunk_id") -> list[dict]:
+    """
+    Fuse rankings by summing 1 / (k + rank) per item across lists.
+
+    Returns:
+        Items (first occurrence kept) sorted by fused score, with "score" replaced
+    """
+    scores: dict[str, float] = {}
+    items: dict[str, dict] = {}
+    for results in result_lists:
+        for rank, item in enumerate(results, start=1):
+            ref = item[key]
+            scores[ref] = scores.get(ref, 0.0) + 1.0 / (k + rank)
+            items.setdefault(ref, item)
+
+    ranked = sorted(scores, key=scores.get, reverse=True)
+    return [{**items[ref], "score": round(scores[ref], 6)} for ref in ranked]
+
+
+class HybridSearcher:
+    """BM25 + vector chunk search with RRF, and chunk indexing."""
+
+    def __init__(self):
+        self.gemini = get_gemini_client()
+        self.settings = get_settings()
+
+    @staticmethod
+    def available() -> bool:
+        """True when Weaviate is connected."""
+        return get_weaviate_client() is not None
+
+    async def search(self, query: str, workspace_id: str, limit: int) -> list[dict]:
+        """
+        Return up to limit fused chunk hits.
+
+        Hits are {"chunk_id", "document_id", "content", "section", "score"};
+        chunk_id is a retrieval reference (document id for small documents).
+        Falls back to BM25 alone if query embedding fails.
+        """
+        if not self.available():
+            return []
+
+        candidates = max(limit, self.settings.hybrid_candidates)
+        # Keyword search does not need the embedding, so it overlaps with it
+        bm25_task = asyncio.create_task(search_bm25_chunks(query, workspace_id, candidates))
+        try:
+            vector = await self.gemini.embed_text(query, task_type="RETRIEVAL_QUERY")
+            dense = await search_similar_chunks(vector, workspace_id, candidates)
+        except Exception as e:
+            print(f"[WARN] Vector search failed, using BM25 only: {e}")
+            dense = []
+        sparse = await bm25_task
+
+        return reciprocal_rank_fusion([sparse, dense], self.settings.hybrid_rrf_k)[:limit]
+
+    async def index_document(
+        self,
+        document_id: str,
+        workspace_id: str,
+        filename: str,
+        result: dict
+    ) -> dict:
+        """
+        Embed and index a processed document, replacing earlier vectors.
+
+        Large documents are indexed per chunk (ids match DocumentChunk.chunk_id);
+        small documents are indexed whole under the document id.
+
+        Best-effort: vectors only augment retrieval, so failures are logged
+        and returned as {"indexed": 0, "error", "incomplete"} instead of
+        raised. "incomplete" is True when the document's earlier vectors were
+        already deleted, leaving it with partial or no vectors until it is
+        re-indexed (retrieval falls back to the document map).
+        """
+        if not self.available():
+            return {"indexed": 0}
+
+        if result.get("chunks"):
+            units = [
+                {
+                    "chunk_id": f"{document_id}_{chunk['chunk_id']}",
+                    "content": chunk["content"],
+                    "section": chunk.get("section", "")
+                }
+                for chunk in result["chunks"]
+            ]
+        else:
+            units = [{"chunk_id": document_id, "content": result["content"], "section": ""}]
+
+        for unit in units:
+            unit["document_id"] = document_id
+            unit["workspace_id"] = workspace_id
+
+        replacing = False
+        try:
+            vectors = await self.gemini.embed_texts([
+                f"{filename} - {unit['section']}\n{unit['content']}" for unit in units
+            ])
+
+            replacing = True
+            await delete_document_vectors(document_id)
+            indexed = await store_chunk_vectors(units, vectors)
+        except Exception as e:
+            print(f"[WARN] Vector indexing failed for {document_id}: {e}")
+            return {"indexed": 0, "error": str(e)[:500], "incomplete": replacing}
+        return {"indexed": indexed}
+
+
+# Singleton instance
+_hybrid_searcher: Optional[HybridSearcher] = None
+
+
+def get_hybrid_searcher() -> HybridSearcher:
+    """Get singleton hybrid searcher instance."""
+    global _hybrid_searcher
+    if _hybrid_searcher is None:
+        _hybrid_searcher = HybridSearcher()
+    return _hybrid_searcher
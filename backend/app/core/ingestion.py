@@ -0,0 +1,462 @@
+"""
+Document ingestion pipeline and background job queue.
+
+The pipeline runs in stages - ocr, chunking, map, sql, vectors - and is shared by the
+synchronous upload endpoint and the queue. Queued jobs live in Postgres
+(ingestion_jobs); worker tasks claim them with FOR UPDATE SKIP LOCKED, so
+any number of API processes can drain the same queue. Each stage's status
+is stored on the job, and a retry only re-runs stages that did not finish.
+"""
+import asyncio
+import uuid
+from datetime import datetime, timedelta
+from typing import Optional
+
+import tiktoken
+from sqlalchemy import select, delete, insert, update, or_, and_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import get_settings
+from app.db.models import Document, DocumentChunk, IngestionJob
+from app.db.postgres import get_session_maker
+from app.core.chunker import get_chunker
+from app.core.ocr_processor import get_ocr_processor
+from app.core.document_map import DocumentMapManager
+from app.core.hybrid_search import get_hybrid_searcher
+from app.core.agentic_sql.extractor import StructuredExtractor
+from app.core.agentic_sql.schemas import SQLDocument
+
+STAGES = ("ocr", "chunking", "map", "sql", "vectors")
+
+ALLOWED_TYPES = {
+    "application/pdf": "pdf",
+    "image/png": "image",
+    "image/jpeg": "image",
+    "image/jpg": "image",
+    "image/webp": "image",
+    "text/markdown": "markdown",
+    "text/x-markdown": "markdown",
+    "text/plain": "text"  # Some systems send .md as text/plain
+}
+
+
+def resolve_file_type(filename: str, content_type: Optional[str]) -> Optional[str]:
+    """Map an upload to pdf/image/markdown/text, or None if unsupported."""
+    # Check if it's a markdown file by extension (some systems don't set correct MIME type)
+    if (filename or "").lower().endswith(".md"):
+        return "markdown"
+    return ALLOWED_TYPES.get(content_type)
+
+
+async def process_markdown(file_bytes: bytes, filename: str) -> dict:
+    """
+    Process markdown/text files directly without OCR.
+
+    Returns same format as OCR processor for compatibility.
+    """
+    settings = get_settings()
+    tokenizer = tiktoken.get_encoding("cl100k_base")
+
+    # Decode content
+    try:
+        content = file_bytes.decode("utf-8")
+    except UnicodeDecodeError:
+        content = file_bytes.decode("latin-1")
+
+    # Count tokens
+    token_count = len(tokenizer.encode(content))
+
+    # Determine size class
+    size_class = "small" if token_count < settings.small_doc_threshold_tokens else "large"
+
+    result = {
+        "content": content,
+        "metadata": {
+            "filename": filename,
+            "token_count": token_count,
+            "file_type": "markdown"
+        },
+        "size_class": size_class,
+        "chunks": None
+    }
+
+    # Create chunks for large documents
+    if size_class == "large":
+        result["chunks"] = create_markdown_chunks(content, settings.chunk_size_tokens)
+
+    return result
+
+
+def create_markdown_chunks(content: str, max_tokens: int) -> list:
+    """Create chunks from markdown content using header boundaries."""
+    chunker = get_chunker()
+    chunks = list(chunker.iter_chunks(content, max_tokens=max_tokens))
+    return chunker.enrich_chunks(chunks)
+
+
+async def process_file(
+    file_bytes: bytes,
+    filename: str,
+    content_type: Optional[str],
+    file_type: str
+) -> dict:
+    """OCR/read a file into {"content", "metadata", "size_class", "chunks"}."""
+    if file_type in ("markdown", "text"):
+        # Markdown/plain text - no OCR needed, just read the content
+        return await process_markdown(file_bytes, filename)
+
+    ocr_processor = get_ocr_processor()
+    if file_type == "pdf":
+        return await ocr_processor.process_pdf(file_bytes, filename)
+    return await ocr_processor.process_image(file_bytes, filename, content_type)
+
+
+async def store_document(
+    db: AsyncSession,
+    doc_id: str,
+    workspace_id: str,
+    filename: str,
+    result: dict
+) -> None:
+    """Store document and its chunks, replacing any earlier attempt."""
+    # Chunks cascade
+    await db.execute(delete(Document).where(Document.id == doc_id))
+
+    await db.execute(insert(Document).values(
+        id=doc_id,
+        workspace_id=workspace_id,
+        filename=filename,
+        content=result["content"],
+        size_class=result["size_class"],
+        token_count=result["metadata"].get("token_count", 0),
+        doc_metadata=result["metadata"]
+    ))
+
+    # Store chunks if large document, in one multi-row INSERT
+    if result["chunks"]:
+        await db.execute(insert(DocumentChunk), [
+            {
+                "chunk_id": f"{doc_id}_{chunk['chunk_id']}",
+                "document_id": doc_id,
+                "content": chunk["content"],
+                "section": chunk["section"],
+                "context": chunk["context"],
+                "position": chunk["position"],
+                "token_count": chunk["token_count"]
+            }
+            for chunk in result["chunks"]
+        ])
+
+    await db.commit()
+
+
+async def build_map(doc_id: str, workspace_id: str, filename: str, result: dict) -> dict:
+    """Add document to the document map (original RAG) on its own session."""
+    async with get_session_maker()() as session:
+        return await DocumentMapManager(session).add_document(
+            workspace_id=workspace_id,
+            document_id=doc_id,
+            filename=filename,
+            content=result["content"],
+            size_class=result["size_class"],
+            chunks=result["chunks"],
+            intelligence=result.get("intelligence")
+        )
+
+
+async def extract_sql(doc_id: str, workspace_id: str, filename: str, result: dict) -> dict:
+    """Extract to SQL tables (Agentic SQL RAG) on its own session."""
+    async with get_session_maker()() as session:
+        # Clear rows from an earlier attempt (claims etc. cascade)
+        await session.execute(delete(SQLDocument).where(SQLDocument.id == doc_id))
+        return await StructuredExtractor(session).extract_and_store(
+            document_id=doc_id,
+            workspace_id=workspace_id,
+            filename=filename,
+            content=result["content"],
+            chunks=result["chunks"]
+        )
+
+
+async def index_vectors(doc_id: str, workspace_id: str, filename: str, result: dict) -> dict:
+    """Embed and index chunks in Weaviate for hybrid retrieval (best-effort, never raises)."""
+    return await get_hybrid_searcher().index_document(doc_id, workspace_id, filename, result)
+
+
+# Stages after chunking, which run concurrently
+STAGE_RUNNERS = {"map": build_map, "sql": extract_sql, "vectors": index_vectors}
+
+
+def extraction_stages(extraction_mode: str) -> list[str]:
+    """Extraction stages (map, sql, vectors) selected by extraction_mode."""
+    stages = []
+    if extraction_mode in ["map_only", "both"]:
+        stages.append("map")
+        # Vectors serve the document map RAG path
+        if get_settings().vector_index_enabled:
+            stages.append("vectors")
+    if extraction_mode in ["sql_only", "both"]:
+        stages.append("sql")
+    return stages
+
+
+async def extract_document(
+    doc_id: str,
+    workspace_id: str,
+    filename: str,
+    result: dict,
+    extraction_mode: str
+) -> tuple[Optional[dict], Optional[dict]]:
+    """
+    Run map building, SQL extraction and vector indexing for a stored document.
+
+    The selected branches run concurrently, each on its own session, so
+    latency is that of the slowest branch. Document
+    intelligence already extracted during OCR (large PDFs) is reused.
+    Map and SQL failures are raised; vector indexing is best-effort and
+    reports failures in its stage result instead.
+
+    Returns:
+        (map entry or None, SQL extraction stats or None)
+    """
+    stages = extraction_stages(extraction_mode)
+
+    # Let every branch finish before surfacing a failure from any
+    outcomes = await asyncio.gather(
+        *(STAGE_RUNNERS[stage](doc_id, workspace_id, filename, result) for stage in stages),
+        return_exceptions=True
+    )
+    for outcome in outcomes:
+        if isinstance(outcome, BaseException):
+            raise outcome
+
+    by_stage = dict(zip(stages, outcomes))
+    return by_stage.get("map"), by_stage.get("sql")
+
+
+async def enqueue_job(
+    db: AsyncSession,
+    workspace_id: str,
+    filename: str,
+    content_type: Optional[str],
+    file_bytes: bytes,
+    extraction_mode: str,
+    batch_id: Optional[str] = None
+) -> IngestionJob:
+    """Create a queued ingestion job (not committed)."""
+    wanted = set(extraction_stages(extraction_mode))
+    job = IngestionJob(
+        id=f"job_{uuid.uuid4().hex[:12]}",
+        workspace_id=workspace_id,
+        batch_id=batch_id,
+        filename=filename,
+        content_type=content_type,
+        extraction_mode=extraction_mode,
+        file_data=file_bytes,
+        document_id=f"doc_{uuid.uuid4().hex[:12]}",
+        status="queued",
+        stages={
+            stage: "pending" if stage in ("ocr", "chunking") or stage in wanted else "skipped"
+            for stage in STAGES
+        },
+        attempts=0,
+        available_at=datetime.utcnow()
+    )
+    db.add(job)
+    return job
+
+
+class IngestionQueue:
+    """Worker tasks that drain the Postgres ingestion queue."""
+
+    def __init__(self):
+        self.settings = get_settings()
+        self._tasks: list[asyncio.Task] = []
+        self._wakeup = asyncio.Event()
+
+    def start(self) -> None:
+        """Start worker tasks (one job at a time each)."""
+        if self._tasks:
+            return
+        for i in range(self.settings.ingestion_workers):
+            self._tasks.append(asyncio.create_task(self._worker(i)))
+
+    async def stop(self) -> None:
+        """Cancel worker tasks; interrupted jobs are reclaimed after the lock timeout."""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def notify(self) -> None:
+        """Wake idle workers in this process after enqueueing."""
+        self._wakeup.set()
+
+    async def _worker(self, worker_id: int) -> None:
+        """Claim and run jobs until cancelled."""
+        while True:
+            try:
+                job_id = await self._claim_job()
+            except Exception as e:
+                print(f"[WARN] Ingestion worker {worker_id} failed to claim job: {e}")
+                job_id = None
+
+            if job_id is None:
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(
+                        self._wakeup.wait(), timeout=self.settings.ingestion_poll_seconds
+                    )
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            try:
+                await self.run_job(job_id)
+            except Exception as e:
+                print(f"[WARN] Ingestion job {job_id} crashed: {e}")
+
+    async def _claim_job(self) -> Optional[str]:
+        """Lock the oldest runnable job with SKIP LOCKED and mark it running."""
+        now = datetime.utcnow()
+        stale_before = now - timedelta(seconds=self.settings.ingestion_lock_timeout_seconds)
+
+        async with get_session_maker()() as db:
+            result = await db.execute(
+                select(IngestionJob)
+                .where(or_(
+                    and_(IngestionJob.status == "queued", IngestionJob.available_at <= now),
+                    # Worker died mid-job
+                    and_(IngestionJob.status == "running", IngestionJob.locked_at < stale_before)
+                ))
+                .order_by(IngestionJob.created_at)
+                .limit(1)
+                .with_for_update(skip_locked=True)
+            )
+            job = result.scalar_one_or_none()
+            if job is None:
+                return None
+
+            job.status = "running"
+            job.locked_at = now
+            job.attempts += 1
+            await db.commit()
+            return job.id
+
+    async def run_job(self, job_id: str) -> None:
+        """Run every unfinished stage of a claimed job, keeping its lock fresh."""
+        heartbeat = asyncio.create_task(self._heartbeat(job_id))
+        try:
+            await self._run_stages(job_id)
+        finally:
+            heartbeat.cancel()
+            await asyncio.gather(heartbeat, return_exceptions=True)
+
+    async def _heartbeat(self, job_id: str) -> None:
+        """
+        Bump locked_at every lock timeout / 3 while the job runs.
+
+        A single stage (OCR of a large PDF, map-reduce extraction) can outlast
+        the lock timeout; without this the job would be reclaimed and run
+        twice. Uses its own session so it never waits on the stage's transaction.
+        """
+        interval = max(1, self.settings.ingestion_lock_timeout_seconds / 3)
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                async with get_session_maker()() as db:
+                    await db.execute(
+                        update(IngestionJob)
+                        .where(IngestionJob.id == job_id, IngestionJob.status == "running")
+                        .values(locked_at=datetime.utcnow())
+                    )
+                    await db.commit()
+            except Exception as e:
+                print(f"[WARN] Ingestion job {job_id} heartbeat failed: {e}")
+
+    async def _run_stages(self, job_id: str) -> None:
+        """Run every unfinished stage of a job and record the outcome."""
+        async with get_session_maker()() as db:
+            job = await db.get(IngestionJob, job_id)
+            stages = dict(job.stages)
+
+            async def set_stages(updates: dict) -> None:
+                stages.update(updates)
+                job.stages = dict(stages)
+                job.locked_at = datetime.utcnow()
+                await db.commit()
+
+            try:
+                result = job.stage_result
+
+                if stages["ocr"] != "done" or result is None:
+                    await set_stages({"ocr": "running"})
+                    file_type = resolve_file_type(job.filename, job.content_type)
+                    result = await process_file(
+                        job.file_data, job.filename, job.content_type, file_type
+                    )
+                    job.stage_result = result
+                    await set_stages({"ocr": "done"})
+
+                if stages["chunking"] != "done":
+                    await set_stages({"chunking": "running"})
+                    await store_document(
+                        db, job.document_id, job.workspace_id, job.filename, result
+                    )
+                    await set_stages({"chunking": "done"})
+
+                # Jobs queued before a stage existed have no entry for it
+                pending = [s for s in STAGE_RUNNERS if stages.get(s, "skipped") not in ("done", "skipped")]
+                if pending:
+                    await set_stages({s: "running" for s in pending})
+                    outcomes = await asyncio.gather(
+                        *(
+                            STAGE_RUNNERS[s](job.document_id, job.workspace_id, job.filename, result)
+                            for s in pending
+                        ),
+                        return_exceptions=True
+                    )
+                    # Best-effort stages (vectors) report errors without raising
+                    await set_stages({
+                        s: "failed" if isinstance(o, BaseException) or (o or {}).get("error") else "done"
+                        for s, o in zip(pending, outcomes)
+                    })
+                    for outcome in outcomes:
+                        if isinstance(outcome, BaseException):
+                            raise outcome
+
+            except Exception as e:
+                await db.rollback()
+                job = await db.get(IngestionJob, job_id)
+                job.stages = {
+                    s: "failed" if state == "running" else state for s, state in stages.items()
+                }
+                job.error = str(e)[:2000]
+                if job.attempts < self.settings.ingestion_max_attempts:
+                    # Back off, then retry only the unfinished stages
+                    job.status = "queued"
+                    job.available_at = datetime.utcnow() + timedelta(
+                        seconds=self.settings.ingestion_retry_backoff_seconds * 2 ** (job.attempts - 1)
+                    )
+                else:
+                    job.status = "failed"
+                await db.commit()
+                return
+
+            job.status = "completed"
+            job.error = None
+            job.file_data = None
+            job.stage_result = None
+            await db.commit()
+
+
+# Singleton instance
+_ingestion_queue: Optional[IngestionQueue] = None
+
+
+def get_ingestion_queue() -> IngestionQueue:
+    """Get singleton ingestion queue instance."""
+    global _ingestion_queue
+    if _ingestion_queue is None:
+        _ingestion_queue = IngestionQueue()
+    return _ingestion_queue
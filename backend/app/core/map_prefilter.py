@@ -0,0 +1,99 @@
+"""
+Local pre-filter for document map retrieval.
+A BM25 index over each map entry's essence, topics, entities and retrieval
+hints selects the top-K candidate documents, so only those are rendered
+into the LLM map prompt.
+"""
+import math
+import re
+from collections import Counter
+
+TOKEN_PATTERN = re.compile(r"\w+")
+
+
+def tokenize(text: str) -> list[str]:
+    """Lowercase word tokens."""
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+class MapPrefilter:
+    """BM25 index over document map entries."""
+
+    def __init__(self, documents: list[dict], k1: float = 1.5, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self.doc_ids = [d["id"] for d in documents]
+        self._postings: dict[str, list[tuple[int, int]]] = {}
+        self._lengths: list[int] = []
+
+        for idx, doc in enumerate(documents):
+            terms = Counter(tokenize(self._document_text(doc)))
+            self._lengths.append(sum(terms.values()))
+            for term, tf in terms.items():
+                self._postings.setdefault(term, []).append((idx, tf))
+
+        self._avg_length = (sum(self._lengths) / len(self._lengths)) if self._lengths else 0.0
+
+    @staticmethod
+    def _document_text(doc: dict) -> str:
+        """Searchable text for a map entry."""
+        parts = [
+            doc.get("filename", ""),
+            doc.get("type", ""),
+            doc.get("essence", ""),
+            " ".join(doc.get("topics", [])),
+            str(doc.get("retrieval_hints", ""))
+        ]
+        entities = doc.get("entities", {})
+        if isinstance(entities, dict):
+            parts.extend(" ".join(map(str, values)) for values in entities.values())
+        for chunk in doc.get("chunks") or []:
+            parts.append(chunk.get("section", ""))
+        return " ".join(parts)
+
+    def search(self, query: str, top_k: int) -> list[str]:
+        """
+        Return ids of the top_k highest scoring documents.
+
+        Falls back to the most recently added documents when no query term matches.
+        """
+        n_docs = len(self.doc_ids)
+        scores: dict[int, float] = {}
+
+        for term in set(tokenize(query)):
+            postings = self._postings.get(term)
+            if not postings:
+                continue
+            idf = math.log(1 + (n_docs - len(postings) + 0.5) / (len(postings) + 0.5))
+            for idx, tf in postings:
+                norm = self.k1 * (1 - self.b + self.b * self._lengths[idx] / self._avg_length)
+                scores[idx] = scores.get(idx, 0.0) + idf * tf * (self.k1 + 1) / (tf + norm)
+
+        if not scores:
+            return self.doc_ids[-top_k:][::-1]
+
+        ranked = sorted(scores, key=scores.get, reverse=True)[:top_k]
+        return [self.doc_ids[idx] for idx in ranked]
+
+
+def build_candidate_map(document_map: dict, doc_ids: list[str]) -> dict:
+    """Restrict a document map to doc_ids, keeping only matching cross-references."""
+    selected = set(doc_ids)
+    order = {doc_id: i for i, doc_id in enumerate(doc_ids)}
+
+    cross_references = {}
+    for ref_type, refs in document_map.get("cross_references", {}).items():
+        cross_references[ref_type] = {
+            key: kept
+            for key, ids in refs.items()
+            if (kept := [d for d in ids if d in selected])
+        }
+
+    return {
+        **document_map,
+        "documents": sorted(
+            (d for d in document_map.get("documents", []) if d["id"] in selected),
+            key=lambda d: order[d["id"]]
+        ),
+        "cross_references": cross_references
+    }
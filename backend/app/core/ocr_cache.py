@@ -0,0 +1,209 @@
+"""
+Content-addressed OCR result cache.
+Results are keyed by the SHA-256 of the input bytes plus the engine and
+prompt version, and stored as JSON files on local disk with size-bounded
+LRU eviction (file mtime is the recency).
+
+The cache directory is shared by the API process and the OCR worker
+processes, so the size total and hit/miss counters live in a stats file
+next to the entries. Updates and eviction hold an exclusive file lock, and
+eviction rescans the directory, so the size bound holds across processes.
+"""
+import hashlib
+import json
+import os
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator, Optional
+
+from app.config import get_settings
+
+# Optional import - not available on Windows
+try:
+    import fcntl
+    FCNTL_AVAILABLE = True
+except ImportError:
+    FCNTL_AVAILABLE = False
+
+STAT_FIELDS = ("entries", "bytes", "hits", "misses", "evictions")
+
+
+class OCRCache:
+    """Disk-backed LRU cache for OCR results, shared between processes."""
+
+    def __init__(self, cache_dir: str, max_bytes: int, enabled: bool = True):
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self.enabled = enabled
+        self._lock = threading.Lock()  # threads here; the file lock covers other processes
+        self._lock_path = self.cache_dir / ".lock"
+        self._stats_path = self.cache_dir / "stats.json"
+
+        if self.enabled:
+            try:
+                self.cache_dir.mkdir(parents=True, exist_ok=True)
+                with self._locked():
+                    if not self._stats_path.exists():
+                        # First use, or a cache written before stats were kept
+                        self._write_stats(self._rescan(dict.fromkeys(STAT_FIELDS, 0)))
+            except OSError as e:
+                print(f"[WARN] OCR cache disabled: {e}")
+                self.enabled = False
+
+    @staticmethod
+    def make_key(data: bytes, engine: str, prompt_version: str) -> str:
+        """Build cache key from content hash, engine and prompt version."""
+        digest = hashlib.sha256(data).hexdigest()
+        return hashlib.sha256(f"{digest}|{engine}|{prompt_version}".encode()).hexdigest()
+
+    @staticmethod
+    def prompt_version(prompt: str) -> str:
+        """Fingerprint a custom prompt for use as a prompt version."""
+        return "custom-" + hashlib.sha256(prompt.encode()).hexdigest()[:16]
+
+    def get(self, key: str) -> Optional[dict]:
+        """Return cached result or None, updating recency on hit."""
+        if not self.enabled:
+            return None
+
+        path = self._path(key)
+        try:
+            value = json.loads(path.read_bytes())
+            os.utime(path)
+        except (OSError, json.JSONDecodeError):
+            # Missing, evicted by another process or corrupt - a miss
+            value = None
+
+        self._update_stats(hits=int(value is not None), misses=int(value is None))
+        return value
+
+    def set(self, key: str, value: dict) -> None:
+        """Store result and evict least recently used entries over budget."""
+        if not self.enabled:
+            return
+
+        data = json.dumps(value, default=str).encode("utf-8")
+        if len(data) > self.max_bytes:
+            return
+
+        path = self._path(key)
+        try:
+            path.parent.mkdir(exist_ok=True)
+            tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+            tmp_path.write_bytes(data)
+            with self._locked():
+                try:
+                    replaced = path.stat().st_size
+                except OSError:
+                    replaced = None
+                os.replace(tmp_path, path)
+                stats = self._read_stats()
+                stats["entries"] += int(replaced is None)
+                stats["bytes"] += len(data) - (replaced or 0)
+                if stats["bytes"] > self.max_bytes:
+                    stats = self._rescan(stats, evict=True)
+                self._write_stats(stats)
+        except OSError as e:
+            print(f"[WARN] OCR cache write failed: {e}")
+
+    def stats(self) -> dict:
+        """Return hit/miss counters and size information shared by all processes."""
+        stats = self._read_stats() if self.enabled else dict.fromkeys(STAT_FIELDS, 0)
+        lookups = stats["hits"] + stats["misses"]
+        return {
+            "enabled": self.enabled,
+            "entries": stats["entries"],
+            "size_mb": round(stats["bytes"] / (1024 * 1024), 2),
+            "max_mb": round(self.max_bytes / (1024 * 1024), 2),
+            "hits": stats["hits"],
+            "misses": stats["misses"],
+            "hit_rate": round(stats["hits"] / lookups, 3) if lookups else 0.0,
+            "evictions": stats["evictions"]
+        }
+
+    def _path(self, key: str) -> Path:
+        """Shard files into 256 subdirectories by key prefix."""
+        return self.cache_dir / key[:2] / f"{key}.json"
+
+    @contextmanager
+    def _locked(self) -> Iterator[None]:
+        """Hold the thread lock and an exclusive lock on the cache directory."""
+        with self._lock, open(self._lock_path, "a") as lock_file:
+            if FCNTL_AVAILABLE:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            yield  # closing the file releases the lock
+
+    def _read_stats(self) -> dict:
+        """Read shared stats; the file is replaced atomically, so no lock is needed."""
+        try:
+            stored = json.loads(self._stats_path.read_bytes())
+        except (OSError, json.JSONDecodeError):
+            stored = {}
+        return {field: int(stored.get(field, 0)) for field in STAT_FIELDS}
+
+    def _write_stats(self, stats: dict) -> None:
+        """Atomically replace the shared stats file (file lock held)."""
+        tmp_path = self._stats_path.with_suffix(f".{os.getpid()}.tmp")
+        tmp_path.write_text(json.dumps(stats))
+        os.replace(tmp_path, self._stats_path)
+
+    def _update_stats(self, **deltas: int) -> None:
+        """Add deltas to the shared counters."""
+        try:
+            with self._locked():
+                stats = self._read_stats()
+                for field, delta in deltas.items():
+                    stats[field] += delta
+                self._write_stats(stats)
+        except OSError as e:
+            print(f"[WARN] OCR cache stats update failed: {e}")
+
+    def _rescan(self, stats: dict, evict: bool = False) -> dict:
+        """
+        Recount entries and bytes from disk (file lock held).
+
+        With evict, delete least recently used files down to 90% of
+        max_bytes, so the next eviction is not one write away.
+        """
+        files = []
+        for path in self.cache_dir.glob("*/*.json"):
+            try:
+                st = path.stat()
+            except OSError:
+                continue
+            files.append((st.st_mtime, st.st_size, path))
+
+        total = sum(size for _, size, _ in files)
+        entries = len(files)
+        if evict and total > self.max_bytes:
+            target = int(self.max_bytes * 0.9)
+            for _, size, path in sorted(files):
+                if total <= target:
+                    break
+                try:
+                    path.unlink()
+                except OSError:
+                    continue
+                total -= size
+                entries -= 1
+                stats["evictions"] += 1
+
+        return {**stats, "entries": entries, "bytes": total}
+
+
+# Singleton instance
+_ocr_cache: Optional[OCRCache] = None
+
+
+def get_ocr_cache() -> OCRCache:
+    """Get singleton OCR cache instance."""
+    global _ocr_cache
+    if _ocr_cache is None:
+        settings = get_settings()
+        _ocr_cache = OCRCache(
+            cache_dir=settings.ocr_cache_dir or os.path.join(settings.storage_path, "ocr_cache"),
+            max_bytes=settings.ocr_cache_max_mb * 1024 * 1024,
+            enabled=settings.ocr_cache_enabled
+        )
+    return _ocr_cache
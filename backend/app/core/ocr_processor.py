@@ -1,45 +1,64 @@
 """
 PDF processing and OCR using Gemini multimodal capabilities.
 """
+import asyncio
 import fitz  # PyMuPDF
 from typing import Optional
 import tiktoken
 
-from app.core.gemini_client import get_gemini_client
+from app.core.gemini_client import GeminiClient, get_gemini_client
+from app.core.ocr_cache import get_ocr_cache
+from app.core.chunker import get_chunker
 from app.config import get_settings
 
+# Bump when the image OCR prompt changes to invalidate cached results
+IMAGE_PROMPT_VERSION = "image-v1"
+
 
 class OCRProcessor:
     """Process documents using Gemini's native multimodal OCR."""
 
-    def __init__(self):
-        self.gemini = get_gemini_client()
+    def __init__(self, gemini: Optional[GeminiClient] = None):
+        self.gemini = gemini or get_gemini_client()
         self.settings = get_settings()
         self.tokenizer = tiktoken.get_encoding("cl100k_base")
+        self.chunker = get_chunker()
 
     async def process_pdf(
         self,
         file_bytes: bytes,
-        filename: str
+        filename: str,
+        parallel: Optional[bool] = None
     ) -> dict:
         """
         Process PDF using Gemini native vision.
 
+        PDFs longer than ocr_pages_per_range pages are split into page
+        ranges that are OCR'd concurrently (see _ocr_page_ranges). Pass
+        parallel=False to force a single whole-document request.
+
         Returns:
             {
                 "content": str,
                 "metadata": dict,
                 "size_class": "small" | "large",
-                "chunks": list[dict] | None
+                "chunks": list[dict] | None,
+                "intelligence": dict  (large documents only; reuse for the map)
             }
         """
-        # Get page count for logging
+        # Get page count for logging and range planning
         pdf = fitz.open(stream=file_bytes, filetype="pdf")
         page_count = len(pdf)
         pdf.close()
 
+        if parallel is None:
+            parallel = page_count > self.settings.ocr_pages_per_range
+
         # Use Gemini for OCR
-        ocr_result = await self.gemini.ocr_pdf(file_bytes)
+        if parallel:
+            ocr_result = await self._ocr_page_ranges(file_bytes)
+        else:
+            ocr_result = await self.gemini.ocr_pdf(file_bytes)
 
         content = ocr_result["content"]
         metadata = ocr_result["metadata"]
@@ -62,10 +81,82 @@ class OCRProcessor:
 
         # Chunk large documents
         if size_class == "large":
-            result["chunks"] = await self._create_contextual_chunks(content, filename)
+            intelligence = await self.gemini.extract_document_intelligence(content, filename)
+            result["intelligence"] = intelligence
+            result["chunks"] = await self._create_contextual_chunks(content, filename, intelligence)
 
         return result
 
+    async def _ocr_page_ranges(self, file_bytes: bytes) -> dict:
+        """
+        OCR a PDF as concurrent page ranges and stitch results in order.
+
+        Ranges run under a semaphore of ocr_max_concurrency. Ranges that
+        still fail after GeminiClient's own retries are re-submitted for
+        up to ocr_range_retry_rounds extra rounds; successful ranges are
+        never re-sent.
+        """
+        ranges = self._split_pdf(file_bytes, self.settings.ocr_pages_per_range)
+        semaphore = asyncio.Semaphore(max(1, self.settings.ocr_max_concurrency))
+
+        async def ocr_range(range_bytes: bytes) -> dict:
+            async with semaphore:
+                return await self.gemini.ocr_pdf(range_bytes)
+
+        results: list[Optional[dict]] = [None] * len(ranges)
+        pending = list(range(len(ranges)))
+        errors: dict[int, Exception] = {}
+
+        for _ in range(1 + max(0, self.settings.ocr_range_retry_rounds)):
+            outcomes = await asyncio.gather(
+                *(ocr_range(ranges[i][2]) for i in pending),
+                return_exceptions=True
+            )
+            failed = []
+            for i, outcome in zip(pending, outcomes):
+                if isinstance(outcome, Exception):
+                    errors[i] = outcome
+                    failed.append(i)
+                else:
+                    results[i] = outcome
+            pending = failed
+            if not pending:
+                break
+
+        if pending:
+            first, last, _ = ranges[pending[0]]
+            raise RuntimeError(
+                f"OCR failed for {len(pending)} page range(s), "
+                f"first pages {first + 1}-{last + 1}: {errors[pending[0]]}"
+            )
+
+        content = "\n\n".join(r["content"] for r in results)
+        metadata = {
+            "has_tables": any(r["metadata"].get("has_tables") for r in results),
+            "has_images": any(r["metadata"].get("has_images") for r in results),
+            "estimated_tokens": sum(r["metadata"].get("estimated_tokens", 0) for r in results),
+            "page_ranges": len(ranges)
+        }
+        return {"content": content, "metadata": metadata}
+
+    @staticmethod
+    def _split_pdf(file_bytes: bytes, pages_per_range: int) -> list[tuple[int, int, bytes]]:
+        """Split PDF into (first_page, last_page, pdf_bytes) ranges, 0-indexed."""
+        pdf = fitz.open(stream=file_bytes, filetype="pdf")
+        ranges = []
+        try:
+            step = max(1, pages_per_range)
+            for first in range(0, len(pdf), step):
+                last = min(first + step, len(pdf)) - 1
+                part = fitz.open()
+                part.insert_pdf(pdf, from_page=first, to_page=last)
+                # no_new_id keeps range bytes stable so the OCR cache can hit
+                ranges.append((first, last, part.tobytes(no_new_id=True)))
+                part.close()
+        finally:
+            pdf.close()
+        return ranges
+
     async def process_image(
         self,
         file_bytes: bytes,
@@ -75,6 +166,12 @@ class OCRProcessor:
         """Process image files (PNG, JPG, etc.)."""
         from google.genai import types
 
+        cache = get_ocr_cache()
+        cache_key = cache.make_key(file_bytes, f"gemini:{self.gemini.model}", IMAGE_PROMPT_VERSION)
+        cached = cache.get(cache_key)
+        if cached is not None:
+            return self._image_result(cached["content"], filename, mime_type)
+
         prompt = """
         Extract ALL text and content from this image.
 
@@ -100,6 +197,12 @@ class OCRProcessor:
         )
 
         content = response.text
+        cache.set(cache_key, {"content": content})
+
+        return self._image_result(content, filename, mime_type)
+
+    def _image_result(self, content: str, filename: str, mime_type: str) -> dict:
+        """Build processor result for OCR'd image content."""
         token_count = len(self.tokenizer.encode(content))
 
         return {
@@ -116,14 +219,16 @@ class OCRProcessor:
     async def _create_contextual_chunks(
         self,
         content: str,
-        filename: str
+        filename: str,
+        intelligence: Optional[dict] = None
     ) -> list[dict]:
         """
         Create semantically meaningful chunks with context metadata.
         Uses Gemini to identify natural boundaries.
         """
-        # First, get suggested chunk boundaries from Gemini
-        intelligence = await self.gemini.extract_document_intelligence(content, filename)
+        # First, get suggested chunk boundaries from Gemini (unless already extracted)
+        if intelligence is None:
+            intelligence = await self.gemini.extract_document_intelligence(content, filename)
 
         suggested_boundaries = intelligence.get("suggested_chunk_boundaries", [])
 
@@ -135,18 +240,7 @@ class OCRProcessor:
             chunks = self._semantic_split(content)
 
         # Enrich each chunk with context
-        enriched_chunks = []
-        for i, chunk in enumerate(chunks):
-            enriched_chunks.append({
-                "chunk_id": f"c{i+1}",
-                "position": f"{i+1}/{len(chunks)}",
-                "content": chunk["content"],
-                "section": chunk.get("section", f"Section {i+1}"),
-                "context": self._generate_chunk_context(chunk, chunks, i),
-                "token_count": len(self.tokenizer.encode(chunk["content"]))
-            })
-
-        return enriched_chunks
+        return self.chunker.enrich_chunks(chunks)
 
     def _split_by_boundaries(
         self,
@@ -193,72 +287,7 @@ class OCRProcessor:
 
     def _semantic_split(self, content: str) -> list[dict]:
         """Fall back to semantic splitting by headers/sections."""
-        import re
-
-        # Split on major headers
-        header_pattern = r'\n(#{1,3}\s+.+)\n'
-        parts = re.split(header_pattern, content)
-
-        chunks = []
-        current_section = "Introduction"
-        current_content = ""
-
-        settings = get_settings()
-        max_tokens = settings.chunk_size_tokens
-
-        for part in parts:
-            if re.match(r'^#{1,3}\s+', part):
-                # This is a header
-                if current_content.strip():
-                    # Save previous chunk if it has content
-                    chunks.append({
-                        "content": current_content.strip(),
-                        "section": current_section
-                    })
-                current_section = part.strip('# \n')
-                current_content = part + "\n"
-            else:
-                # This is content
-                test_content = current_content + part
-                test_tokens = len(self.tokenizer.encode(test_content))
-
-                if test_tokens > max_tokens and current_content.strip():
-                    # Save current chunk and start new one
-                    chunks.append({
-                        "content": current_content.strip(),
-                        "section": current_section
-                    })
-                    current_content = part
-                else:
-                    current_content = test_content
-
-        # Don't forget the last chunk
-        if current_content.strip():
-            chunks.append({
-                "content": current_content.strip(),
-                "section": current_section
-            })
-
-        return chunks
-
-    def _generate_chunk_context(
-        self,
-        chunk: dict,
-        all_chunks: list[dict],
-        index: int
-    ) -> str:
-        """Generate context string for a chunk."""
-        parts = [f"This is section '{chunk.get('section', 'Unknown')}' of the document."]
-
-        if index > 0:
-            prev = all_chunks[index - 1]
-            parts.append(f"Previous section: '{prev.get('section', 'Unknown')}'")
-
-        if index < len(all_chunks) - 1:
-            next_chunk = all_chunks[index + 1]
-            parts.append(f"Next section: '{next_chunk.get('section', 'Unknown')}'")
-
-        return " ".join(parts)
+        return list(self.chunker.iter_chunks(content))
 
 
 # Factory function
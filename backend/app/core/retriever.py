@@ -1,15 +1,24 @@
 """
 One-shot retrieval system using document map.
 No re-ranking required - the LLM makes intelligent retrieval decisions.
+A hybrid (BM25 + vector) mode can select chunks instead of, or candidates
+for, the map consultation.
 """
+import re
 from typing import Optional
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 
+from app.config import get_settings
 from app.core.gemini_client import get_gemini_client
 from app.core.document_map import DocumentMapManager
+from app.core.hybrid_search import get_hybrid_searcher
+from app.core.map_prefilter import build_candidate_map
 from app.db.models import Document, DocumentChunk
 
+# Chunk references are "<document id>_c<chunk number>"
+CHUNK_REF_PATTERN = re.compile(r"(.+)_c(\d+)")
+
 
 class IntelligentRetriever:
     """One-shot retrieval using document map consultation."""
@@ -17,32 +26,70 @@ class IntelligentRetriever:
     def __init__(self, db: AsyncSession):
         self.db = db
         self.gemini = get_gemini_client()
+        self.settings = get_settings()
         self.map_manager = DocumentMapManager(db)
+        self.hybrid = get_hybrid_searcher()
 
     async def retrieve(
         self,
         query: str,
         workspace_id: str = "default",
-        max_documents: int = 5
+        max_documents: int = 5,
+        mode: Optional[str] = None
     ) -> list[dict]:
         """
         Retrieve relevant documents/chunks for query.
 
         1. Get document map
-        2. Consult Gemini for retrieval decision (one-shot)
-        3. Fetch selected documents/chunks
-        4. Return with context metadata
+        2. Pre-filter large maps to top-K candidates (local BM25)
+        3. Consult Gemini for retrieval decision (one-shot)
+        4. Fetch selected documents/chunks
+        5. Return with context metadata
+
+        mode (default settings.retrieval_mode):
+            map: steps above
+            hybrid: Weaviate BM25 + vector hits fused with RRF are fetched
+                directly, without an LLM call
+            hybrid_map: documents of the hybrid hits are the candidates
+                shown to Gemini in step 3
+        Hybrid modes fall back to map when Weaviate is unavailable or finds nothing.
         """
+        mode = mode or self.settings.retrieval_mode
+
         # Get document map
         document_map = await self.map_manager.get_map(workspace_id)
 
         if not document_map["documents"]:
             return []
 
+        hits = []
+        if mode in ("hybrid", "hybrid_map"):
+            try:
+                hits = await self.hybrid.search(
+                    query,
+                    workspace_id,
+                    max_documents if mode == "hybrid" else self.settings.hybrid_candidates
+                )
+            except Exception as e:
+                print(f"[WARN] Hybrid search failed, consulting document map: {e}")
+
+        if hits and mode == "hybrid":
+            return await self._fetch_many([hit["chunk_id"] for hit in hits], document_map)
+
         # Consult map for retrieval decision
-        retrieval_decision = await self.gemini.consult_map_for_retrieval(
-            query, document_map
-        )
+        if hits:
+            doc_ids = list(dict.fromkeys(hit["document_id"] for hit in hits))
+            candidate_map = build_candidate_map(document_map, doc_ids[:self.settings.map_prefilter_top_k])
+            retrieval_decision = await self.gemini.consult_map_for_retrieval(query, candidate_map)
+        elif len(document_map["documents"]) > self.settings.map_prefilter_threshold:
+            candidate_map = self.map_manager.get_candidate_map(workspace_id, document_map, query)
+            retrieval_decision = await self.gemini.consult_map_for_retrieval(query, candidate_map)
+        else:
+            retrieval_decision = await self.gemini.consult_map_for_retrieval(
+                query,
+                document_map,
+                map_prompt=self.map_manager.get_map_prompt(workspace_id, document_map)
+            )
 
         doc_ids_to_retrieve = retrieval_decision.get("retrieve", [])[:max_documents]
 
@@ -50,75 +97,86 @@ class IntelligentRetriever:
             return []
 
         # Fetch documents and chunks
-        retrieved_content = []
+        return await self._fetch_many(doc_ids_to_retrieve, document_map)
 
-        for doc_ref in doc_ids_to_retrieve:
-            if "_c" in doc_ref:
-                # This is a chunk reference (e.g., "doc_123_c2")
-                parts = doc_ref.rsplit("_c", 1)
-                doc_id = parts[0]
-                chunk_num = int(parts[1])
+    async def _fetch_many(self, doc_refs: list[str], document_map: dict) -> list[dict]:
+        """
+        Fetch documents/chunks for doc_refs with one IN query per table.
 
-                content = await self._fetch_chunk(doc_id, chunk_num, document_map)
+        Results keep the order of doc_refs; unknown ids are skipped.
+        """
+        # Index map entries once instead of scanning per id
+        map_entries = {d["id"]: d for d in document_map["documents"]}
+
+        doc_ids = []
+        chunk_ids = []
+        resolved = []
+        for doc_ref in doc_refs:
+            # Known document ids win: a hex id such as "doc_c3ab12..." can
+            # contain "_c" followed by digits
+            match = None if doc_ref in map_entries else CHUNK_REF_PATTERN.fullmatch(doc_ref)
+            if match:
+                # This is a chunk reference (e.g., "doc_123_c2")
+                chunk_id = f"{match.group(1)}_c{int(match.group(2))}"
+                chunk_ids.append(chunk_id)
+                resolved.append((match.group(1), chunk_id))
             else:
                 # Full document
-                content = await self._fetch_document(doc_ref, document_map)
+                doc_ids.append(doc_ref)
+                resolved.append((doc_ref, None))
+
+        documents = {}
+        if doc_ids:
+            result = await self.db.execute(
+                select(Document).where(Document.id.in_(doc_ids))
+            )
+            documents = {doc.id: doc for doc in result.scalars()}
+
+        chunks = {}
+        if chunk_ids:
+            result = await self.db.execute(
+                select(DocumentChunk).where(DocumentChunk.chunk_id.in_(chunk_ids))
+            )
+            chunks = {chunk.chunk_id: chunk for chunk in result.scalars()}
+
+        retrieved_content = []
+        for doc_id, chunk_id in resolved:
+            if chunk_id is None:
+                content = self._document_result(documents.get(doc_id), map_entries.get(doc_id))
+            else:
+                content = self._chunk_result(doc_id, chunks.get(chunk_id), map_entries.get(doc_id))
 
             if content:
                 retrieved_content.append(content)
 
         return retrieved_content
 
-    async def _fetch_document(self, doc_id: str, document_map: dict) -> Optional[dict]:
-        """Fetch full document content."""
-        # Get from database
-        result = await self.db.execute(
-            select(Document).where(Document.id == doc_id)
-        )
-        doc = result.scalar_one_or_none()
-
+    @staticmethod
+    def _document_result(doc: Optional[Document], map_entry: Optional[dict]) -> Optional[dict]:
+        """Build full document content with map context."""
         if not doc:
             return None
 
-        # Get map entry for context
-        map_entry = next(
-            (d for d in document_map["documents"] if d["id"] == doc_id),
-            None
-        )
-
         return {
-            "id": doc_id,
+            "id": doc.id,
             "content": doc.content,
             "context": f"Document: {doc.filename}. {map_entry['essence'] if map_entry else ''}"
         }
 
-    async def _fetch_chunk(
-        self,
+    @staticmethod
+    def _chunk_result(
         doc_id: str,
-        chunk_num: int,
-        document_map: dict
+        chunk: Optional[DocumentChunk],
+        map_entry: Optional[dict]
     ) -> Optional[dict]:
-        """Fetch specific chunk with context."""
-        chunk_id = f"{doc_id}_c{chunk_num}"
-
-        result = await self.db.execute(
-            select(DocumentChunk).where(DocumentChunk.chunk_id == chunk_id)
-        )
-        chunk = result.scalar_one_or_none()
-
+        """Build chunk content with context from its map entry."""
         if not chunk:
             return None
 
-        # Get map entry for context
-        map_entry = next(
-            (d for d in document_map["documents"] if d["id"] == doc_id),
-            None
-        )
-
         chunk_map_entry = None
         if map_entry and map_entry.get("chunks"):
             chunk_map_entry = next(
-                (c for c in map_entry["chunks"] if c["chunk_id"] == chunk_id),
+                (c for c in map_entry["chunks"] if c["chunk_id"] == chunk.chunk_id),
                 None
             )
 
@@ -128,7 +186,7 @@ class IntelligentRetriever:
             context_parts.append(chunk_map_entry.get("context", ""))
 
         return {
-            "id": chunk_id,
+            "id": chunk.chunk_id,
             "content": chunk.content,
             "context": " ".join(context_parts)
         }
@@ -143,21 +201,7 @@ class IntelligentRetriever:
         Useful for direct retrieval without map consultation.
         """
         document_map = await self.map_manager.get_map(workspace_id)
-        retrieved_content = []
-
-        for doc_ref in doc_ids:
-            if "_c" in doc_ref:
-                parts = doc_ref.rsplit("_c", 1)
-                doc_id = parts[0]
-                chunk_num = int(parts[1])
-                content = await self._fetch_chunk(doc_id, chunk_num, document_map)
-            else:
-                content = await self._fetch_document(doc_ref, document_map)
-
-            if content:
-                retrieved_content.append(content)
-
-        return retrieved_content
+        return await self._fetch_many(doc_ids, document_map)
 
 
 def get_retriever(db: AsyncSession) -> IntelligentRetriever:
@@ -1,6 +1,9 @@
 """SQLAlchemy models for PostgreSQL."""
 from datetime import datetime
-from sqlalchemy import Column, String, Text, DateTime, Integer, ForeignKey, JSON
+from sqlalchemy import (
+    Column, String, Text, DateTime, Integer, ForeignKey, JSON, UniqueConstraint,
+    LargeBinary, Index
+)
 from sqlalchemy.orm import relationship, declarative_base
 
 Base = declarative_base()
@@ -45,16 +48,48 @@ class DocumentChunk(Base):
 
 
 class DocumentMap(Base):
-    """Living document map storage."""
+    """Living document map header (corpus summary); entries live in their own rows."""
     __tablename__ = "document_maps"
 
     id = Column(Integer, primary_key=True, autoincrement=True)
     workspace_id = Column(String(50), unique=True, index=True)
-    map_data = Column(Text, nullable=False)  # JSON string
+    map_data = Column(Text, nullable=False)  # JSON string: corpus_summary, last_updated
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
 
+class DocumentMapEntry(Base):
+    """One document's entry in the living document map."""
+    __tablename__ = "document_map_entries"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    workspace_id = Column(String(50), index=True)
+    document_id = Column(String(50), nullable=False)
+    entry = Column(JSON, nullable=False)  # essence, topics, entities, chunks, relationships
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+    __table_args__ = (
+        UniqueConstraint("workspace_id", "document_id", name="uq_map_entry_document"),
+    )
+
+
+class DocumentMapReference(Base):
+    """Cross-reference from an entity or topic to a document in the map."""
+    __tablename__ = "document_map_references"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    workspace_id = Column(String(50), index=True)
+    ref_type = Column(String(20), nullable=False)  # by_entity or by_topic
+    key = Column(String(500), nullable=False)
+    document_id = Column(String(50), nullable=False, index=True)
+
+    __table_args__ = (
+        UniqueConstraint(
+            "workspace_id", "ref_type", "key", "document_id", name="uq_map_reference"
+        ),
+    )
+
+
 class ChatHistory(Base):
     """Chat conversation history."""
     __tablename__ = "chat_history"
@@ -66,3 +101,30 @@ class ChatHistory(Base):
     content = Column(Text, nullable=False)
     citations = Column(JSON, default=[])
     created_at = Column(DateTime, default=datetime.utcnow)
+
+
+class IngestionJob(Base):
+    """Queued document ingestion, claimed by workers with FOR UPDATE SKIP LOCKED."""
+    __tablename__ = "ingestion_jobs"
+
+    id = Column(String(50), primary_key=True)
+    workspace_id = Column(String(50), default="default", index=True)
+    batch_id = Column(String(50), index=True)  # set for bulk uploads
+    filename = Column(String(255), nullable=False)
+    content_type = Column(String(100))
+    extraction_mode = Column(String(20), default="both")
+    file_data = Column(LargeBinary)  # cleared once the job completes
+    document_id = Column(String(50))
+    status = Column(String(20), default="queued")  # queued, running, completed, failed
+    stages = Column(JSON, default={})  # stage -> pending, running, done, failed, skipped
+    stage_result = Column(JSON)  # processed file, reused when later stages are retried
+    attempts = Column(Integer, default=0)
+    error = Column(Text)
+    available_at = Column(DateTime, default=datetime.utcnow)  # retry backoff
+    locked_at = Column(DateTime)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    __table_args__ = (
+        Index("idx_ingestion_jobs_claim", status, available_at),
+    )
@@ -1,5 +1,6 @@
 """PostgreSQL database connection and session management."""
 from typing import AsyncGenerator
+from sqlalchemy import text
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
 
 from app.config import get_settings
@@ -8,7 +9,7 @@ from app.db.models import Base
 # Import agentic SQL models to register them with Base
 from app.core.agentic_sql.schemas import (
     SQLDocument, SQLClaim, SQLMetric, SQLEntity,
-    SQLTopic, SQLRelationship, SQLDocumentChunk
+    SQLTopic, SQLRelationship, SQLDocumentChunk, SEARCH_SCHEMA_DDL
 )
 
 engine = None
@@ -41,6 +42,26 @@ async def init_db():
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
 
+    await create_search_schema(engine)
+
+
+async def create_search_schema(engine) -> None:
+    """Add full-text search columns, indexes and search_text() (idempotent)."""
+    for statement in SEARCH_SCHEMA_DDL:
+        try:
+            async with engine.begin() as conn:
+                await conn.execute(text(statement))
+        except Exception as e:
+            # e.g. no privilege for CREATE EXTENSION; text search still works without trigrams
+            print(f"[WARN] Search schema statement failed: {str(e).splitlines()[0]}")
+
+
+def get_session_maker() -> async_sessionmaker:
+    """Session factory for work that outlives the request scope (e.g. SSE streams)."""
+    if async_session_maker is None:
+        raise RuntimeError("Database not initialized. Call init_db() first.")
+    return async_session_maker
+
 
 async def get_db() -> AsyncGenerator[AsyncSession, None]:
     """Dependency for getting database session."""
@@ -1,10 +1,23 @@
-"""Weaviate client for hybrid search (fallback/augmentation)."""
+"""Weaviate client for hybrid search (fallback/augmentation).
+
+Uses Weaviate's async client, so no call blocks the event loop. Searches
+and batch inserts (insert_many) go over gRPC.
+"""
+import asyncio
+import time
+from typing import Optional
+
 import weaviate
-from weaviate.classes.config import Configure, Property, DataType
+from weaviate.classes.config import Configure, Property, DataType, Tokenization
+from weaviate.classes.data import DataObject
+from weaviate.classes.query import Filter, MetadataQuery
 
 from app.config import get_settings
 
-client = None
+COLLECTION = "DocumentChunk"
+CHUNK_PROPERTIES = ("chunk_id", "document_id", "content", "section", "workspace_id")
+
+client: Optional[weaviate.WeaviateAsyncClient] = None
 
 
 async def init_weaviate():
@@ -26,25 +39,28 @@ async def init_weaviate():
         port = 8080
 
     try:
-        client = weaviate.connect_to_custom(
+        async_client = weaviate.use_async_with_custom(
             http_host=host,
             http_port=port,
             http_secure=False,
             grpc_host=host,
-            grpc_port=50051,
+            grpc_port=settings.weaviate_grpc_port,
             grpc_secure=False
         )
+        await async_client.connect()
+        client = async_client
 
         # Create schema if not exists
-        if not client.collections.exists("DocumentChunk"):
-            client.collections.create(
-                name="DocumentChunk",
+        if not await client.collections.exists(COLLECTION):
+            await client.collections.create(
+                name=COLLECTION,
                 properties=[
-                    Property(name="chunk_id", data_type=DataType.TEXT),
-                    Property(name="document_id", data_type=DataType.TEXT),
+                    # Ids are matched exactly, not tokenized into words
+                    Property(name="chunk_id", data_type=DataType.TEXT, tokenization=Tokenization.FIELD),
+                    Property(name="document_id", data_type=DataType.TEXT, tokenization=Tokenization.FIELD),
                     Property(name="content", data_type=DataType.TEXT),
                     Property(name="section", data_type=DataType.TEXT),
-                    Property(name="workspace_id", data_type=DataType.TEXT),
+                    Property(name="workspace_id", data_type=DataType.TEXT, tokenization=Tokenization.FIELD),
                 ],
                 vectorizer_config=Configure.Vectorizer.none()
             )
@@ -52,6 +68,14 @@ async def init_weaviate():
         print(f"Weaviate initialization: {e}")
 
 
+async def close_weaviate():
+    """Close the Weaviate connection."""
+    global client
+    if client is not None:
+        await client.close()
+        client = None
+
+
 def get_weaviate_client():
     """Get Weaviate client instance."""
     return client
@@ -69,9 +93,9 @@ async def store_chunk_vector(
     if client is None:
         return
 
-    collection = client.collections.get("DocumentChunk")
+    collection = client.collections.get(COLLECTION)
 
-    collection.data.insert(
+    await collection.data.insert(
         properties={
             "chunk_id": chunk_id,
             "document_id": document_id,
@@ -83,6 +107,103 @@ async def store_chunk_vector(
     )
 
 
+async def store_chunk_vectors(chunks: list[dict], vectors: list[list[float]]) -> int:
+    """
+    Batch-insert chunks with their vectors.
+
+    Objects are sent as gRPC insert_many batches by weaviate_batch_concurrency
+    workers. Batch size is dynamic: it starts at weaviate_batch_size, doubles
+    (up to weaviate_batch_max) while batches finish well under
+    weaviate_batch_target_seconds and halves when they take longer.
+
+    Args:
+        chunks: Dicts with chunk_id, document_id, content, section, workspace_id
+        vectors: One embedding per chunk
+
+    Returns:
+        Number of objects inserted
+    """
+    if client is None or not chunks:
+        return 0
+
+    settings = get_settings()
+    collection = client.collections.get(COLLECTION)
+    objects = [
+        DataObject(properties={key: chunk[key] for key in CHUNK_PROPERTIES}, vector=vector)
+        for chunk, vector in zip(chunks, vectors)
+    ]
+
+    # Shared between workers; safe without locks on a single event loop
+    state = {"next": 0, "size": settings.weaviate_batch_size}
+    errors = []
+
+    async def worker() -> int:
+        inserted = 0
+        while state["next"] < len(objects):
+            batch = objects[state["next"]:state["next"] + state["size"]]
+            state["next"] += len(batch)
+
+            start = time.perf_counter()
+            result = await collection.data.insert_many(batch)
+            elapsed = time.perf_counter() - start
+
+            if elapsed < settings.weaviate_batch_target_seconds / 2:
+                state["size"] = min(state["size"] * 2, settings.weaviate_batch_max)
+            elif elapsed > settings.weaviate_batch_target_seconds:
+                state["size"] = max(state["size"] // 2, 1)
+
+            errors.extend(result.errors.values())
+            inserted += len(batch) - len(result.errors)
+        return inserted
+
+    counts = await asyncio.gather(*(worker() for _ in range(settings.weaviate_batch_concurrency)))
+
+    if errors:
+        raise RuntimeError(f"Weaviate insert failed for {len(errors)} chunks: {errors[0].message}")
+    return sum(counts)
+
+
+async def delete_document_vectors(document_id: str) -> None:
+    """Delete all chunk vectors of a document."""
+    if client is None:
+        return
+
+    collection = client.collections.get(COLLECTION)
+    await collection.data.delete_many(
+        where=Filter.by_property("document_id").equal(document_id)
+    )
+
+
+async def search_bm25_chunks(
+    query: str,
+    workspace_id: str,
+    limit: int = 5
+) -> list[dict]:
+    """Search chunks by BM25 keyword relevance."""
+    if client is None:
+        return []
+
+    collection = client.collections.get(COLLECTION)
+
+    results = await collection.query.bm25(
+        query=query,
+        limit=limit,
+        filters=Filter.by_property("workspace_id").equal(workspace_id),
+        return_metadata=MetadataQuery(score=True)
+    )
+
+    return [
+        {
+            "chunk_id": obj.properties["chunk_id"],
+            "document_id": obj.properties["document_id"],
+            "content": obj.properties["content"],
+            "section": obj.properties["section"],
+            "score": obj.metadata.score if obj.metadata else None
+        }
+        for obj in results.objects
+    ]
+
+
 async def search_similar_chunks(
     query_vector: list[float],
     workspace_id: str,
@@ -92,12 +213,13 @@ async def search_similar_chunks(
     if client is None:
         return []
 
-    collection = client.collections.get("DocumentChunk")
+    collection = client.collections.get(COLLECTION)
 
-    results = collection.query.near_vector(
+    results = await collection.query.near_vector(
         near_vector=query_vector,
         limit=limit,
-        filters=weaviate.classes.query.Filter.by_property("workspace_id").equal(workspace_id)
+        filters=Filter.by_property("workspace_id").equal(workspace_id),
+        return_metadata=MetadataQuery(certainty=True)
     )
 
     return [
@@ -4,7 +4,7 @@ from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
 
 from app.config import get_settings
-from app.api.routes import health, documents, chat, agentic_chat
+from app.api.routes import health, documents, chat, agentic_chat, ingestion
 from app.ocr import ocr_router
 from app.research.router import router as research_router
 
@@ -17,13 +17,16 @@ async def lifespan(app: FastAPI):
 
     # Import here to avoid circular imports
     from app.db.postgres import init_db
-    from app.db.weaviate import init_weaviate
+    from app.db.weaviate import init_weaviate, close_weaviate
 
     # Initialize databases if configured (optional)
     if settings.postgres_url:
         try:
             await init_db()
             print("[OK] PostgreSQL connected")
+
+            from app.core.ingestion import get_ingestion_queue
+            get_ingestion_queue().start()
         except Exception as e:
             print(f"[WARN] PostgreSQL unavailable: {e}")
     else:
@@ -41,7 +44,13 @@ async def lifespan(app: FastAPI):
     yield
 
     # Shutdown
-    pass
+    from app.core.ingestion import get_ingestion_queue
+    await get_ingestion_queue().stop()
+
+    from app.ocr.pool import shutdown_ocr_pool
+    shutdown_ocr_pool()
+
+    await close_weaviate()
 
 
 app = FastAPI(
@@ -70,6 +79,7 @@ app.add_middleware(
 # Include routers
 app.include_router(health.router, tags=["Health"])
 app.include_router(documents.router, prefix="/api/documents", tags=["Documents"])
+app.include_router(ingestion.router, prefix="/api/ingestion", tags=["Ingestion"])
 app.include_router(chat.router, prefix="/api/chat", tags=["Document Map RAG"])
 app.include_router(agentic_chat.router, prefix="/api/agentic", tags=["Agentic SQL RAG"])
 app.include_router(ocr_router, prefix="/api", tags=["OCR Benchmark"])
@@ -37,6 +37,22 @@ class OCRSettings(BaseSettings):
     chandra_enabled: bool = False
     traditional_ocr_enabled: bool = True
 
+    # Worker processes for traditional engines (0 = single background thread)
+    traditional_ocr_workers: int = 2
+
+    # PDF rasterization for traditional engines (144 DPI = 2x scale)
+    rasterize_dpi: int = 144
+    rasterize_grayscale: bool = False
+
+    # Pages per predictor call for Surya/EasyOCR (0 = size from available RAM)
+    ocr_batch_size: int = 0
+    ocr_batch_max: int = 16
+    ocr_batch_page_mb: int = 300  # Estimated peak inference memory per page
+    ocr_batch_memory_fraction: float = 0.5
+
+    # Page-level result reuse for traditional engines
+    page_cache_enabled: bool = True
+
     class Config:
         env_file = "../.env"
         env_prefix = ""
@@ -0,0 +1,137 @@
+"""Process pool for CPU-bound traditional OCR engines.
+
+Traditional engines (PaddleOCR, EasyOCR, Surya) run synchronous inference
+that would otherwise block the event loop. Work is sent to a pool of
+worker processes; each worker keeps its own engine instances, so models
+are loaded once per worker and stay warm between requests.
+"""
+import asyncio
+import multiprocessing
+import time
+from collections import defaultdict
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Optional
+
+from app.ocr.config import get_ocr_settings
+
+# Engine instances living in a worker process (engine_id -> service)
+_worker_services: dict = {}
+
+
+def _get_worker_service(engine_id: str):
+    """Get or create the engine instance for this worker process."""
+    service = _worker_services.get(engine_id)
+    if service is None:
+        from app.ocr.services.paddle import PaddleOCR
+        from app.ocr.services.easy import EasyOCRService
+        from app.ocr.services.surya import SuryaOCR
+
+        engine_classes = {
+            PaddleOCR.engine_id: PaddleOCR,
+            EasyOCRService.engine_id: EasyOCRService,
+            SuryaOCR.engine_id: SuryaOCR,
+        }
+        service = engine_classes[engine_id]()
+        _worker_services[engine_id] = service
+    return service
+
+
+def run_engine_ocr(engine_id: str, image: bytes, languages: Optional[list[str]] = None) -> dict:
+    """Worker entry point: run an engine's synchronous OCR on file bytes."""
+    return _get_worker_service(engine_id)._run_ocr_sync(image, languages)
+
+
+class OCRProcessPool:
+    """Runs traditional OCR in worker processes and tracks per-engine load."""
+
+    def __init__(self, max_workers: int):
+        self.max_workers = max_workers
+        self._executor: Optional[Executor] = None
+        self._stats: dict[str, dict] = defaultdict(lambda: {
+            "queued": 0,
+            "peak_queued": 0,
+            "completed": 0,
+            "failed": 0,
+            "total_time_ms": 0.0
+        })
+
+    def _get_executor(self) -> Executor:
+        """Create the executor on first use."""
+        if self._executor is None:
+            if self.max_workers > 0:
+                # spawn: inference libraries are not fork-safe
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context("spawn")
+                )
+            else:
+                # No worker processes configured - keep inference off the loop
+                self._executor = ThreadPoolExecutor(max_workers=1)
+        return self._executor
+
+    async def run(
+        self,
+        engine_id: str,
+        image: bytes,
+        languages: Optional[list[str]] = None
+    ) -> dict:
+        """Run OCR for engine_id in the pool and await {"text", "pages"}."""
+        stats = self._stats[engine_id]
+        stats["queued"] += 1
+        stats["peak_queued"] = max(stats["peak_queued"], stats["queued"])
+        start = time.perf_counter()
+
+        loop = asyncio.get_running_loop()
+        try:
+            output = await loop.run_in_executor(
+                self._get_executor(), run_engine_ocr, engine_id, image, languages
+            )
+        except Exception:
+            stats["failed"] += 1
+            raise
+        finally:
+            stats["queued"] -= 1
+            stats["total_time_ms"] += (time.perf_counter() - start) * 1000
+
+        stats["completed"] += 1
+        return output
+
+    def stats(self) -> dict:
+        """Return per-engine queue depth and throughput counters."""
+        engines = {}
+        for engine_id, stats in self._stats.items():
+            finished = stats["completed"] + stats["failed"]
+            engines[engine_id] = {
+                **stats,
+                "total_time_ms": round(stats["total_time_ms"], 1),
+                "avg_time_ms": round(stats["total_time_ms"] / finished, 1) if finished else 0.0
+            }
+        return {
+            "workers": self.max_workers,
+            "mode": "process" if self.max_workers > 0 else "thread",
+            "engines": engines
+        }
+
+    def shutdown(self) -> None:
+        """Stop worker processes."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+# Singleton instance
+_ocr_pool: Optional[OCRProcessPool] = None
+
+
+def get_ocr_pool() -> OCRProcessPool:
+    """Get singleton OCR process pool."""
+    global _ocr_pool
+    if _ocr_pool is None:
+        _ocr_pool = OCRProcessPool(get_ocr_settings().traditional_ocr_workers)
+    return _ocr_pool
+
+
+def shutdown_ocr_pool() -> None:
+    """Shut down the OCR process pool if it was started."""
+    if _ocr_pool is not None:
+        _ocr_pool.shutdown()
@@ -10,6 +10,7 @@ from app.ocr.schemas import (
     OCRInfoResponse, EngineInfo, OCRCategory, EvaluationResult,
     ComparativeEvaluation
 )
+from app.ocr.pool import get_ocr_pool
 from app.ocr.services import (
     OpenRouterOCR, MistralOCR, QwenOCR,
     PaddleOCR, EasyOCRService, SuryaOCR, OCREvaluator, ComparativeEvaluator
@@ -56,6 +57,12 @@ async def get_ocr_info():
     return OCRInfoResponse(engines=engines)
 
 
+@router.get("/pool")
+async def get_pool_stats():
+    """Get traditional OCR worker pool queue depth and throughput."""
+    return get_ocr_pool().stats()
+
+
 @router.post("/process", response_model=OCRProcessResponse)
 async def process_document(
     file: UploadFile = File(...),
@@ -137,7 +144,7 @@ async def process_single_engine(
     image_bytes = await file.read()
     lang_list = [l.strip() for l in languages.split(",")]
 
-    return await service.process(image_bytes, file.filename, lang_list)
+    return await service.process_cached(image_bytes, file.filename, lang_list)
 
 
 from pydantic import BaseModel
@@ -178,7 +185,7 @@ async def _process_with_engine(service, image: bytes, filename: str, langs: list
     """Process image with a single engine with timeout."""
     try:
         result = await asyncio.wait_for(
-            service.process(image, filename, langs),
+            service.process_cached(image, filename, langs),
             timeout=timeout
         )
         return result
@@ -33,6 +33,9 @@ class OCRResult(BaseModel):
     tokens_used: Optional[int] = None
     cost_usd: Optional[float] = None
     confidence: Optional[float] = None
+    pages: Optional[int] = None
+    pages_per_second: Optional[float] = None
+    cached: bool = False
 
 
 class EvaluationIssue(BaseModel):
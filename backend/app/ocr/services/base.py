@@ -1,12 +1,16 @@
 """Base OCR service interface."""
 import base64
+import hashlib
+import os
 import time
 from abc import ABC, abstractmethod
-from typing import Optional, List
+from typing import Callable, Iterable, Iterator, Optional, List
 from PIL import Image
 import io
 
 from app.ocr.schemas import OCRResult, OCRCategory
+from app.ocr.config import get_ocr_settings
+from app.core.ocr_cache import get_ocr_cache
 
 
 class BaseOCRService(ABC):
@@ -15,6 +19,7 @@ class BaseOCRService(ABC):
     engine_id: str = "base"
     engine_name: str = "Base OCR"
     category: OCRCategory = OCRCategory.TRADITIONAL
+    prompt_version: str = "v1"  # Bump when prompts/post-processing change
 
     @abstractmethod
     async def process(
@@ -31,6 +36,141 @@ class BaseOCRService(ABC):
         """Check if the service is available."""
         pass
 
+    async def process_cached(
+        self,
+        image: bytes,
+        filename: str,
+        languages: list[str] = None
+    ) -> OCRResult:
+        """Process image through the content-addressed OCR result cache."""
+        cache = get_ocr_cache()
+        cache_key = cache.make_key(image, self.cache_engine_key(languages), self.prompt_version)
+
+        cached = cache.get(cache_key)
+        if cached is not None:
+            return OCRResult(**{**cached, "cached": True})
+
+        result = await self.process(image, filename, languages)
+        if result.success:
+            cache.set(cache_key, result.model_dump(mode="json"))
+        return result
+
+    def cache_engine_key(self, languages: list[str] = None) -> str:
+        """Identify engine, model and languages for result caching."""
+        model = getattr(self, "model", "")
+        return f"{self.engine_id}:{model}:{','.join(languages or [])}"
+
+    def recognize_pages(
+        self,
+        images: Iterable[Image.Image],
+        recognize: Callable[[List[Image.Image]], List[List[str]]],
+        languages: list[str] = None,
+        batch_size: int = 1
+    ) -> List[List[str]]:
+        """
+        Recognize text lines per page, reusing results for identical pages.
+
+        Pages are consumed lazily and fingerprinted with page_hash; each
+        distinct page is sent to recognize() once per engine configuration
+        and its lines are stored in the shared OCR cache, so repeated cover
+        sheets, stamp pages and exhibits are reused within and across
+        requests. At most batch_size unrecognized pages are held at a time.
+
+        Args:
+            images: Page images in document order
+            recognize: Engine callback mapping page images to their lines
+            languages: Languages the engine runs with (part of the cache key)
+            batch_size: Distinct pages passed to each recognize() call
+
+        Returns:
+            Text lines for each page, in input order
+        """
+        settings = get_ocr_settings()
+        cache = get_ocr_cache() if settings.page_cache_enabled else None
+        engine_key = self.cache_engine_key(languages)
+        version = f"page-{self.prompt_version}"
+
+        results: List[Optional[List[str]]] = []
+        resolved: dict[str, List[str]] = {}
+        pending: dict[str, List[int]] = {}  # page hash -> page indices
+        batch: List[Image.Image] = []
+
+        def flush() -> None:
+            recognized = recognize(batch)
+            for page_hash, lines in zip(pending, recognized):
+                if cache is not None:
+                    cache.set(cache.make_key(page_hash.encode(), engine_key, version), {"lines": lines})
+                resolved[page_hash] = lines
+                for i in pending[page_hash]:
+                    results[i] = lines
+            pending.clear()
+            batch.clear()
+
+        for i, img in enumerate(images):
+            results.append(None)
+            if cache is None:
+                # No reuse: every page gets its own slot
+                pending[str(i)] = [i]
+                batch.append(img)
+            else:
+                page_hash = self.page_hash(img)
+                if page_hash in resolved:
+                    results[i] = resolved[page_hash]
+                elif page_hash in pending:
+                    pending[page_hash].append(i)
+                else:
+                    cached = cache.get(cache.make_key(page_hash.encode(), engine_key, version))
+                    if cached is not None:
+                        resolved[page_hash] = results[i] = cached["lines"]
+                    else:
+                        pending[page_hash] = [i]
+                        batch.append(img)
+
+            if len(batch) >= max(1, batch_size):
+                flush()
+
+        if batch:
+            flush()
+
+        return results
+
+    @staticmethod
+    def auto_batch_size() -> int:
+        """
+        Pages per predictor call for batched engines.
+
+        Uses ocr_batch_size when set; otherwise divides a fraction of the
+        currently available RAM, shared between pool workers, by the
+        estimated per-page inference footprint.
+        """
+        settings = get_ocr_settings()
+        if settings.ocr_batch_size > 0:
+            return settings.ocr_batch_size
+
+        try:
+            available = os.sysconf("SC_AVPHYS_PAGES") * os.sysconf("SC_PAGE_SIZE")
+        except (AttributeError, ValueError, OSError):
+            return 1
+
+        workers = max(1, settings.traditional_ocr_workers)
+        budget = available * settings.ocr_batch_memory_fraction / workers
+        pages = int(budget // (settings.ocr_batch_page_mb * 1024 * 1024))
+        return max(1, min(settings.ocr_batch_max, pages))
+
+    @staticmethod
+    def page_hash(img: Image.Image) -> str:
+        """
+        Fingerprint a page by its rendered grayscale pixels.
+
+        Identical pages hash equally regardless of the file they came from.
+        Downscaled perceptual hashes are deliberately not used: pages that
+        differ only in a Bates number or a single figure collide under them.
+        """
+        gray = img if img.mode == "L" else img.convert("L")
+        digest = hashlib.sha256(f"{gray.width}x{gray.height}:".encode())
+        digest.update(gray.tobytes())
+        return digest.hexdigest()
+
     def _create_result(
         self,
         text: str = "",
@@ -39,9 +179,14 @@ class BaseOCRService(ABC):
         processing_time_ms: float = 0,
         tokens_used: Optional[int] = None,
         cost_usd: Optional[float] = None,
-        confidence: Optional[float] = None
+        confidence: Optional[float] = None,
+        pages: Optional[int] = None
     ) -> OCRResult:
         """Create standardized OCR result."""
+        pages_per_second = None
+        if pages and processing_time_ms > 0:
+            pages_per_second = round(pages / (processing_time_ms / 1000), 2)
+
         return OCRResult(
             engine=self.engine_id,
             category=self.category,
@@ -51,7 +196,9 @@ class BaseOCRService(ABC):
             processing_time_ms=processing_time_ms,
             tokens_used=tokens_used,
             cost_usd=cost_usd,
-            confidence=confidence
+            confidence=confidence,
+            pages=pages,
+            pages_per_second=pages_per_second
         )
 
     @staticmethod
@@ -89,38 +236,59 @@ class BaseOCRService(ABC):
         return image_bytes
 
     @staticmethod
-    def bytes_to_pil_images(file_bytes: bytes) -> List[Image.Image]:
-        """Convert file bytes to PIL Image(s). Handles both images and PDFs."""
+    def iter_pil_images(
+        file_bytes: bytes,
+        dpi: Optional[int] = None,
+        grayscale: Optional[bool] = None
+    ) -> Iterator[Image.Image]:
+        """
+        Lazily yield PIL Image(s) for file bytes. Handles both images and PDFs.
+
+        PDF pages are rendered one at a time straight from the PyMuPDF
+        pixmap buffer, so only the current page is held in memory and OCR
+        can start on page 1 before later pages are rendered.
+
+        Args:
+            file_bytes: Image or PDF bytes
+            dpi: Render resolution for PDF pages (default from settings)
+            grayscale: Render PDF pages as single-channel images (default from settings)
+        """
         mime_type = BaseOCRService.get_image_mime_type(file_bytes)
 
-        if mime_type == "application/pdf":
-            # Convert PDF to images using PyMuPDF
-            try:
-                import fitz  # PyMuPDF
-                images = []
-                pdf = fitz.open(stream=file_bytes, filetype="pdf")
-                for page_num in range(len(pdf)):
-                    page = pdf[page_num]
-                    # Render at 2x for better OCR quality
-                    mat = fitz.Matrix(2.0, 2.0)
-                    pix = page.get_pixmap(matrix=mat)
-                    img_bytes = pix.tobytes("png")
-                    img = Image.open(io.BytesIO(img_bytes))
-                    images.append(img)
-                pdf.close()
-                return images
-            except ImportError:
-                raise RuntimeError("PyMuPDF (fitz) required for PDF processing")
-        else:
+        if mime_type != "application/pdf":
             # Regular image
-            img = Image.open(io.BytesIO(file_bytes))
-            return [img]
+            yield Image.open(io.BytesIO(file_bytes))
+            return
+
+        try:
+            import fitz  # PyMuPDF
+        except ImportError:
+            raise RuntimeError("PyMuPDF (fitz) required for PDF processing")
+
+        settings = get_ocr_settings()
+        dpi = dpi or settings.rasterize_dpi
+        if grayscale is None:
+            grayscale = settings.rasterize_grayscale
+        colorspace = fitz.csGRAY if grayscale else fitz.csRGB
+        mode = "L" if grayscale else "RGB"
+
+        pdf = fitz.open(stream=file_bytes, filetype="pdf")
+        try:
+            for page in pdf:
+                pix = page.get_pixmap(dpi=dpi, colorspace=colorspace, alpha=False)
+                yield Image.frombytes(mode, (pix.width, pix.height), pix.samples)
+        finally:
+            pdf.close()
+
+    @staticmethod
+    def bytes_to_pil_images(file_bytes: bytes) -> List[Image.Image]:
+        """Convert file bytes to PIL Image(s). Handles both images and PDFs."""
+        return list(BaseOCRService.iter_pil_images(file_bytes))
 
     @staticmethod
     def bytes_to_single_image(file_bytes: bytes) -> Image.Image:
         """Convert file bytes to a single PIL Image. For PDFs, returns first page."""
-        images = BaseOCRService.bytes_to_pil_images(file_bytes)
-        return images[0] if images else None
+        return next(BaseOCRService.iter_pil_images(file_bytes), None)
 
 
 class TimedExecution:
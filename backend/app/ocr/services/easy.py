@@ -2,6 +2,7 @@
 from app.ocr.services.base import BaseOCRService, TimedExecution
 from app.ocr.schemas import OCRResult, OCRCategory
 from app.ocr.config import get_ocr_settings
+from app.ocr.pool import get_ocr_pool
 
 # Optional import - may not be installed
 try:
@@ -49,7 +50,7 @@ class EasyOCRService(BaseOCRService):
 
         with TimedExecution() as timer:
             try:
-                text = await self._run_ocr(image, languages)
+                output = await self._run_ocr(image, languages)
             except Exception as e:
                 return self._create_result(
                     success=False,
@@ -58,14 +59,18 @@ class EasyOCRService(BaseOCRService):
                 )
 
         return self._create_result(
-            text=text,
+            text=output["text"],
             cost_usd=0.0,
-            processing_time_ms=timer.elapsed_ms
+            processing_time_ms=timer.elapsed_ms,
+            pages=output["pages"]
         )
 
-    async def _run_ocr(self, image: bytes, languages: list[str] = None) -> str:
-        """Run EasyOCR on image."""
-        import numpy as np
+    async def _run_ocr(self, image: bytes, languages: list[str] = None) -> dict:
+        """Run EasyOCR on image in the OCR process pool."""
+        return await get_ocr_pool().run(self.engine_id, image, languages)
+
+    def _run_ocr_sync(self, image: bytes, languages: list[str] = None) -> dict:
+        """Run EasyOCR on image (blocking, executed in a pool worker)."""
         import sys
         import io
 
@@ -76,25 +81,46 @@ class EasyOCRService(BaseOCRService):
         sys.stderr = io.StringIO()
 
         try:
-            # Convert bytes to PIL images (handles PDFs)
-            images = self.bytes_to_pil_images(image)
-            reader = self._get_reader(languages)
+            # Lazily rasterize pages (handles PDFs)
+            images = self.iter_pil_images(image)
+            langs = languages or self.langs
+            pages = self.recognize_pages(
+                images,
+                lambda imgs: self._recognize(imgs, langs),
+                langs,
+                batch_size=self.auto_batch_size()
+            )
+            return {
+                "text": "\n".join(line for lines in pages for line in lines),
+                "pages": len(pages)
+            }
+        finally:
+            sys.stdout = old_stdout
+            sys.stderr = old_stderr
 
-            all_lines = []
-            for img in images:
-                # Convert to RGB if necessary
-                if img.mode != 'RGB':
-                    img = img.convert('RGB')
-                img_array = np.array(img)
+    def _recognize(self, images: list, languages: list[str] = None) -> list[list[str]]:
+        """Recognize text lines on a batch of page images."""
+        import numpy as np
 
-                results = reader.readtext(img_array)
+        reader = self._get_reader(languages)
 
-                # Extract text preserving order
-                for detection in results:
-                    text = detection[1]
-                    all_lines.append(text)
+        # Convert to RGB if necessary
+        arrays = [np.array(img if img.mode == 'RGB' else img.convert('RGB')) for img in images]
 
-            return "\n".join(all_lines)
-        finally:
-            sys.stdout = old_stdout
-            sys.stderr = old_stderr
+        # readtext_batched needs equally sized inputs, so group pages by shape
+        by_shape: dict[tuple, list[int]] = {}
+        for i, arr in enumerate(arrays):
+            by_shape.setdefault(arr.shape, []).append(i)
+
+        pages: list[list[str]] = [[] for _ in arrays]
+        for indices in by_shape.values():
+            if len(indices) == 1:
+                batch_results = [reader.readtext(arrays[indices[0]])]
+            else:
+                batch_results = reader.readtext_batched([arrays[i] for i in indices])
+
+            # Extract text preserving order
+            for i, results in zip(indices, batch_results):
+                pages[i] = [detection[1] for detection in results]
+
+        return pages
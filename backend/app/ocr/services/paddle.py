@@ -2,6 +2,7 @@
 from app.ocr.services.base import BaseOCRService, TimedExecution
 from app.ocr.schemas import OCRResult, OCRCategory
 from app.ocr.config import get_ocr_settings
+from app.ocr.pool import get_ocr_pool
 
 # Optional import - may not be installed
 try:
@@ -51,7 +52,7 @@ class PaddleOCR(BaseOCRService):
 
         with TimedExecution() as timer:
             try:
-                text = await self._run_ocr(image)
+                output = await self._run_ocr(image)
             except Exception as e:
                 return self._create_result(
                     success=False,
@@ -60,20 +61,33 @@ class PaddleOCR(BaseOCRService):
                 )
 
         return self._create_result(
-            text=text,
+            text=output["text"],
             cost_usd=0.0,
-            processing_time_ms=timer.elapsed_ms
+            processing_time_ms=timer.elapsed_ms,
+            pages=output["pages"]
         )
 
-    async def _run_ocr(self, image: bytes) -> str:
-        """Run PaddleOCR on image."""
+    async def _run_ocr(self, image: bytes) -> dict:
+        """Run PaddleOCR on image in the OCR process pool."""
+        return await get_ocr_pool().run(self.engine_id, image)
+
+    def _run_ocr_sync(self, image: bytes, languages: list[str] = None) -> dict:
+        """Run PaddleOCR on image (blocking, executed in a pool worker)."""
+        # Lazily rasterize pages (handles PDFs)
+        images = self.iter_pil_images(image)
+        pages = self.recognize_pages(images, self._recognize, [self.lang])
+        return {
+            "text": "\n".join(line for lines in pages for line in lines),
+            "pages": len(pages)
+        }
+
+    def _recognize(self, images: list) -> list[list[str]]:
+        """Recognize text lines on each page image."""
         import numpy as np
 
-        # Convert bytes to PIL images (handles PDFs)
-        images = self.bytes_to_pil_images(image)
         engine = self._get_engine()
 
-        all_lines = []
+        pages = []
         for img in images:
             # Convert to RGB if necessary
             if img.mode != 'RGB':
@@ -84,12 +98,13 @@ class PaddleOCR(BaseOCRService):
             result = engine.predict(img_array)
 
             # New API returns OCRResult objects with rec_texts attribute
+            page_lines = []
             if result and len(result) > 0:
                 ocr_result = result[0]
                 if hasattr(ocr_result, 'get') and 'rec_texts' in ocr_result:
-                    texts = ocr_result['rec_texts']
-                    all_lines.extend(texts)
+                    page_lines.extend(ocr_result['rec_texts'])
                 elif hasattr(ocr_result, 'rec_texts'):
-                    all_lines.extend(ocr_result.rec_texts)
+                    page_lines.extend(ocr_result.rec_texts)
+            pages.append(list(page_lines))
 
-        return "\n".join(all_lines)
+        return pages
@@ -2,6 +2,7 @@
 from app.ocr.services.base import BaseOCRService, TimedExecution
 from app.ocr.schemas import OCRResult, OCRCategory
 from app.ocr.config import get_ocr_settings
+from app.ocr.pool import get_ocr_pool
 
 # Optional import - may not be installed (API changed in v0.17+)
 try:
@@ -53,7 +54,7 @@ class SuryaOCR(BaseOCRService):
 
         with TimedExecution() as timer:
             try:
-                text = await self._run_ocr(image, languages)
+                output = await self._run_ocr(image, languages)
             except Exception as e:
                 return self._create_result(
                     success=False,
@@ -62,30 +63,43 @@ class SuryaOCR(BaseOCRService):
                 )
 
         return self._create_result(
-            text=text,
+            text=output["text"],
             cost_usd=0.0,
-            processing_time_ms=timer.elapsed_ms
+            processing_time_ms=timer.elapsed_ms,
+            pages=output["pages"]
         )
 
-    async def _run_ocr(self, image: bytes, languages: list[str] = None) -> str:
-        """Run Surya OCR on image."""
-        # Convert bytes to PIL images (handles PDFs)
-        images = self.bytes_to_pil_images(image)
+    async def _run_ocr(self, image: bytes, languages: list[str] = None) -> dict:
+        """Run Surya OCR on image in the OCR process pool."""
+        return await get_ocr_pool().run(self.engine_id, image, languages)
+
+    def _run_ocr_sync(self, image: bytes, languages: list[str] = None) -> dict:
+        """Run Surya OCR on image (blocking, executed in a pool worker)."""
+        # Lazily rasterize pages (handles PDFs)
+        images = self.iter_pil_images(image)
+        pages = self.recognize_pages(
+            images, self._recognize, self.langs, batch_size=self.auto_batch_size()
+        )
+        return {
+            "text": "\n".join(line for lines in pages for line in lines),
+            "pages": len(pages)
+        }
+
+    def _recognize(self, images: list) -> list[list[str]]:
+        """Recognize text lines on a batch of page images in one predictor call."""
         det_predictor, rec_predictor = self._load_models()
 
-        all_lines = []
-        for img in images:
-            # Convert to RGB if necessary
-            if img.mode != 'RGB':
-                img = img.convert('RGB')
+        # Convert to RGB if necessary
+        batch = [img if img.mode == 'RGB' else img.convert('RGB') for img in images]
 
-            # New API: pass det_predictor as keyword arg (not the detection results)
-            # task_names are now task types, not language codes
-            rec_results = rec_predictor([img], det_predictor=det_predictor)
+        # New API: pass det_predictor as keyword arg (not the detection results)
+        # task_names are now task types, not language codes
+        rec_results = rec_predictor(batch, det_predictor=det_predictor)
 
-            # Extract text from results
-            if rec_results and rec_results[0]:
-                for text_line in rec_results[0].text_lines:
-                    all_lines.append(text_line.text)
+        # Extract text from results (one result per input image, in order)
+        pages = []
+        for page_result in rec_results or []:
+            pages.append([line.text for line in page_result.text_lines] if page_result else [])
+        pages.extend([] for _ in range(len(batch) - len(pages)))
 
-        return "\n".join(all_lines)
+        return pages
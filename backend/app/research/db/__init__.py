@@ -196,6 +196,12 @@ class SupabaseResearchDB:
     async def update_claim_embedding(self, *args, **kwargs) -> None:
         return await self._claims.update_claim_embedding(*args, **kwargs)
 
+    async def get_all_claim_embeddings(self, *args, **kwargs) -> Tuple[List[str], List[List[float]]]:
+        return await self._claims.get_all_claim_embeddings(*args, **kwargs)
+
+    async def get_claims_without_embeddings(self, *args, **kwargs) -> List[KnowledgeClaim]:
+        return await self._claims.get_claims_without_embeddings(*args, **kwargs)
+
     async def verify_claim(self, *args, **kwargs) -> KnowledgeClaim:
         return await self._claims.verify_claim(*args, **kwargs)
 
@@ -240,6 +246,9 @@ class SupabaseResearchDB:
     async def create_similarity_candidate(self, *args, **kwargs) -> SimilarityCandidate:
         return await self._similarity.create_candidate(*args, **kwargs)
 
+    async def upsert_similarity_candidates(self, *args, **kwargs) -> List[SimilarityCandidate]:
+        return await self._similarity.upsert_candidates(*args, **kwargs)
+
     async def get_pending_similarity_candidates(self, *args, **kwargs) -> List[SimilarityCandidate]:
         return await self._similarity.get_pending_candidates(*args, **kwargs)
 
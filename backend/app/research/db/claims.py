@@ -1,5 +1,6 @@
 """Knowledge claim database operations."""
 
+import json
 from datetime import datetime
 from typing import Optional, List, Dict, Any, Tuple
 from uuid import UUID
@@ -147,10 +148,69 @@ class ClaimOperations(BaseSupabaseDB):
             {"embedding": embedding}
         ).eq("id", str(claim_id)).execute()
 
+    async def get_all_claim_embeddings(
+        self, max_claims: Optional[int] = None, page_size: int = 1000
+    ) -> Tuple[List[str], List[List[float]]]:
+        """Get (claim IDs, embeddings) of all current claims with an embedding.
+
+        Claims are ordered by confidence (highest first) and fetched
+        page_size rows per request.
+        """
+        claim_ids, embeddings = [], []
+        offset = 0
+        while max_claims is None or offset < max_claims:
+            limit = page_size if max_claims is None else min(page_size, max_claims - offset)
+            result = (
+                self.client.table("knowledge_claims")
+                .select("id, embedding")
+                .eq("is_current", True)
+                .not_.is_("embedding", "null")
+                .order("confidence_score", desc=True)
+                .order("id")
+                .range(offset, offset + limit - 1)
+                .execute()
+            )
+            for row in result.data:
+                claim_ids.append(row["id"])
+                embeddings.append(self._parse_embedding(row["embedding"]))
+            if len(result.data) < limit:
+                break
+            offset += limit
+
+        return claim_ids, embeddings
+
+    async def get_claims_without_embeddings(
+        self, page_size: int = 1000
+    ) -> List[KnowledgeClaim]:
+        """Get all current claims that have no embedding yet."""
+        claims = []
+        offset = 0
+        while True:
+            result = (
+                self.client.table("knowledge_claims")
+                .select("*")
+                .eq("is_current", True)
+                .is_("embedding", "null")
+                .order("id")
+                .range(offset, offset + page_size - 1)
+                .execute()
+            )
+            claims.extend(self._row_to_claim(row) for row in result.data)
+            if len(result.data) < page_size:
+                break
+            offset += page_size
+
+        return claims
+
     async def verify_claim(self, claim_id: UUID, status: str) -> KnowledgeClaim:
         """Update claim verification status."""
         return await self.update_claim(claim_id, {"verification_status": status})
 
+    @staticmethod
+    def _parse_embedding(value: Any) -> List[float]:
+        """Parse a pgvector value (PostgREST returns "[0.1,0.2,...]" strings)."""
+        return json.loads(value) if isinstance(value, str) else value
+
     def _row_to_claim(self, row: Dict[str, Any]) -> KnowledgeClaim:
         """Convert database row to KnowledgeClaim."""
         return KnowledgeClaim(
@@ -53,18 +53,77 @@ class SimilarityOperations(BaseSupabaseDB):
         )
 
         if result.data:
-            row = result.data[0]
-            return SimilarityCandidate(
-                id=row["id"],
-                claim_id=row["claim_id"],
-                similar_claim_id=row["similar_claim_id"],
-                similarity_score=row["similarity_score"],
-                similarity_type=row.get("similarity_type"),
-                status=row["status"],
-                created_at=row["created_at"],
-            )
+            return self._row_to_candidate(result.data[0])
         raise Exception("Failed to create similarity candidate")
 
+    async def upsert_candidates(
+        self,
+        candidates: List[Dict[str, Any]],
+        batch_size: int = 500,
+    ) -> List[SimilarityCandidate]:
+        """Upsert similarity candidates in batches of batch_size rows.
+
+        Args:
+            candidates: Dicts with claim_id, similar_claim_id, similarity_score
+                and similarity_type
+
+        Returns:
+            The stored candidates. Pairs that already exist, in either
+            direction, get the new score but keep their review status.
+        """
+        stored = []
+        for start in range(0, len(candidates), batch_size):
+            batch = candidates[start:start + batch_size]
+            reversed_pairs = await self._find_reversed_pairs(batch)
+            rows = []
+            for candidate in batch:
+                claim_id = str(candidate["claim_id"])
+                similar_claim_id = str(candidate["similar_claim_id"])
+                if (claim_id, similar_claim_id) in reversed_pairs:
+                    # Update the stored row instead of adding its mirror image
+                    claim_id, similar_claim_id = similar_claim_id, claim_id
+                rows.append({
+                    "claim_id": claim_id,
+                    "similar_claim_id": similar_claim_id,
+                    "similarity_score": candidate["similarity_score"],
+                    "similarity_type": candidate.get("similarity_type", "semantic"),
+                })
+            result = (
+                self.client.table("similarity_candidates")
+                .upsert(rows, on_conflict="claim_id,similar_claim_id")
+                .execute()
+            )
+            stored.extend(self._row_to_candidate(row) for row in result.data)
+        return stored
+
+    async def _find_reversed_pairs(
+        self,
+        candidates: List[Dict[str, Any]],
+        lookup_size: int = 100,
+    ) -> set:
+        """Return (claim_id, similar_claim_id) of candidates stored in the opposite direction.
+
+        Looks up rows whose claim_id is a candidate's similar_claim_id, in
+        batches of lookup_size ids to keep request URLs short.
+        """
+        wanted = {
+            (str(c["similar_claim_id"]), str(c["claim_id"])) for c in candidates
+        }
+        similar_ids = list(dict.fromkeys(similar for similar, _ in wanted))
+        found = set()
+        for start in range(0, len(similar_ids), lookup_size):
+            result = (
+                self.client.table("similarity_candidates")
+                .select("claim_id, similar_claim_id")
+                .in_("claim_id", similar_ids[start:start + lookup_size])
+                .execute()
+            )
+            for row in result.data:
+                pair = (str(row["claim_id"]), str(row["similar_claim_id"]))
+                if pair in wanted:
+                    found.add((pair[1], pair[0]))
+        return found
+
     async def get_pending_candidates(self, limit: int = 20) -> List[SimilarityCandidate]:
         """Get pending similarity candidates for review."""
         result = (
@@ -76,20 +135,7 @@ class SimilarityOperations(BaseSupabaseDB):
             .execute()
         )
 
-        return [
-            SimilarityCandidate(
-                id=row["id"],
-                claim_id=row["claim_id"],
-                similar_claim_id=row["similar_claim_id"],
-                similarity_score=row["similarity_score"],
-                similarity_type=row.get("similarity_type"),
-                status=row["status"],
-                reviewed_by_user_id=row.get("reviewed_by_user_id"),
-                reviewed_at=row.get("reviewed_at"),
-                created_at=row["created_at"],
-            )
-            for row in result.data
-        ]
+        return [self._row_to_candidate(row) for row in result.data]
 
     async def resolve_candidate(
         self,
@@ -104,6 +150,20 @@ class SimilarityOperations(BaseSupabaseDB):
             "reviewed_at": datetime.utcnow().isoformat(),
         }).eq("id", str(candidate_id)).execute()
 
+    def _row_to_candidate(self, row: Dict[str, Any]) -> SimilarityCandidate:
+        """Convert database row to SimilarityCandidate."""
+        return SimilarityCandidate(
+            id=row["id"],
+            claim_id=row["claim_id"],
+            similar_claim_id=row["similar_claim_id"],
+            similarity_score=row["similarity_score"],
+            similarity_type=row.get("similarity_type"),
+            status=row["status"],
+            reviewed_by_user_id=row.get("reviewed_by_user_id"),
+            reviewed_at=row.get("reviewed_at"),
+            created_at=row["created_at"],
+        )
+
 
 class FindingClaimOperations(BaseSupabaseDB):
     """Database operations for finding-claim links."""
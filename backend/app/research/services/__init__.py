@@ -6,6 +6,7 @@ from .orchestrator import ResearchOrchestrator
 from .credibility import CredibilityAssessor
 from .analysis import MultiPerspectiveAnalyzer
 from .embedding import EmbeddingService, EntityEmbeddingService, get_embedding_service
+from .embedding_providers import EmbeddingProvider, get_embedding_provider
 
 # Query services
 from .query_normalizer import QueryNormalizer
@@ -33,6 +34,8 @@ __all__ = [
     "EmbeddingService",
     "EntityEmbeddingService",
     "get_embedding_service",
+    "EmbeddingProvider",
+    "get_embedding_provider",
     # Query services
     "QueryNormalizer",
     "TimeScopeAnalyzer",
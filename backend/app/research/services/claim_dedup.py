@@ -0,0 +1,104 @@
+"""
+Bulk claim deduplication over an in-memory embedding matrix.
+Claim embeddings are loaded into a NumPy matrix of unit vectors, and each
+block of rows is compared with the remaining claims in one matrix product,
+keeping the top-k neighbours above the similarity threshold. This replaces one
+embedding call and one pgvector scan per claim with a few BLAS calls.
+"""
+from typing import List, Sequence, Tuple
+
+import numpy as np
+
+
+def find_similar_pairs(
+    vectors: Sequence[Sequence[float]],
+    threshold: float,
+    k: int,
+    block_size: int = 512
+) -> List[Tuple[int, int, float]]:
+    """
+    Find the top-k cosine neighbours of every vector above threshold.
+
+    Args:
+        vectors: One embedding per claim (any norm)
+        threshold: Similarity must be strictly greater than this
+        k: Neighbours kept per vector
+        block_size: Rows per matrix product; memory is block_size * n * 4 bytes
+
+    Returns:
+        Unique (i, j, similarity) pairs with i < j, most similar first
+    """
+    n = len(vectors)
+    k = min(k, n - 1)
+    if k < 1:
+        return []
+
+    matrix = np.array(vectors, dtype=np.float32)  # copy: normalized in place
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    matrix /= np.maximum(norms, 1e-12)
+
+    # Similarity is symmetric: each block is compared only with itself and
+    # the claims after it, which halves the work. Each block keeps at most k
+    # candidates per row and column, and survivors are re-pruned to each
+    # claim's top k, so memory stays O(n * k) however dense the matches are.
+    i = np.empty(0, dtype=np.int64)
+    j = np.empty(0, dtype=np.int64)
+    score = np.empty(0, dtype=np.float32)
+    for start in range(0, n, block_size):
+        block = matrix[start:start + block_size]
+        sims = block @ matrix[start:].T
+        sims[:, :len(block)][np.tril_indices(len(block))] = -np.inf  # keep j > i only
+
+        rows, cols = np.nonzero(_block_candidates(sims, threshold, k))
+        i = np.concatenate([i, rows + start])
+        j = np.concatenate([j, cols + start])
+        score = np.concatenate([score, sims[rows, cols]])
+        i, j, score = _top_k_pairs(i, j, score, k)
+
+    # float32 rounding can push near-identical vectors just above 1
+    return [(int(a), int(b), min(float(s), 1.0)) for a, b, s in zip(i, j, score)]
+
+
+def _block_candidates(sims: np.ndarray, threshold: float, k: int) -> np.ndarray:
+    """Mask of entries above threshold that are among the k largest of their row or column."""
+    hits = sims > threshold
+    # Only rows/columns with more than k hits need a top-k selection
+    in_row_top = _top_k_mask(sims, hits, k, axis=1)
+    in_col_top = _top_k_mask(sims.T, hits.T, k, axis=1).T
+    return hits & (in_row_top | in_col_top)
+
+
+def _top_k_mask(sims: np.ndarray, hits: np.ndarray, k: int, axis: int) -> np.ndarray:
+    """Per row: all True if the row has at most k hits, else True at its k largest entries."""
+    dense = np.flatnonzero(hits.sum(axis=axis) > k)
+    mask = np.ones(hits.shape, dtype=bool)
+    if len(dense):
+        top = np.argpartition(-sims[dense], k - 1, axis=1)[:, :k]
+        rows = np.zeros((len(dense), hits.shape[1]), dtype=bool)
+        np.put_along_axis(rows, top, True, axis=1)
+        mask[dense] = rows
+    return mask
+
+
+def _top_k_pairs(
+    i: np.ndarray,
+    j: np.ndarray,
+    score: np.ndarray,
+    k: int
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Keep pairs among the k most similar of either claim, most similar first."""
+    order = np.argsort(-score, kind="stable")
+    i, j, score = i[order], j[order], score[order]
+    if not len(score):
+        return i, j, score
+
+    ends = np.concatenate([i, j])
+    positions = np.concatenate([np.arange(len(score))] * 2)
+    by_end = np.lexsort((positions, ends))
+    sorted_ends = ends[by_end]
+    group_start = np.searchsorted(sorted_ends, sorted_ends, side="left")
+    ranks = np.arange(len(by_end)) - group_start
+    best_rank = np.full(len(score), len(score))
+    np.minimum.at(best_rank, positions[by_end], ranks)
+    keep = best_rank < k
+    return i[keep], j[keep], score[keep]
@@ -1,19 +1,22 @@
 """Embedding service for semantic similarity and deduplication.
 
-Uses Gemini's text embedding model to generate embeddings for claims
-and detect similar content for deduplication.
+Generates claim embeddings with the configured EmbeddingProvider (Gemini
+API or a local ONNX model) and detects similar content for deduplication.
+Every embedding goes through a persistent content-addressed cache, so
+unchanged texts are never embedded twice.
 """
 
+import asyncio
 import hashlib
 from typing import Optional, List, Dict, Any, Tuple
 from uuid import UUID
 
-from google import genai
-from google.genai import types
-
 from app.config import get_settings
 from ..db import SupabaseResearchDB, get_supabase_db
-from ..schemas import KnowledgeClaim, KnowledgeClaimCreate, SimilarityCandidate
+from ..schemas import KnowledgeClaim, KnowledgeClaimBase, KnowledgeClaimCreate, SimilarityCandidate
+from .claim_dedup import find_similar_pairs
+from .embedding_cache import EmbeddingCache, get_embedding_cache
+from .embedding_providers import EmbeddingProvider, get_embedding_provider
 
 settings = get_settings()
 
@@ -21,8 +24,7 @@ settings = get_settings()
 class EmbeddingService:
     """Service for generating embeddings and finding similar content."""
 
-    # Gemini embedding model
-    EMBEDDING_MODEL = "text-embedding-004"
+    # Dimension of the claim embedding column (VECTOR(768))
     EMBEDDING_DIMENSION = 768
 
     # Similarity thresholds
@@ -30,12 +32,24 @@ class EmbeddingService:
     MEDIUM_SIMILARITY_THRESHOLD = 0.85  # Review for potential merge
     LOW_SIMILARITY_THRESHOLD = 0.75  # Related but distinct
 
-    def __init__(self, db: Optional[SupabaseResearchDB] = None):
-        self.client = genai.Client(api_key=settings.gemini_api_key)
+    def __init__(
+        self,
+        db: Optional[SupabaseResearchDB] = None,
+        provider: Optional[EmbeddingProvider] = None,
+        cache: Optional[EmbeddingCache] = None,
+    ):
+        self.provider = provider or get_embedding_provider()
+        self.cache = cache or get_embedding_cache()
         self.db = db or get_supabase_db()
 
+        if self.provider.dimension != self.EMBEDDING_DIMENSION:
+            print(
+                f"[WARN] Embedding model {self.provider.model} has {self.provider.dimension} "
+                f"dimensions; claim embeddings are stored as VECTOR({self.EMBEDDING_DIMENSION})"
+            )
+
     async def generate_embedding(self, text: str) -> List[float]:
-        """Generate embedding for a text using Gemini.
+        """Generate embedding for a text.
 
         Args:
             text: The text to embed
@@ -43,26 +57,45 @@ class EmbeddingService:
         Returns:
             List of floats representing the embedding vector
         """
-        # Truncate very long text (embedding model has limits)
-        max_chars = 8000
-        if len(text) > max_chars:
-            text = text[:max_chars]
-
-        result = self.client.models.embed_content(
-            model=self.EMBEDDING_MODEL,
-            contents=text,
-            config=types.EmbedContentConfig(
-                task_type="SEMANTIC_SIMILARITY",
-                output_dimensionality=self.EMBEDDING_DIMENSION,
-            ),
-        )
+        return (await self.generate_embeddings([text]))[0]
 
-        return result.embeddings[0].values
+    async def generate_embeddings(self, texts: List[str]) -> List[List[float]]:
+        """Generate embeddings for many texts in batched provider calls.
 
-    async def generate_claim_embedding(self, claim: KnowledgeClaim) -> List[float]:
-        """Generate embedding for a knowledge claim.
+        Cached texts are served from the embedding cache; the rest
+        (deduplicated) are embedded in one provider call and cached.
 
-        Uses the claim content and summary for better semantic representation.
+        Returns:
+            One embedding per text, in input order
+        """
+        if not texts:
+            return []
+
+        keys = [
+            self.cache.make_key(text, self.provider.model, self.provider.dimension)
+            for text in texts
+        ]
+        vectors = await asyncio.to_thread(self.cache.get_many, keys)
+
+        missing: Dict[str, str] = {}
+        for key, text in zip(keys, texts):
+            if key not in vectors:
+                missing.setdefault(key, text)
+
+        if missing:
+            embedded = await self.provider.embed_texts(list(missing.values()))
+            fresh = dict(zip(missing, embedded))
+            await asyncio.to_thread(self.cache.set_many, fresh)
+            vectors.update(fresh)
+
+        return [vectors[key] for key in keys]
+
+    @staticmethod
+    def claim_text(claim: KnowledgeClaimBase) -> str:
+        """Text embedded for a claim: content, summary and tags.
+
+        Every claim embedding (new, stored or backfilled) is built from this
+        text, so the same claim always has the same cache key and vector.
         """
         # Combine content and summary for richer embedding
         text_parts = [claim.content]
@@ -70,9 +103,14 @@ class EmbeddingService:
             text_parts.append(claim.summary)
         if claim.tags:
             text_parts.append(" ".join(claim.tags))
+        return " ".join(text_parts)
 
-        combined_text = " ".join(text_parts)
-        return await self.generate_embedding(combined_text)
+    async def generate_claim_embedding(self, claim: KnowledgeClaim) -> List[float]:
+        """Generate embedding for a knowledge claim.
+
+        Uses the claim content, summary and tags for better semantic representation.
+        """
+        return await self.generate_embedding(self.claim_text(claim))
 
     async def find_similar_claims(
         self,
@@ -148,10 +186,7 @@ class EmbeddingService:
             - 'candidate': Created with similarity candidate for review
         """
         # Generate embedding
-        text_parts = [claim.content]
-        if claim.summary:
-            text_parts.append(claim.summary)
-        embedding = await self.generate_embedding(" ".join(text_parts))
+        embedding = await self.generate_embedding(self.claim_text(claim))
 
         # Check for similar claims
         similar = await self.db.find_similar_claims(
@@ -249,17 +284,39 @@ class EmbeddingService:
         failed = 0
 
         if claim_ids:
+            claims = []
             for claim_id in claim_ids:
                 try:
-                    await self.update_claim_embedding(claim_id)
-                    updated += 1
+                    claim = await self.db.get_claim(claim_id)
+                    if not claim:
+                        raise ValueError(f"Claim {claim_id} not found")
+                    claims.append(claim)
                 except Exception as e:
                     print(f"Failed to update embedding for {claim_id}: {e}")
                     failed += 1
         else:
-            # Get claims without embeddings
-            # This would need a custom query - for now just return
-            pass
+            claims = await self.db.get_claims_without_embeddings()
+
+        for start in range(0, len(claims), batch_size):
+            batch = claims[start:start + batch_size]
+
+            # One batched provider call per batch instead of one per claim
+            try:
+                embeddings = await self.generate_embeddings(
+                    [self.claim_text(claim) for claim in batch]
+                )
+            except Exception as e:
+                print(f"Failed to embed batch of {len(batch)} claims: {e}")
+                failed += len(batch)
+                continue
+
+            for claim, embedding in zip(batch, embeddings):
+                try:
+                    await self.db.update_claim_embedding(claim.id, embedding)
+                    updated += 1
+                except Exception as e:
+                    print(f"Failed to update embedding for {claim.id}: {e}")
+                    failed += 1
 
         return {"updated": updated, "failed": failed}
 
@@ -267,47 +324,51 @@ class EmbeddingService:
         self,
         threshold: float = 0.85,
         limit_per_claim: int = 5,
-        max_claims: int = 1000,
+        max_claims: Optional[int] = None,
     ) -> List[SimilarityCandidate]:
         """Find all similar claim pairs in the knowledge base.
 
-        This is a batch operation to discover potential duplicates.
-        """
-        # Get all claims with embeddings
-        claims, total = await self.db.search_claims(
-            visibility="all",
-            limit=max_claims,
-        )
+        This is a batch operation to discover potential duplicates. Missing
+        claim embeddings are generated first; all embeddings are then compared
+        in memory (see claim_dedup) and candidates are upserted in bulk.
 
-        candidates = []
-        processed_pairs = set()
+        Args:
+            threshold: Minimum similarity score (0.0-1.0)
+            limit_per_claim: Nearest neighbours considered per claim
+            max_claims: Compare only the max_claims most confident claims
 
-        for claim in claims:
-            # Skip claims without embeddings (need to regenerate)
-            similar = await self.find_similar_claims(
-                text=claim.content,
-                threshold=threshold,
-                limit=limit_per_claim,
-                exclude_claim_id=claim.id,
-            )
+        Returns:
+            The stored similarity candidates, most similar first
 
-            for match in similar:
-                # Avoid duplicate pairs
-                pair_key = tuple(sorted([str(claim.id), str(match["claim"].id)]))
-                if pair_key in processed_pairs:
-                    continue
-                processed_pairs.add(pair_key)
-
-                # Create similarity candidate
-                candidate = await self.db.create_similarity_candidate(
-                    claim_id=claim.id,
-                    similar_claim_id=match["claim"].id,
-                    similarity_score=match["similarity"],
-                    similarity_type="semantic",
-                )
-                candidates.append(candidate)
+        Raises:
+            ValueError: If threshold is outside 0.0-1.0 (similarity_score
+                has a CHECK constraint of >= 0)
+        """
+        if not 0.0 <= threshold <= 1.0:
+            raise ValueError(f"threshold must be between 0.0 and 1.0, got {threshold}")
+
+        await self.batch_update_embeddings()
+
+        claim_ids, embeddings = await self.db.get_all_claim_embeddings(max_claims=max_claims)
+        pairs = await asyncio.to_thread(
+            find_similar_pairs,
+            embeddings,
+            threshold,
+            limit_per_claim,
+            settings.research_dedup_block_size,
+        )
 
-        return candidates
+        # Claims are ordered by confidence, so claim_id is the more confident
+        # claim; pairs already stored the other way round keep their direction
+        return await self.db.upsert_similarity_candidates([
+            {
+                "claim_id": claim_ids[i],
+                "similar_claim_id": claim_ids[j],
+                "similarity_score": similarity,
+                "similarity_type": "semantic",
+            }
+            for i, j, similarity in pairs
+        ])
 
 
 class EntityEmbeddingService:
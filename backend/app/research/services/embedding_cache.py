@@ -0,0 +1,166 @@
+"""
+Content-addressed embedding cache.
+Vectors are keyed by the SHA-256 of the text plus the embedding model and
+dimension, and stored as float16 blobs in a local SQLite file with
+entry-bounded LRU eviction. float16 keeps cosine similarities within ~1e-3
+of the full-precision values at half the size.
+"""
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from app.config import get_settings
+
+# Max host parameters per SQLite statement (999 on older builds)
+SQLITE_BATCH = 500
+
+
+class EmbeddingCache:
+    """SQLite-backed LRU cache for embedding vectors."""
+
+    def __init__(self, path: str, max_entries: int, enabled: bool = True):
+        self.path = path
+        self.max_entries = max_entries
+        self.enabled = enabled
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._count = 0  # approximate; recounted before evicting
+
+        if self.enabled:
+            try:
+                Path(path).parent.mkdir(parents=True, exist_ok=True)
+                self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+                # WAL lets several processes read while one writes
+                self._conn.execute("PRAGMA journal_mode=WAL")
+                self._conn.execute("PRAGMA synchronous=NORMAL")
+                self._conn.execute(
+                    "CREATE TABLE IF NOT EXISTS embeddings ("
+                    "key TEXT PRIMARY KEY, vector BLOB NOT NULL, last_used REAL NOT NULL)"
+                )
+                self._conn.execute(
+                    "CREATE INDEX IF NOT EXISTS idx_embeddings_last_used ON embeddings(last_used)"
+                )
+                self._conn.commit()
+                self._count = self._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+            except (OSError, sqlite3.Error) as e:
+                print(f"[WARN] Embedding cache disabled: {e}")
+                self.enabled = False
+
+    @staticmethod
+    def make_key(text: str, model: str, dimension: int) -> str:
+        """Build cache key from text hash, model and dimension."""
+        digest = hashlib.sha256(text.encode("utf-8")).hexdigest()
+        return hashlib.sha256(f"{digest}|{model}|{dimension}".encode()).hexdigest()
+
+    def get_many(self, keys: List[str]) -> Dict[str, List[float]]:
+        """Return cached vectors for the keys found, updating their recency."""
+        if not self.enabled or not keys:
+            return {}
+
+        unique = list(dict.fromkeys(keys))
+        found = {}
+        with self._lock:
+            try:
+                for start in range(0, len(unique), SQLITE_BATCH):
+                    batch = unique[start:start + SQLITE_BATCH]
+                    rows = self._conn.execute(
+                        f"SELECT key, vector FROM embeddings WHERE key IN ({','.join('?' * len(batch))})",
+                        batch
+                    ).fetchall()
+                    for key, blob in rows:
+                        found[key] = np.frombuffer(blob, dtype=np.float16).astype(np.float32).tolist()
+
+                if found:
+                    now = time.time()
+                    self._conn.executemany(
+                        "UPDATE embeddings SET last_used = ? WHERE key = ?",
+                        [(now, key) for key in found]
+                    )
+                    self._conn.commit()
+            except sqlite3.Error as e:
+                print(f"[WARN] Embedding cache read failed: {e}")
+                return {}
+
+            self.hits += len(found)
+            self.misses += len(unique) - len(found)
+        return found
+
+    def set_many(self, vectors: Dict[str, List[float]]) -> None:
+        """Store vectors and evict least recently used entries over budget."""
+        if not self.enabled or not vectors:
+            return
+
+        now = time.time()
+        rows = [
+            (key, np.asarray(vector, dtype=np.float16).tobytes(), now)
+            for key, vector in vectors.items()
+        ]
+        with self._lock:
+            try:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO embeddings (key, vector, last_used) VALUES (?, ?, ?)",
+                    rows
+                )
+                self._conn.commit()
+                self._count += len(rows)
+                if self._count > self.max_entries:
+                    self._evict()
+            except sqlite3.Error as e:
+                print(f"[WARN] Embedding cache write failed: {e}")
+
+    def stats(self) -> dict:
+        """Return hit/miss counters and size information."""
+        lookups = self.hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "entries": self._count,
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            "evictions": self.evictions
+        }
+
+    def _evict(self) -> None:
+        """Delete the oldest entries down to 90% of max_entries (lock held)."""
+        # Other processes may share the file, so recount before deleting
+        self._count = self._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+        excess = self._count - int(self.max_entries * 0.9)
+        if self._count <= self.max_entries or excess <= 0:
+            return
+
+        self._conn.execute(
+            "DELETE FROM embeddings WHERE key IN "
+            "(SELECT key FROM embeddings ORDER BY last_used LIMIT ?)",
+            (excess,)
+        )
+        self._conn.commit()
+        self._count -= excess
+        self.evictions += excess
+
+
+# Singleton instance
+_embedding_cache: Optional[EmbeddingCache] = None
+
+
+def get_embedding_cache() -> EmbeddingCache:
+    """Get singleton embedding cache instance."""
+    global _embedding_cache
+    if _embedding_cache is None:
+        settings = get_settings()
+        _embedding_cache = EmbeddingCache(
+            path=settings.research_embedding_cache_path
+            or os.path.join(settings.storage_path, "embedding_cache.sqlite3"),
+            max_entries=settings.research_embedding_cache_max_entries,
+            enabled=settings.research_embedding_cache_enabled
+        )
+    return _embedding_cache
@@ -0,0 +1,156 @@
+"""Embedding providers for claim similarity.
+
+EmbeddingService delegates vector generation to an EmbeddingProvider chosen
+by the research_embedding_provider setting:
+
+- gemini: Gemini embedding API, async, many texts per request
+- local: ONNX sentence-transformer on CPU (fastembed), no API quota
+
+Vectors from different models are not comparable, so stored claim
+embeddings must be regenerated after switching provider or model.
+"""
+
+import asyncio
+from abc import ABC, abstractmethod
+from typing import List, Optional
+
+from google import genai
+from google.genai import types
+from tenacity import retry, stop_after_attempt, wait_exponential
+
+from app.config import get_settings
+
+# Optional import - may not be installed
+try:
+    from fastembed import TextEmbedding
+    FASTEMBED_AVAILABLE = True
+except ImportError:
+    FASTEMBED_AVAILABLE = False
+
+
+class EmbeddingProvider(ABC):
+    """Turns texts into fixed-size embedding vectors."""
+
+    # Identifies the vector space (provider and model)
+    model: str
+    dimension: int
+
+    @abstractmethod
+    async def embed_texts(self, texts: List[str]) -> List[List[float]]:
+        """Embed texts.
+
+        Returns:
+            One vector per text, in input order
+        """
+
+    async def embed_text(self, text: str) -> List[float]:
+        """Embed a single text."""
+        return (await self.embed_texts([text]))[0]
+
+
+class GeminiEmbeddingProvider(EmbeddingProvider):
+    """Gemini embedding API, batch_size texts per request, requests run concurrently."""
+
+    DEFAULT_MODEL = "text-embedding-004"
+    # Embedding input limit is ~2k tokens; longer texts are cut to their start
+    MAX_CHARS = 8000
+
+    def __init__(
+        self,
+        model: str = DEFAULT_MODEL,
+        dimension: int = 768,
+        batch_size: int = 100,
+        concurrency: int = 4,
+    ):
+        settings = get_settings()
+        self.client = genai.Client(api_key=settings.gemini_api_key)
+        self.model = model
+        self.dimension = dimension
+        self.batch_size = batch_size
+        self.semaphore = asyncio.Semaphore(concurrency)
+
+    async def embed_texts(self, texts: List[str]) -> List[List[float]]:
+        """Embed texts in concurrent batched requests."""
+        batches = [texts[i:i + self.batch_size] for i in range(0, len(texts), self.batch_size)]
+
+        async def run(batch: List[str]) -> List[List[float]]:
+            async with self.semaphore:
+                return await self._embed_batch(batch)
+
+        results = await asyncio.gather(*(run(batch) for batch in batches))
+        return [vector for vectors in results for vector in vectors]
+
+    @retry(stop=stop_after_attempt(3), wait=wait_exponential(min=1, max=10))
+    async def _embed_batch(self, texts: List[str]) -> List[List[float]]:
+        """Embed one batch of texts in a single request."""
+        result = await self.client.aio.models.embed_content(
+            model=self.model,
+            contents=[text[:self.MAX_CHARS] for text in texts],
+            config=types.EmbedContentConfig(
+                task_type="SEMANTIC_SIMILARITY",
+                output_dimensionality=self.dimension,
+            ),
+        )
+        return [list(embedding.values) for embedding in result.embeddings]
+
+
+class LocalEmbeddingProvider(EmbeddingProvider):
+    """ONNX sentence-transformer run on CPU in a worker thread.
+
+    Model weights are downloaded on first use and cached by fastembed.
+    """
+
+    # 768 dimensions, matching the VECTOR(768) claim embedding column
+    DEFAULT_MODEL = "BAAI/bge-base-en-v1.5"
+
+    def __init__(
+        self,
+        model: str = DEFAULT_MODEL,
+        batch_size: int = 64,
+        threads: Optional[int] = None,
+    ):
+        if not FASTEMBED_AVAILABLE:
+            raise RuntimeError("fastembed not installed. Run: pip install fastembed")
+
+        self.model = model
+        self.batch_size = batch_size
+        self._engine = TextEmbedding(model_name=model, threads=threads)
+        self.dimension = len(next(iter(self._engine.embed(["dimension probe"]))))
+        # ONNX Runtime already uses all cores; run one inference at a time
+        self._lock = asyncio.Lock()
+
+    async def embed_texts(self, texts: List[str]) -> List[List[float]]:
+        """Embed texts without blocking the event loop."""
+        async with self._lock:
+            return await asyncio.to_thread(self._embed_sync, texts)
+
+    def _embed_sync(self, texts: List[str]) -> List[List[float]]:
+        """Run the model over texts (blocking)."""
+        return [vector.tolist() for vector in self._engine.embed(texts, batch_size=self.batch_size)]
+
+
+# Singleton instance
+_embedding_provider: Optional[EmbeddingProvider] = None
+
+
+def get_embedding_provider() -> EmbeddingProvider:
+    """Get the configured embedding provider (created once per process)."""
+    global _embedding_provider
+    if _embedding_provider is None:
+        settings = get_settings()
+        if settings.research_embedding_provider == "local":
+            _embedding_provider = LocalEmbeddingProvider(
+                model=settings.research_embedding_local_model,
+                batch_size=settings.research_embedding_batch_size,
+                threads=settings.research_embedding_threads,
+            )
+        elif settings.research_embedding_provider == "gemini":
+            _embedding_provider = GeminiEmbeddingProvider(
+                batch_size=settings.research_embedding_batch_size,
+                concurrency=settings.research_embedding_concurrency,
+            )
+        else:
+            raise ValueError(
+                f"Unknown research_embedding_provider: {settings.research_embedding_provider}"
+            )
+    return _embedding_provider
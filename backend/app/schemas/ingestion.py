@@ -0,0 +1,33 @@
+"""Pydantic schemas for background ingestion jobs."""
+from datetime import datetime
+from pydantic import BaseModel
+from typing import Optional
+
+
+class IngestionJobResponse(BaseModel):
+    """Status of a single ingestion job."""
+    id: str
+    workspace_id: str
+    batch_id: Optional[str] = None
+    filename: str
+    extraction_mode: str
+    status: str
+    stages: dict[str, str]
+    document_id: Optional[str] = None
+    attempts: int = 0
+    error: Optional[str] = None
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+
+
+class IngestionJobListResponse(BaseModel):
+    """Response schema for listing ingestion jobs."""
+    jobs: list[IngestionJobResponse]
+    total: int
+
+
+class BulkIngestionResponse(BaseModel):
+    """Response schema for bulk ingestion."""
+    batch_id: str
+    jobs: list[IngestionJobResponse]
+    rejected: list[dict] = []
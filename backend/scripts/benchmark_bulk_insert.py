@@ -0,0 +1,191 @@
+"""Benchmark per-row ORM inserts vs bulk inserts for structured extraction.
+
+Generates a synthetic extraction (500 claims by default, plus proportional
+metrics, entities, topics and chunks) and stores it with both the legacy
+one-object-per-row session.add() path and StructuredExtractor's bulk
+INSERT path, reporting wall time and rows/sec. Requires a reachable
+Postgres; benchmark rows are deleted afterwards.
+
+Run with: python scripts/benchmark_bulk_insert.py [--claims 500] [--runs 3] (from backend dir)
+"""
+
+import argparse
+import asyncio
+import random
+import statistics
+import sys
+import time
+import uuid
+from pathlib import Path
+
+from sqlalchemy import delete
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+
+_backend_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(_backend_dir))
+
+from app.config import get_settings
+from app.db.models import Base
+from app.core.agentic_sql.extractor import StructuredExtractor
+from app.core.agentic_sql.schemas import (
+    SQLDocument, SQLClaim, SQLMetric, SQLEntity, SQLTopic, SQLDocumentChunk
+)
+
+WORKSPACE_ID = "bench_bulk_insert"
+WORDS = (
+    "revenue filing court exhibit counsel motion quarter growth margin "
+    "defendant plaintiff agreement transfer account payment schedule "
+    "deposition witness testimony subsidiary holding trust invoice audit"
+).split()
+
+
+def sentence(rng: random.Random, n_words: int) -> str:
+    """Random sentence of n_words."""
+    return " ".join(rng.choice(WORDS) for _ in range(n_words)).capitalize() + "."
+
+
+def build_extraction(n_claims: int, rng: random.Random) -> dict:
+    """Synthetic extraction result shaped like StructuredExtractor output."""
+    return {
+        "claims": [
+            {
+                "claim_text": sentence(rng, 25),
+                "claim_type": rng.choice(["fact", "opinion", "prediction"]),
+                "topic": rng.choice(WORDS),
+                "confidence": "medium",
+                "source_section": f"Section {rng.randint(1, 20)}",
+                "is_quantitative": rng.random() < 0.3,
+                "can_be_verified": True
+            }
+            for _ in range(n_claims)
+        ],
+        "metrics": [
+            {
+                "metric_name": rng.choice(WORDS),
+                "value": f"${rng.randint(1, 999)}M",
+                "numeric_value": float(rng.randint(1, 999)),
+                "unit": "USD",
+                "period": "Q1 2024",
+                "period_start": "2024-01-01",
+                "period_end": "2024-03-31",
+                "context": sentence(rng, 15),
+                "entity_name": f"Org{rng.randint(0, 50)}",
+                "category": "financial"
+            }
+            for _ in range(n_claims // 2)
+        ],
+        "entities": [
+            {
+                "entity_name": f"Person{i}",
+                "entity_type": "person",
+                "role": "mentioned",
+                "context": sentence(rng, 10)
+            }
+            for i in range(n_claims // 5)
+        ],
+        "topics": [
+            {"topic_name": f"{rng.choice(WORDS)} {i}", "is_primary": i == 0}
+            for i in range(20)
+        ],
+        "chunks": [
+            {"section": f"Section {i}", "content": sentence(rng, 400), "token_count": 500}
+            for i in range(n_claims // 10)
+        ]
+    }
+
+
+def row_count(extraction: dict) -> int:
+    """Total rows written for one extraction (including the document row)."""
+    return 1 + sum(len(extraction[k]) for k in ("claims", "metrics", "entities", "topics", "chunks"))
+
+
+async def store_per_row(session, doc_id: str, extraction: dict) -> None:
+    """Legacy path: one ORM object per row, flushed at commit."""
+    extractor = StructuredExtractor(session)
+    session.add(SQLDocument(id=doc_id, workspace_id=WORKSPACE_ID, filename=f"{doc_id}.pdf"))
+    for c in extraction["claims"]:
+        session.add(SQLClaim(document_id=doc_id, **c))
+    for m in extraction["metrics"]:
+        session.add(SQLMetric(
+            document_id=doc_id,
+            **{**m,
+               "period_start": extractor._parse_date(m["period_start"]),
+               "period_end": extractor._parse_date(m["period_end"])}
+        ))
+    for e in extraction["entities"]:
+        session.add(SQLEntity(document_id=doc_id, **e))
+    for t in extraction["topics"]:
+        session.add(SQLTopic(document_id=doc_id, **t))
+    for i, chunk in enumerate(extraction["chunks"]):
+        session.add(SQLDocumentChunk(
+            document_id=doc_id,
+            chunk_index=i,
+            section_name=chunk["section"],
+            chunk_text=chunk["content"],
+            token_count=chunk["token_count"]
+        ))
+    await session.commit()
+
+
+async def store_bulk(session, doc_id: str, extraction: dict) -> None:
+    """Bulk path used by StructuredExtractor.extract_and_store."""
+    extractor = StructuredExtractor(session)
+    await extractor._store_document(doc_id, WORKSPACE_ID, f"{doc_id}.pdf", {}, 0)
+    await extractor._store_claims(doc_id, extraction["claims"])
+    await extractor._store_metrics(doc_id, extraction["metrics"])
+    await extractor._store_entities(doc_id, extraction["entities"])
+    await extractor._store_topics(doc_id, extraction["topics"])
+    await extractor._store_chunks(doc_id, extraction["chunks"])
+    await session.commit()
+
+
+async def run(args) -> None:
+    engine = create_async_engine(args.postgres_url, pool_size=2)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    session_maker = async_sessionmaker(engine, expire_on_commit=False)
+
+    extraction = build_extraction(args.claims, random.Random(args.claims))
+    rows = row_count(extraction)
+
+    print("=" * 60)
+    print("BULK INSERT BENCHMARK")
+    print("=" * 60)
+    print(f"  {args.claims} claims, {rows:,} rows per document, {args.runs} runs\n")
+
+    results = {}
+    try:
+        for name, store in (("per-row add", store_per_row), ("bulk insert", store_bulk)):
+            timings = []
+            for _ in range(args.runs):
+                doc_id = f"bench_{uuid.uuid4().hex[:12]}"
+                async with session_maker() as session:
+                    start = time.perf_counter()
+                    await store(session, doc_id, extraction)
+                    timings.append(time.perf_counter() - start)
+            results[name] = statistics.median(timings)
+            print(f"    {name:<12} median {results[name] * 1000:8.1f}ms  "
+                  f"{rows / results[name]:>10,.0f} rows/sec")
+    finally:
+        async with session_maker() as session:
+            await session.execute(delete(SQLDocument).where(SQLDocument.workspace_id == WORKSPACE_ID))
+            await session.commit()
+        await engine.dispose()
+
+    if len(results) == 2:
+        print(f"\n  Speedup: {results['per-row add'] / results['bulk insert']:.1f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--postgres-url", default=get_settings().postgres_url)
+    parser.add_argument("--claims", type=int, default=500)
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+    if not args.postgres_url:
+        parser.error("POSTGRES_URL not configured; pass --postgres-url")
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
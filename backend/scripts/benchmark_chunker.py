@@ -0,0 +1,146 @@
+"""Micro-benchmark: legacy re-encode chunking vs streaming SemanticChunker.
+
+Builds a synthetic markdown document (default ~1M tokens) made of many
+header sections and compares the old `_semantic_split` loop, which
+re-tokenizes the growing chunk for every part, with
+`SemanticChunker.iter_chunks`, which tokenizes each segment once. A
+header-less plain-text document of the same size (typical of OCR output)
+is also chunked, exercising the token-windowing path.
+
+Run with: python scripts/benchmark_chunker.py [--tokens 1000000] (from backend dir)
+"""
+
+import argparse
+import random
+import re
+import sys
+import time
+from pathlib import Path
+
+_backend_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(_backend_dir))
+
+from app.core.chunker import SemanticChunker
+
+WORDS = (
+    "revenue filing court exhibit counsel motion quarter growth margin "
+    "defendant plaintiff agreement transfer account payment schedule "
+    "deposition witness testimony subsidiary holding trust invoice"
+).split()
+
+
+def build_markdown(target_tokens: int, tokenizer, seed: int = 7) -> str:
+    """Generate markdown with h2/h3 sections until target_tokens is reached."""
+    rng = random.Random(seed)
+    sections = []
+    total = 0
+    i = 0
+    while total < target_tokens:
+        i += 1
+        level = "##" if i % 5 else "#"
+        paragraphs = []
+        for _ in range(rng.randint(2, 6)):
+            sentence_count = rng.randint(3, 8)
+            sentences = [
+                " ".join(rng.choice(WORDS) for _ in range(rng.randint(8, 20))).capitalize() + "."
+                for _ in range(sentence_count)
+            ]
+            paragraphs.append(" ".join(sentences))
+        section = f"{level} Section {i}\n" + "\n\n".join(paragraphs) + "\n"
+        sections.append(section)
+        # Estimate token growth cheaply (exact count is not needed here)
+        total += len(section) // 4
+    return "\n" + "\n".join(sections)
+
+
+def build_plain_text(target_tokens: int, seed: int = 7) -> str:
+    """Generate header-less paragraphs (one segment) of about target_tokens."""
+    rng = random.Random(seed)
+    paragraphs = []
+    total = 0
+    while total < target_tokens:
+        paragraph = " ".join(rng.choice(WORDS) for _ in range(rng.randint(40, 120))).capitalize() + "."
+        paragraphs.append(paragraph)
+        total += len(paragraph) // 4
+    return "\n\n".join(paragraphs)
+
+
+def legacy_split(content: str, tokenizer, max_tokens: int) -> list[dict]:
+    """The pre-streaming algorithm: re-encode current chunk on every part."""
+    parts = re.split(r'\n(#{1,3}\s+.+)\n', content)
+    chunks = []
+    current_section = "Introduction"
+    current_content = ""
+
+    for part in parts:
+        if re.match(r'^#{1,3}\s+', part):
+            if current_content.strip():
+                chunks.append({"content": current_content.strip(), "section": current_section})
+            current_section = part.strip('# \n')
+            current_content = part + "\n"
+        else:
+            test_content = current_content + part
+            test_tokens = len(tokenizer.encode(test_content))
+            if test_tokens > max_tokens and current_content.strip():
+                chunks.append({"content": current_content.strip(), "section": current_section})
+                current_content = part
+            else:
+                current_content = test_content
+
+    if current_content.strip():
+        chunks.append({"content": current_content.strip(), "section": current_section})
+
+    # Legacy enrichment re-encoded every chunk once more
+    for chunk in chunks:
+        chunk["token_count"] = len(tokenizer.encode(chunk["content"]))
+    return chunks
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tokens", type=int, default=1_000_000, help="Approximate document size")
+    parser.add_argument("--max-tokens", type=int, default=None, help="Chunk size (default from settings)")
+    parser.add_argument("--skip-legacy", action="store_true", help="Only time the streaming chunker")
+    args = parser.parse_args()
+
+    chunker = SemanticChunker()
+    max_tokens = args.max_tokens or chunker.settings.chunk_size_tokens
+
+    print("=" * 60)
+    print("CHUNKER BENCHMARK")
+    print("=" * 60)
+
+    content = build_markdown(args.tokens, chunker.tokenizer)
+    start = time.perf_counter()
+    doc_tokens = chunker.count_tokens(content)
+    encode_once = time.perf_counter() - start
+    print(f"  Document: {len(content):,} chars, {doc_tokens:,} tokens")
+    print(f"  Single full encode: {encode_once:.2f}s (lower bound)")
+    print(f"  Chunk size: {max_tokens} tokens, overlap: {chunker.settings.chunk_overlap_tokens}")
+
+    start = time.perf_counter()
+    streamed = chunker.enrich_chunks(list(chunker.iter_chunks(content, max_tokens=max_tokens)))
+    streaming_time = time.perf_counter() - start
+    print(f"\n  [streaming] {len(streamed)} chunks in {streaming_time:.2f}s")
+
+    if not args.skip_legacy:
+        start = time.perf_counter()
+        legacy = legacy_split(content, chunker.tokenizer, max_tokens)
+        legacy_time = time.perf_counter() - start
+        print(f"  [legacy]    {len(legacy)} chunks in {legacy_time:.2f}s")
+        print(f"\n  Speedup: {legacy_time / streaming_time:.1f}x")
+
+    oversized = [c for c in streamed if c["token_count"] > max_tokens]
+    print(f"  Oversized streaming chunks: {len(oversized)}")
+
+    # No headers: the whole document is one segment, windowed by token
+    plain = build_plain_text(args.tokens)
+    start = time.perf_counter()
+    plain_chunks = chunker.enrich_chunks(list(chunker.iter_chunks(plain, max_tokens=max_tokens)))
+    plain_time = time.perf_counter() - start
+    print(f"\n  [plain text] {len(plain):,} chars, {len(plain_chunks)} chunks in {plain_time:.2f}s")
+    oversized = [c for c in plain_chunks if c["token_count"] > max_tokens]
+    print(f"  Oversized plain-text chunks: {len(oversized)}")
+
+if __name__ == "__main__":
+    main()
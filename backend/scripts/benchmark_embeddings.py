@@ -0,0 +1,100 @@
+"""Benchmark claim embedding throughput of the Gemini and local providers.
+
+Embeds a synthetic set of claim-length sentences (2000 by default) with
+each requested EmbeddingProvider and reports wall time, texts/sec and
+vector dimension. The old one-request-per-claim Gemini path is measured
+on a sample for comparison. The Gemini provider needs GEMINI_API_KEY; the
+local provider needs fastembed (the model is downloaded on first run and
+excluded from timing).
+
+Run with: python scripts/benchmark_embeddings.py [--texts 2000] [--providers gemini local] (from backend dir)
+"""
+
+import argparse
+import asyncio
+import random
+import sys
+import time
+from pathlib import Path
+
+_backend_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(_backend_dir))
+
+from app.config import get_settings
+from app.research.services.embedding_providers import (
+    GeminiEmbeddingProvider, LocalEmbeddingProvider
+)
+
+WORDS = (
+    "revenue filing court exhibit counsel motion quarter growth margin "
+    "defendant plaintiff agreement transfer account payment schedule "
+    "deposition witness testimony subsidiary holding trust invoice audit"
+).split()
+
+
+def build_texts(n: int, rng: random.Random) -> list[str]:
+    """Claim-length random sentences (20-40 words)."""
+    return [
+        " ".join(rng.choice(WORDS) for _ in range(rng.randint(20, 40))).capitalize() + "."
+        for _ in range(n)
+    ]
+
+
+def make_provider(name: str, args):
+    """Create a provider from the benchmark arguments."""
+    if name == "gemini":
+        return GeminiEmbeddingProvider(batch_size=args.batch_size, concurrency=args.concurrency)
+    return LocalEmbeddingProvider(model=args.local_model, batch_size=args.batch_size)
+
+
+async def run(args) -> None:
+    texts = build_texts(args.texts, random.Random(args.texts))
+    settings = get_settings()
+
+    print("=" * 60)
+    print("EMBEDDING PROVIDER BENCHMARK")
+    print("=" * 60)
+    print(f"  {args.texts} texts, batch size {args.batch_size}\n")
+
+    for name in args.providers:
+        if name == "gemini" and not settings.gemini_api_key:
+            print("  [gemini] skipped: GEMINI_API_KEY not configured")
+            continue
+        try:
+            provider = make_provider(name, args)
+        except RuntimeError as e:
+            print(f"  [{name}] skipped: {e}")
+            continue
+
+        if name == "gemini":
+            # Legacy path: one request per text, awaited one after another
+            sample = texts[:args.sequential_sample]
+            start = time.perf_counter()
+            for text in sample:
+                await provider._embed_batch([text])
+            elapsed = time.perf_counter() - start
+            print(f"  [gemini, 1 text/request]  {len(sample):>6} texts  {elapsed:7.2f}s  "
+                  f"{len(sample) / elapsed:8.1f} texts/sec")
+
+        start = time.perf_counter()
+        vectors = await provider.embed_texts(texts)
+        elapsed = time.perf_counter() - start
+        print(f"  [{name}, batched]  {len(vectors):>6} texts  {elapsed:7.2f}s  "
+              f"{len(vectors) / elapsed:8.1f} texts/sec  dim={len(vectors[0])}  model={provider.model}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--texts", type=int, default=2000)
+    parser.add_argument("--providers", nargs="+", choices=["gemini", "local"], default=["gemini", "local"])
+    parser.add_argument("--batch-size", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=4, help="Concurrent Gemini requests")
+    parser.add_argument("--local-model", default=get_settings().research_embedding_local_model)
+    parser.add_argument("--sequential-sample", type=int, default=50,
+                        help="Texts embedded one request at a time for the legacy baseline")
+    args = parser.parse_args()
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
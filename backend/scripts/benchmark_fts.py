@@ -0,0 +1,202 @@
+"""Benchmark ILIKE scans vs indexed full-text search for Agentic SQL.
+
+Loads a synthetic corpus (100k claims by default, plus entities and
+chunks) into the sql_* tables, applies the full-text search schema
+(tsvector columns, GIN and trigram indexes, search_text()) and compares
+EXPLAIN (ANALYZE, BUFFERS) for the agent's old ILIKE patterns against
+the index-backed equivalents: plan node types, buffers read and median
+execution time. Requires a reachable Postgres; benchmark rows are deleted
+afterwards unless --keep is given.
+
+Run with: python scripts/benchmark_fts.py [--claims 100000] [--runs 5] (from backend dir)
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+from sqlalchemy import delete, insert, text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+_backend_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(_backend_dir))
+
+from app.config import get_settings
+from app.db.models import Base
+from app.db.postgres import create_search_schema
+from app.core.agentic_sql.schemas import (
+    SQLDocument, SQLClaim, SQLEntity, SQLDocumentChunk
+)
+
+WORKSPACE_ID = "bench_fts"
+BATCH_SIZE = 5000
+SYLLABLES = "ka lo mi ren tas vel dor qui zan pe rox lum bri sen tor gal".split()
+# 4096 pronounceable pseudo-words, drawn with a Zipf-like skew
+VOCABULARY = ["".join(p) for p in itertools.product(SYLLABLES, repeat=3)]
+
+
+def sentence(rng: random.Random, n_words: int) -> str:
+    """Random sentence with Zipf-like word frequencies."""
+    return " ".join(
+        VOCABULARY[min(int(rng.paretovariate(1.1)) - 1, len(VOCABULARY) - 1) * 7 % len(VOCABULARY)]
+        for _ in range(n_words)
+    ).capitalize() + "."
+
+
+async def load_corpus(engine, n_claims: int, rng: random.Random) -> None:
+    """Insert documents, claims, entities and chunks in batches."""
+    n_docs = max(1, n_claims // 100)
+    doc_ids = [f"bench_fts_{i:06d}" for i in range(n_docs)]
+
+    async with engine.begin() as conn:
+        await conn.execute(insert(SQLDocument), [
+            {"id": doc_id, "workspace_id": WORKSPACE_ID, "filename": f"{doc_id}.pdf"}
+            for doc_id in doc_ids
+        ])
+
+    tables = [
+        (SQLClaim, n_claims, lambda: {
+            "document_id": rng.choice(doc_ids),
+            "claim_text": sentence(rng, 20),
+            "claim_type": "fact",
+            "topic": rng.choice(VOCABULARY)
+        }),
+        (SQLEntity, n_claims // 5, lambda: {
+            "document_id": rng.choice(doc_ids),
+            "entity_name": f"{rng.choice(VOCABULARY).capitalize()} {rng.choice(VOCABULARY).capitalize()}",
+            "entity_type": rng.choice(["person", "organization"]),
+            "context": sentence(rng, 12)
+        }),
+        (SQLDocumentChunk, n_claims // 20, lambda: {
+            "document_id": rng.choice(doc_ids),
+            "chunk_index": 0,
+            "section_name": sentence(rng, 3),
+            "chunk_text": sentence(rng, 300)
+        }),
+    ]
+    for model, count, make_row in tables:
+        start = time.perf_counter()
+        for offset in range(0, count, BATCH_SIZE):
+            async with engine.begin() as conn:
+                await conn.execute(insert(model), [make_row() for _ in range(min(BATCH_SIZE, count - offset))])
+        print(f"    loaded {count:>8,} rows into {model.__tablename__} "
+              f"({time.perf_counter() - start:.1f}s)")
+
+    async with engine.begin() as conn:
+        for model in (SQLDocument, SQLClaim, SQLEntity, SQLDocumentChunk):
+            await conn.execute(text(f"ANALYZE {model.__tablename__}"))
+
+
+def plan_summary(plan: dict) -> tuple[list[str], int]:
+    """Scan node types (with relation) and shared buffers touched, from a JSON plan."""
+    nodes = []
+    stack = [plan]
+    while stack:
+        node = stack.pop()
+        node_type = node["Node Type"]
+        if "Scan" in node_type:
+            relation = node.get("Relation Name") or node.get("Index Name") or node.get("Function Name", "")
+            nodes.append(f"{node_type}({relation})")
+        stack.extend(node.get("Plans", []))
+    buffers = plan.get("Shared Hit Blocks", 0) + plan.get("Shared Read Blocks", 0)
+    return sorted(set(nodes)), buffers
+
+
+def build_cases(rng: random.Random) -> list[tuple[str, str, str]]:
+    """(name, old ILIKE query, indexed query) triples for mid-frequency terms."""
+    a, b = (VOCABULARY[i * 7 % len(VOCABULARY)] for i in rng.sample(range(20, 200), 2))
+    name_part = VOCABULARY[rng.randrange(50) * 7 % len(VOCABULARY)][1:6]
+    return [
+        (
+            "claims: two terms",
+            f"SELECT id, claim_text FROM sql_claims "
+            f"WHERE claim_text ILIKE '%{a}%' AND claim_text ILIKE '%{b}%' LIMIT 20",
+            f"SELECT id, claim_text FROM sql_claims "
+            f"WHERE search_vector @@ websearch_to_tsquery('english', '{a} {b}') "
+            f"ORDER BY ts_rank_cd(search_vector, websearch_to_tsquery('english', '{a} {b}')) DESC LIMIT 20"
+        ),
+        (
+            "chunks: phrase",
+            f"SELECT id, section_name FROM sql_document_chunks "
+            f"WHERE chunk_text ILIKE '%{a} {b}%' LIMIT 20",
+            f"SELECT id, section_name FROM sql_document_chunks "
+            f"WHERE search_vector @@ websearch_to_tsquery('english', '\"{a} {b}\"') LIMIT 20"
+        ),
+        (
+            "all text: search_text()",
+            f"(SELECT id, claim_text FROM sql_claims WHERE claim_text ILIKE '%{a}%' "
+            f"UNION ALL SELECT id, chunk_text FROM sql_document_chunks WHERE chunk_text ILIKE '%{a}%' "
+            f"UNION ALL SELECT id, context FROM sql_entities WHERE context ILIKE '%{a}%') LIMIT 20",
+            f"SELECT * FROM search_text('{a}', '{WORKSPACE_ID}', 20)"
+        ),
+        (
+            "entity name: substring",
+            f"SELECT id, entity_name FROM sql_entities WHERE lower(entity_name) LIKE '%{name_part}%' LIMIT 20",
+            f"SELECT id, entity_name FROM sql_entities WHERE entity_name ILIKE '%{name_part}%' LIMIT 20"
+        ),
+    ]
+
+
+async def explain(engine, query: str, runs: int) -> tuple[float, list[str], int]:
+    """Median execution time (ms), scan nodes and buffers over runs."""
+    timings = []
+    async with engine.connect() as conn:
+        for _ in range(runs):
+            result = await conn.execute(text(f"EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {query}"))
+            raw = result.scalar()
+            plan = (json.loads(raw) if isinstance(raw, str) else raw)[0]
+            timings.append(plan["Execution Time"])
+    nodes, buffers = plan_summary(plan["Plan"])
+    return statistics.median(timings), nodes, buffers
+
+
+async def run(args) -> None:
+    engine = create_async_engine(args.postgres_url, pool_size=2)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    await create_search_schema(engine)
+
+    rng = random.Random(args.claims)
+
+    print("=" * 60)
+    print("FULL-TEXT SEARCH BENCHMARK")
+    print("=" * 60)
+    print(f"  Loading {args.claims:,} claims...")
+
+    try:
+        await load_corpus(engine, args.claims, rng)
+
+        for name, old_query, new_query in build_cases(rng):
+            old_ms, old_nodes, old_buffers = await explain(engine, old_query, args.runs)
+            new_ms, new_nodes, new_buffers = await explain(engine, new_query, args.runs)
+            print(f"\n  [{name}]")
+            print(f"    ILIKE:   {old_ms:9.2f}ms  {old_buffers:>8,} buffers  {', '.join(old_nodes)}")
+            print(f"    indexed: {new_ms:9.2f}ms  {new_buffers:>8,} buffers  {', '.join(new_nodes)}")
+            print(f"    speedup: {old_ms / new_ms:.1f}x" if new_ms else "    speedup: n/a")
+    finally:
+        if not args.keep:
+            async with engine.begin() as conn:
+                await conn.execute(delete(SQLDocument).where(SQLDocument.workspace_id == WORKSPACE_ID))
+        await engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--postgres-url", default=get_settings().postgres_url)
+    parser.add_argument("--claims", type=int, default=100000)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--keep", action="store_true", help="Keep benchmark rows after the run")
+    args = parser.parse_args()
+    if not args.postgres_url:
+        parser.error("POSTGRES_URL not configured; pass --postgres-url")
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+"""Benchmark full-map vs two-stage (BM25 pre-filter) retrieval prompts.
+
+Builds synthetic document maps of 100, 1k and 10k documents and, for a set
+of queries aimed at one known document, compares the map prompt sent to
+consult_map_for_retrieval with and without the local pre-filter: prompt
+tokens, local p50/p95 latency (pre-filter + render) and candidate recall.
+Model latency is estimated from prompt tokens with --llm-ms-per-1k-tokens
+since no network calls are made.
+
+Run with: python scripts/benchmark_map_prefilter.py [--sizes 100 1000 10000] (from backend dir)
+"""
+
+import argparse
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+import tiktoken
+
+_backend_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(_backend_dir))
+
+from app.core.gemini_client import GeminiClient
+from app.core.map_prefilter import MapPrefilter, build_candidate_map
+
+WORDS = (
+    "revenue filing court exhibit counsel motion quarter growth margin "
+    "defendant plaintiff agreement transfer account payment schedule "
+    "deposition witness testimony subsidiary holding trust invoice audit "
+    "lease merger patent royalty shipment warranty dispute settlement "
+    "compliance license budget forecast pension vendor escrow"
+).split()
+TYPES = ["contract", "report", "email", "filing", "invoice", "memo"]
+
+
+def build_map(n_docs: int, rng: random.Random) -> dict:
+    """Generate a document map with topics, entities and chunked large docs."""
+    documents = []
+    by_entity: dict[str, list[str]] = {}
+    by_topic: dict[str, list[str]] = {}
+
+    for i in range(n_docs):
+        doc_id = f"doc_{i:05d}"
+        topics = [f"{rng.choice(WORDS)} {rng.choice(WORDS)}" for _ in range(4)]
+        people = [f"Person{rng.randint(0, n_docs * 2)}" for _ in range(2)]
+        orgs = [f"Org{rng.randint(0, n_docs)}" for _ in range(2)]
+        size_class = "large" if rng.random() < 0.2 else "small"
+        doc = {
+            "id": doc_id,
+            "filename": f"{rng.choice(TYPES)}_{i}.pdf",
+            "type": rng.choice(TYPES),
+            "size_class": size_class,
+            "essence": " ".join(rng.choice(WORDS) for _ in range(30)).capitalize() + ".",
+            "topics": topics,
+            "entities": {"people": people, "organizations": orgs},
+            "retrieval_hints": "Use for " + ", ".join(topics[:2]),
+            "relationships": []
+        }
+        if size_class == "large":
+            doc["chunks"] = [
+                {"chunk_id": f"{doc_id}_c{c + 1}", "section": f"Section {c + 1}"}
+                for c in range(rng.randint(3, 12))
+            ]
+        documents.append(doc)
+
+        for entity in people + orgs:
+            by_entity.setdefault(entity, []).append(doc_id)
+        for topic in topics:
+            by_topic.setdefault(topic, []).append(doc_id)
+
+    return {
+        "corpus_id": "bench",
+        "corpus_summary": f"Synthetic corpus of {n_docs} documents.",
+        "documents": documents,
+        "cross_references": {"by_entity": by_entity, "by_topic": by_topic}
+    }
+
+
+def build_queries(document_map: dict, count: int, rng: random.Random) -> list[tuple[str, str]]:
+    """Queries built from a target document's entities and topics."""
+    queries = []
+    for doc in rng.sample(document_map["documents"], count):
+        entity = rng.choice(doc["entities"]["people"] + doc["entities"]["organizations"])
+        queries.append((f"What did {entity} say about {doc['topics'][0]}?", doc["id"]))
+    return queries
+
+
+def percentile(values: list[float], pct: float) -> float:
+    """Nearest-rank percentile."""
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 10000])
+    parser.add_argument("--queries", type=int, default=50)
+    parser.add_argument("--top-k", type=int, default=25)
+    parser.add_argument("--llm-ms-per-1k-tokens", type=float, default=25.0)
+    args = parser.parse_args()
+
+    tokenizer = tiktoken.get_encoding("cl100k_base")
+    # Only the prompt formatter is needed, not an API client
+    formatter = object.__new__(GeminiClient)
+
+    print("=" * 60)
+    print("MAP PRE-FILTER BENCHMARK")
+    print("=" * 60)
+
+    for n_docs in args.sizes:
+        rng = random.Random(n_docs)
+        document_map = build_map(n_docs, rng)
+        queries = build_queries(document_map, min(args.queries, n_docs), rng)
+
+        start = time.perf_counter()
+        full_prompt = formatter._format_map_for_prompt(document_map)
+        full_render_ms = (time.perf_counter() - start) * 1000
+        full_tokens = len(tokenizer.encode(full_prompt))
+
+        start = time.perf_counter()
+        prefilter = MapPrefilter(document_map["documents"])
+        build_ms = (time.perf_counter() - start) * 1000
+
+        local_ms, tokens, hits = [], [], 0
+        for query, target in queries:
+            start = time.perf_counter()
+            doc_ids = prefilter.search(query, args.top_k)
+            prompt = formatter._format_map_for_prompt(build_candidate_map(document_map, doc_ids))
+            local_ms.append((time.perf_counter() - start) * 1000)
+            tokens.append(len(tokenizer.encode(prompt)))
+            hits += target in doc_ids
+
+        est_full = full_render_ms + full_tokens / 1000 * args.llm_ms_per_1k_tokens
+        est_two_stage = [
+            ms + tok / 1000 * args.llm_ms_per_1k_tokens for ms, tok in zip(local_ms, tokens)
+        ]
+
+        print(f"\n  [{n_docs} documents]  index build {build_ms:.1f}ms")
+        print(f"    full map:    {full_tokens:>10,} prompt tokens  render {full_render_ms:8.1f}ms  "
+              f"est. total {est_full:9.1f}ms")
+        print(f"    two-stage:   {int(statistics.mean(tokens)):>10,} prompt tokens  "
+              f"local p50 {percentile(local_ms, 50):.2f}ms p95 {percentile(local_ms, 95):.2f}ms  "
+              f"est. total p50 {percentile(est_two_stage, 50):.1f}ms p95 {percentile(est_two_stage, 95):.1f}ms")
+        print(f"    recall@{args.top_k}:   {hits}/{len(queries)}")
+
+
+if __name__ == "__main__":
+    main()
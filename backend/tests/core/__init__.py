@@ -0,0 +1 @@
+"""Offline unit tests for core services (no database or API keys)."""
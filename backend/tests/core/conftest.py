@@ -0,0 +1,10 @@
+"""Make the backend package importable and give settings a dummy API key."""
+
+import os
+import sys
+from pathlib import Path
+
+_backend_dir = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(_backend_dir))
+
+os.environ.setdefault("GEMINI_API_KEY", "test")
@@ -0,0 +1,68 @@
+"""Tests for answer cache keys and lookups.
+
+Run with: python -m pytest tests/core/test_answer_cache.py (from backend dir)
+"""
+
+import pytest
+
+from app.core.answer_cache import AnswerCache, normalize_question
+
+
+@pytest.fixture
+def cache():
+    return AnswerCache(max_entries=10, ttl_seconds=60, similarity_threshold=0.97)
+
+
+def key(cache, query):
+    return cache.make_key("ws", 1, query, 5)
+
+
+@pytest.mark.parametrize("first, second", [
+    ("is the drug approved", "is the drug not approved"),
+    ("revenue before 2020", "revenue after 2020"),
+    ("more than 5 lawsuits", "fewer than 5 lawsuits"),
+    ("more than 5 lawsuits", "more than 6 lawsuits"),
+    ("did Alice pay Bob", "did Bob pay Alice"),
+    ("who sued whom", "whom sued who"),
+])
+def test_different_questions_do_not_collide(cache, first, second):
+    assert key(cache, first) != key(cache, second)
+
+
+@pytest.mark.parametrize("variant", [
+    "Is the drug approved?",
+    "  is   the drug\tapproved  ",
+    "IS THE DRUG APPROVED?!",
+    "is the drug approved.",
+])
+def test_trivial_variants_share_key(cache, variant):
+    assert key(cache, variant) == key(cache, "is the drug approved")
+
+
+def test_normalize_question_keeps_words():
+    assert normalize_question("Revenue before 2020 and after 5 years?") == \
+        "revenue before 2020 and after 5 years"
+
+
+def test_empty_query_has_no_key(cache):
+    assert key(cache, " ?! ") is None
+
+
+def test_negated_question_misses_cached_answer(cache):
+    cache.set(key(cache, "is the drug approved"), {"answer": "yes"})
+
+    assert cache.get(key(cache, "Is the drug approved?")) == {"answer": "yes"}
+    assert cache.get(key(cache, "is the drug not approved")) is None
+
+
+def test_key_includes_map_version(cache):
+    cache.set(cache.make_key("ws", 1, "q", 5), {"answer": "old"})
+
+    assert cache.get(cache.make_key("ws", 2, "q", 5)) is None
+
+
+def test_semantic_tier_respects_threshold(cache):
+    cache.set(key(cache, "is the drug approved"), {"answer": "yes"}, [1.0, 0.0])
+
+    assert cache.get_similar(key(cache, "other"), [0.96, 0.28]) is None  # cosine 0.96
+    assert cache.get_similar(key(cache, "other"), [0.99, 0.1]) == {"answer": "yes"}
@@ -0,0 +1,111 @@
+"""Tests for streaming chunking with a byte-level stub tokenizer.
+
+cl100k_base cannot be downloaded offline, so every byte is one token here,
+which also puts multibyte characters across window edges.
+
+Run with: python -m pytest tests/core/test_chunker.py (from backend dir)
+"""
+
+import itertools
+
+import pytest
+import tiktoken
+
+from app.core import chunker as chunker_module
+from app.core.chunker import SemanticChunker, split_into_segments
+
+BYTE_TOKENIZER = tiktoken.Encoding(
+    name="bytes",
+    pat_str=r"\S+|\s+",
+    mergeable_ranks={bytes([i]): i for i in range(256)},
+    special_tokens={}
+)
+
+
+@pytest.fixture
+def chunker(monkeypatch):
+    monkeypatch.setattr(chunker_module.tiktoken, "get_encoding", lambda name: BYTE_TOKENIZER)
+    return SemanticChunker()
+
+
+def chunks_of(chunker, text, max_tokens, overlap_tokens=0):
+    return list(chunker.iter_chunks(text, max_tokens=max_tokens, overlap_tokens=overlap_tokens))
+
+
+def test_chunks_respect_max_tokens(chunker):
+    text = "Intro text.\n# One\n" + "word " * 200 + "\n## Two\nshort\n"
+    chunks = chunks_of(chunker, text, max_tokens=64, overlap_tokens=8)
+
+    assert all(c["token_count"] <= 64 for c in chunks)
+    assert chunks[0]["section"] == "Introduction"
+    assert chunks[-1]["section"] == "Two"
+
+
+def test_plain_text_without_headers_is_windowed(chunker):
+    text = "abcdefghij" * 100
+    chunks = chunks_of(chunker, text, max_tokens=100)
+
+    assert "".join(c["content"] for c in chunks) == text
+    assert all(c["section"] == "Introduction" for c in chunks)
+
+
+def test_header_longer_than_max_tokens(chunker):
+    header = "# " + "H" * 150
+    text = "lead\n" + header + "\nbody text\n"
+    chunks = chunks_of(chunker, text, max_tokens=50, overlap_tokens=10)
+
+    assert all(c["token_count"] <= 50 for c in chunks)
+    combined = "".join(c["content"] for c in chunks)
+    assert combined.count("H") >= 150
+    assert "body text" in chunks[-1]["content"]
+
+
+def test_header_filling_chunk_makes_progress(chunker):
+    header = "# " + "H" * 47  # with its newline, exactly max_tokens
+    text = "lead\n" + header + "\n" + "x" * 200
+    # A window that never advances would loop forever; cap the chunks read
+    chunks = list(itertools.islice(
+        chunker.iter_chunks(text, max_tokens=50, overlap_tokens=10), 100
+    ))
+
+    assert len(chunks) < 100
+
+    assert all(c["token_count"] <= 50 for c in chunks)
+    assert sum(c["content"].count("x") for c in chunks) >= 200
+
+
+@pytest.mark.parametrize("max_tokens", [7, 8, 9, 10, 31])
+def test_multibyte_text_never_splits_characters(chunker, max_tokens):
+    text = "日本語のテキスト🙂と émoji " * 40
+    chunks = chunks_of(chunker, text, max_tokens=max_tokens)
+
+    assert all("�" not in c["content"] for c in chunks)
+    assert all(c["token_count"] <= max_tokens for c in chunks)
+    # Without overlap the windows cover the text (chunk edges are stripped)
+    assert "".join(c["content"] for c in chunks).replace(" ", "") == text.replace(" ", "")
+
+
+def test_overlap_repeats_tail_of_previous_chunk(chunker):
+    text = "".join(f"{i:03d}" for i in range(200))
+    chunks = chunks_of(chunker, text, max_tokens=60, overlap_tokens=12)
+
+    for previous, current in zip(chunks, chunks[1:]):
+        assert current["content"].startswith(previous["content"][-12:])
+
+
+def test_multibyte_overlap_starts_on_character(chunker):
+    text = "äöü€" * 100
+    chunks = chunks_of(chunker, text, max_tokens=21, overlap_tokens=5)
+
+    assert all("�" not in c["content"] for c in chunks)
+    for previous, current in zip(chunks, chunks[1:]):
+        overlap = current["content"][:2]
+        assert overlap in previous["content"]
+
+
+def test_split_into_segments_covers_text():
+    text = "# A\n" + "line\n" * 50 + "\n\n# B\n" + "x" * 300
+    segments = split_into_segments(text, max_chars=100)
+
+    assert "".join(segments) == text
+    assert all(len(s) <= 100 for s in segments)
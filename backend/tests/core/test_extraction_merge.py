@@ -0,0 +1,69 @@
+"""Tests for merging per-segment map intelligence and SQL extractions.
+
+Run with: python -m pytest tests/core/test_extraction_merge.py (from backend dir)
+"""
+
+from app.core.agentic_sql.extractor import merge_extractions
+from app.core.gemini_client import GeminiClient
+
+
+def test_merge_intelligence_unions_in_document_order():
+    merged = GeminiClient._merge_intelligence([
+        {"essence": "", "topics": ["Revenue", "Costs"], "entities": {"people": ["Ann"]},
+         "retrieval_hints": "q3 numbers", "document_type": "other",
+         "suggested_chunk_boundaries": [{"section": "Intro"}]},
+        {"essence": "Quarterly report", "topics": ["revenue ", "Hiring"],
+         "entities": {"people": ["ann", "Bob"], "organizations": ["Acme"]},
+         "retrieval_hints": "Q3 numbers", "document_type": "financial_report",
+         "suggested_chunk_boundaries": [{"section": "Results"}]},
+        {"essence": "Ignored", "topics": None, "entities": None, "document_type": "financial_report"},
+        {"document_type": "legal_contract"},
+    ])
+
+    assert merged["essence"] == "Quarterly report"
+    assert merged["topics"] == ["Revenue", "Costs", "Hiring"]
+    assert merged["entities"] == {"people": ["Ann", "Bob"], "organizations": ["Acme"]}
+    assert merged["retrieval_hints"] == "q3 numbers"
+    assert merged["document_type"] == "financial_report"
+    assert merged["suggested_chunk_boundaries"] == [{"section": "Intro"}, {"section": "Results"}]
+
+
+def test_merge_intelligence_defaults():
+    merged = GeminiClient._merge_intelligence([{"document_type": "other"}])
+
+    assert merged["essence"] == ""
+    assert merged["document_type"] == "other"
+    assert merged["topics"] == [] and merged["entities"] == {}
+
+
+def test_merge_extractions_deduplicates_across_segments():
+    merged = merge_extractions([
+        {
+            "metadata": {"document_type": "financial_report", "summary": "First part",
+                         "period_start": "2024-01-01", "period_end": "2024-03-31"},
+            "claims": [{"claim_text": "Revenue grew 4.2%."}, {"claim_text": ""}],
+            "metrics": [{"metric_name": "Revenue", "value": "$10M", "period": "Q1", "entity_name": "Acme"}],
+            "entities": [{"entity_name": "Acme Corp", "entity_type": "organization", "role": "mentioned"}],
+            "topics": [{"topic_name": "Revenue", "is_primary": False}],
+        },
+        {
+            "metadata": {"document_type": "financial_report", "summary": "Second part",
+                         "period_start": "2024-04-01", "period_end": "2024-06-30"},
+            "claims": [{"claim_text": "revenue grew 4.2%"}, {"claim_text": "Revenue grew 42%"}],
+            "metrics": [{"metric_name": "revenue", "value": "$10M", "period": "Q1", "entity_name": "ACME"},
+                        {"metric_name": "Revenue", "value": "$12M", "period": "Q2", "entity_name": "Acme"}],
+            "entities": [{"entity_name": "ACME corp.", "entity_type": "organization",
+                          "role": "subject", "title": "Issuer"}],
+            "topics": [{"topic_name": "revenue", "is_primary": True}],
+        },
+    ])
+
+    assert [c["claim_text"] for c in merged["claims"]] == ["Revenue grew 4.2%.", "Revenue grew 42%"]
+    assert [m["value"] for m in merged["metrics"]] == ["$10M", "$12M"]
+    assert merged["entities"] == [{"entity_name": "Acme Corp", "entity_type": "organization",
+                                   "role": "subject", "title": "Issuer"}]
+    assert merged["topics"] == [{"topic_name": "Revenue", "is_primary": True}]
+    assert merged["metadata"]["summary"] == "First part"
+    assert merged["metadata"]["document_type"] == "financial_report"
+    assert (merged["metadata"]["period_start"], merged["metadata"]["period_end"]) == \
+        ("2024-01-01", "2024-06-30")
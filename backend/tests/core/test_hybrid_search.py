@@ -0,0 +1,105 @@
+"""Tests for hybrid search fusion and best-effort vector indexing.
+
+Run with: python -m pytest tests/core/test_hybrid_search.py (from backend dir)
+"""
+
+import asyncio
+
+import pytest
+
+from app.core import hybrid_search
+from app.core.hybrid_search import HybridSearcher, reciprocal_rank_fusion
+
+
+def hit(chunk_id, score=None):
+    return {"chunk_id": chunk_id, "document_id": chunk_id.split("_c")[0], "score": score}
+
+
+def test_rrf_sums_reciprocal_ranks():
+    fused = reciprocal_rank_fusion([
+        [hit("a_c1", 9.0), hit("b_c1", 5.0), hit("c_c1", 1.0)],
+        [hit("b_c1", 0.9), hit("d_c1", 0.8)],
+    ], k=60)
+
+    assert [h["chunk_id"] for h in fused] == ["b_c1", "a_c1", "d_c1", "c_c1"]
+    assert fused[0]["score"] == round(1 / 62 + 1 / 61, 6)
+    assert fused[1]["score"] == round(1 / 61, 6)
+
+
+def test_rrf_keeps_first_occurrence_and_handles_empty_lists():
+    fused = reciprocal_rank_fusion([[], [hit("a_c1", 0.5)], [hit("a_c1", 7.0)]], k=1)
+
+    assert fused == [{"chunk_id": "a_c1", "document_id": "a", "score": 1.0}]
+    assert reciprocal_rank_fusion([[], []], k=60) == []
+
+
+def test_rrf_custom_key():
+    fused = reciprocal_rank_fusion([[hit("a_c1"), hit("a_c2")], [hit("b_c1")]], k=60, key="document_id")
+
+    assert [h["document_id"] for h in fused] == ["a", "b"]
+
+
+class StubGemini:
+    def __init__(self, fail: bool = False):
+        self.fail = fail
+
+    async def embed_texts(self, texts):
+        if self.fail:
+            raise RuntimeError("quota exceeded")
+        return [[0.1, 0.2] for _ in texts]
+
+
+@pytest.fixture
+def searcher(monkeypatch):
+    calls = []
+
+    async def delete(document_id):
+        calls.append(("delete", document_id))
+
+    async def store(units, vectors):
+        calls.append(("store", len(units)))
+        return len(units)
+
+    monkeypatch.setattr(hybrid_search, "delete_document_vectors", delete)
+    monkeypatch.setattr(hybrid_search, "store_chunk_vectors", store)
+    monkeypatch.setattr(HybridSearcher, "available", staticmethod(lambda: True))
+    searcher = HybridSearcher.__new__(HybridSearcher)
+    searcher.gemini = StubGemini()
+    searcher.calls = calls
+    return searcher
+
+
+RESULT = {"content": "body", "chunks": [
+    {"chunk_id": "c0", "content": "a", "section": "Intro"},
+    {"chunk_id": "c1", "content": "b"},
+]}
+
+
+def test_index_document_replaces_vectors(searcher):
+    outcome = asyncio.run(searcher.index_document("doc_1", "ws", "f.pdf", RESULT))
+
+    assert outcome == {"indexed": 2}
+    assert searcher.calls == [("delete", "doc_1"), ("store", 2)]
+
+
+def test_embedding_failure_keeps_earlier_vectors(searcher):
+    searcher.gemini = StubGemini(fail=True)
+
+    outcome = asyncio.run(searcher.index_document("doc_1", "ws", "f.pdf", RESULT))
+
+    assert outcome["indexed"] == 0
+    assert "quota exceeded" in outcome["error"]
+    assert outcome["incomplete"] is False
+    assert searcher.calls == []
+
+
+def test_insert_failure_is_reported_incomplete(searcher, monkeypatch):
+    async def store(units, vectors):
+        raise RuntimeError("Weaviate insert failed for 1 chunks")
+
+    monkeypatch.setattr(hybrid_search, "store_chunk_vectors", store)
+
+    outcome = asyncio.run(searcher.index_document("doc_1", "ws", "f.pdf", RESULT))
+
+    assert outcome["indexed"] == 0
+    assert outcome["incomplete"] is True
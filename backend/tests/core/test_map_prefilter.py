@@ -0,0 +1,62 @@
+"""Tests for the BM25 document map pre-filter.
+
+Run with: python -m pytest tests/core/test_map_prefilter.py (from backend dir)
+"""
+
+from app.core.map_prefilter import MapPrefilter, build_candidate_map, tokenize
+
+DOCUMENTS = [
+    {"id": "doc_a", "filename": "q3_report.pdf", "essence": "Quarterly revenue and margin report",
+     "topics": ["revenue", "margins"], "entities": {"organizations": ["Acme Corp"]}},
+    {"id": "doc_b", "filename": "lease.pdf", "essence": "Office lease agreement",
+     "topics": ["real estate"], "entities": {"organizations": ["Globex"]},
+     "chunks": [{"section": "Termination clause"}]},
+    {"id": "doc_c", "filename": "notes.md", "essence": "Meeting notes on hiring plans",
+     "topics": ["hiring"], "retrieval_hints": "headcount budget"},
+    {"id": "doc_d", "filename": "revenue_forecast.xlsx", "essence": "Revenue forecast revenue model",
+     "topics": ["revenue", "forecast"]},
+]
+
+
+def test_tokenize_lowercases_words():
+    assert tokenize("Acme's Q3-Revenue, 2024!") == ["acme", "s", "q3", "revenue", "2024"]
+
+
+def test_ranks_documents_by_bm25():
+    ranked = MapPrefilter(DOCUMENTS).search("revenue forecast", top_k=4)
+
+    assert ranked[:2] == ["doc_d", "doc_a"]
+    assert set(ranked) == {"doc_a", "doc_d"}
+
+
+def test_matches_entities_sections_and_hints():
+    prefilter = MapPrefilter(DOCUMENTS)
+
+    assert prefilter.search("globex", top_k=3) == ["doc_b"]
+    assert prefilter.search("termination", top_k=3) == ["doc_b"]
+    assert prefilter.search("headcount", top_k=3) == ["doc_c"]
+
+
+def test_rare_terms_outweigh_common_ones():
+    ranked = MapPrefilter(DOCUMENTS).search("revenue hiring", top_k=1)
+
+    assert ranked == ["doc_c"]
+
+
+def test_no_match_falls_back_to_newest_documents():
+    assert MapPrefilter(DOCUMENTS).search("zzz", top_k=2) == ["doc_d", "doc_c"]
+
+
+def test_empty_map():
+    assert MapPrefilter([]).search("revenue", top_k=5) == []
+
+
+def test_candidate_map_keeps_order_and_matching_cross_references():
+    document_map = {
+        "documents": DOCUMENTS,
+        "cross_references": {"entities": {"Acme Corp": ["doc_a", "doc_b"], "Globex": ["doc_b"]}}
+    }
+    candidates = build_candidate_map(document_map, ["doc_d", "doc_a"])
+
+    assert [d["id"] for d in candidates["documents"]] == ["doc_d", "doc_a"]
+    assert candidates["cross_references"] == {"entities": {"Acme Corp": ["doc_a"]}}
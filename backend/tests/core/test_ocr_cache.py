@@ -0,0 +1,80 @@
+"""Tests for the shared on-disk OCR cache.
+
+Run with: python -m pytest tests/core/test_ocr_cache.py (from backend dir)
+"""
+
+import multiprocessing
+import os
+
+from app.core.ocr_cache import OCRCache
+
+ENTRY = {"text": "x" * 1000}  # ~1 KB on disk
+
+
+def test_round_trip_and_counters(tmp_path):
+    cache = OCRCache(str(tmp_path), max_bytes=1 << 20)
+    key = cache.make_key(b"page", "engine", "v1")
+
+    assert cache.get(key) is None
+    cache.set(key, {"content": "text"})
+
+    assert cache.get(key) == {"content": "text"}
+    stats = cache.stats()
+    assert (stats["entries"], stats["hits"], stats["misses"]) == (1, 1, 1)
+
+
+def test_stats_are_shared_between_instances(tmp_path):
+    writer = OCRCache(str(tmp_path), max_bytes=1 << 20)
+    reader = OCRCache(str(tmp_path), max_bytes=1 << 20)
+    key = writer.make_key(b"page", "engine", "v1")
+    writer.set(key, ENTRY)
+
+    assert reader.get(key) == ENTRY
+    assert writer.stats()["hits"] == 1
+    assert reader.stats()["entries"] == 1
+
+
+def test_eviction_removes_least_recently_used(tmp_path):
+    cache = OCRCache(str(tmp_path), max_bytes=5000)
+    keys = [cache.make_key(str(i).encode(), "engine", "v1") for i in range(4)]
+    for age, key in enumerate(keys):
+        cache.set(key, ENTRY)
+        os.utime(cache._path(key), (age, age))  # written long ago, oldest first
+    assert cache.get(keys[0]) == ENTRY  # a hit makes it most recently used
+
+    for i in range(4, 6):
+        cache.set(cache.make_key(str(i).encode(), "engine", "v1"), ENTRY)
+
+    stats = cache.stats()
+    assert stats["size_mb"] * 1024 * 1024 <= 5000
+    assert stats["evictions"] == 2
+    assert [cache._path(key).exists() for key in keys] == [True, False, False, True]
+
+
+def test_rescan_counts_existing_files(tmp_path):
+    first = OCRCache(str(tmp_path), max_bytes=1 << 20)
+    first.set(first.make_key(b"a", "engine", "v1"), ENTRY)
+    (tmp_path / "stats.json").unlink()
+
+    assert OCRCache(str(tmp_path), max_bytes=1 << 20).stats()["entries"] == 1
+
+
+def _fill(cache_dir: str, worker: int) -> None:
+    cache = OCRCache(cache_dir, max_bytes=20_000)
+    for i in range(40):
+        cache.set(cache.make_key(f"{worker}-{i}".encode(), "engine", "v1"), ENTRY)
+
+
+def test_size_bound_holds_across_processes(tmp_path):
+    context = multiprocessing.get_context("spawn")
+    workers = [context.Process(target=_fill, args=(str(tmp_path), w)) for w in range(3)]
+    for process in workers:
+        process.start()
+    for process in workers:
+        process.join(60)
+
+    on_disk = sum(path.stat().st_size for path in tmp_path.glob("*/*.json"))
+    stats = OCRCache(str(tmp_path), max_bytes=20_000).stats()
+    assert on_disk <= 20_000
+    assert stats["entries"] == len(list(tmp_path.glob("*/*.json")))
+    assert round(on_disk / (1024 * 1024), 2) == stats["size_mb"]
@@ -0,0 +1,99 @@
+"""Tests for page-range PDF splitting and parallel OCR stitching.
+
+Run with: python -m pytest tests/core/test_ocr_processor.py (from backend dir)
+"""
+
+import asyncio
+from types import SimpleNamespace
+
+import fitz
+import pytest
+
+from app.core.ocr_processor import OCRProcessor
+
+
+def make_pdf(pages: int) -> bytes:
+    pdf = fitz.open()
+    for number in range(pages):
+        pdf.new_page().insert_text((72, 72), f"page {number + 1}")
+    data = pdf.tobytes()
+    pdf.close()
+    return data
+
+
+def page_texts(data: bytes) -> list[str]:
+    pdf = fitz.open(stream=data, filetype="pdf")
+    texts = [page.get_text().strip() for page in pdf]
+    pdf.close()
+    return texts
+
+
+class StubGemini:
+    """OCRs a range as its page texts; fails the first `failures[first page]` calls."""
+
+    def __init__(self, failures=None):
+        self.failures = dict(failures or {})
+        self.calls = []
+
+    async def ocr_pdf(self, data: bytes) -> dict:
+        texts = page_texts(data)
+        self.calls.append(texts[0])
+        if self.failures.get(texts[0], 0) > 0:
+            self.failures[texts[0]] -= 1
+            raise RuntimeError(f"transient error at {texts[0]}")
+        await asyncio.sleep(0.01 * (5 - len(self.calls) % 5))  # finish out of order
+        return {
+            "content": "\n".join(texts),
+            "metadata": {"has_tables": texts[0] == "page 5", "has_images": False, "estimated_tokens": len(texts)}
+        }
+
+
+def make_processor(gemini, pages_per_range=2, retry_rounds=1) -> OCRProcessor:
+    processor = OCRProcessor.__new__(OCRProcessor)
+    processor.gemini = gemini
+    processor.settings = SimpleNamespace(
+        ocr_pages_per_range=pages_per_range,
+        ocr_max_concurrency=2,
+        ocr_range_retry_rounds=retry_rounds
+    )
+    return processor
+
+
+def test_split_pdf_covers_every_page_in_order():
+    ranges = OCRProcessor._split_pdf(make_pdf(7), 3)
+
+    assert [(first, last) for first, last, _ in ranges] == [(0, 2), (3, 5), (6, 6)]
+    assert [text for _, _, data in ranges for text in page_texts(data)] == \
+        [f"page {n}" for n in range(1, 8)]
+
+
+def test_split_pdf_bytes_are_stable():
+    data = make_pdf(4)
+
+    assert OCRProcessor._split_pdf(data, 2) == OCRProcessor._split_pdf(data, 2)
+
+
+def test_ranges_are_stitched_in_page_order():
+    gemini = StubGemini()
+    result = asyncio.run(make_processor(gemini)._ocr_page_ranges(make_pdf(7)))
+
+    assert result["content"].split() == " ".join(f"page {n}" for n in range(1, 8)).split()
+    assert result["metadata"]["page_ranges"] == 4
+    assert result["metadata"]["has_tables"] is True
+    assert result["metadata"]["estimated_tokens"] == 7
+
+
+def test_failed_range_is_retried_alone():
+    gemini = StubGemini(failures={"page 3": 1})
+    result = asyncio.run(make_processor(gemini)._ocr_page_ranges(make_pdf(6)))
+
+    assert "page 3" in result["content"]
+    assert sorted(gemini.calls) == ["page 1", "page 3", "page 3", "page 5"]
+
+
+def test_range_failing_every_round_raises_with_pages():
+    gemini = StubGemini(failures={"page 3": 5})
+
+    with pytest.raises(RuntimeError, match="pages 3-4"):
+        asyncio.run(make_processor(gemini, retry_rounds=2)._ocr_page_ranges(make_pdf(6)))
+    assert gemini.calls.count("page 3") == 3
@@ -0,0 +1,68 @@
+"""Tests for token-budgeted SQL result summaries.
+
+Run with: python -m pytest tests/core/test_result_summary.py (from backend dir)
+"""
+
+import json
+
+from app.core.agentic_sql.result_summary import (
+    MAX_CELL_CHARS,
+    estimate_tokens,
+    summarize_result,
+    summarize_results,
+)
+
+
+def rows(n):
+    return [
+        {"id": i, "document_id": "doc_1", "empty": None, "topic": ["revenue", "costs"][i % 2],
+         "amount": float(i), "claim_text": f"claim number {i} " + "x" * 50}
+        for i in range(n)
+    ]
+
+
+def test_small_result_is_kept_whole_with_columns_pruned():
+    summary = summarize_result({"query": "SELECT *", "purpose": "p", "data": rows(3)}, 10_000)
+
+    assert summary["row_count"] == 3
+    assert summary["constant_columns"] == {"document_id": "doc_1"}
+    assert set(summary["rows"][0]) == {"id", "topic", "amount", "claim_text"}
+    assert "aggregates" not in summary and "omitted_rows" not in summary
+
+
+def test_large_result_is_sampled_within_budget():
+    summary = summarize_result({"query": "SELECT *", "data": rows(1000)}, 2000)
+
+    assert estimate_tokens(summary) <= 2000
+    assert summary["omitted_rows"] == 1000 - len(summary["rows"])
+    # Unordered results are sampled across all rows, not just the head
+    assert summary["rows"][-1]["id"] > 500
+    assert summary["aggregates"]["amount"] == {"min": 0.0, "max": 999.0, "mean": 499.5, "sum": 499500.0}
+    assert summary["aggregates"]["topic"] == {"distinct": 2, "top": [["revenue", 500], ["costs", 500]]}
+    assert "claim_text" not in summary["aggregates"]
+
+
+def test_ordered_result_keeps_head():
+    summary = summarize_result({"query": "SELECT * ORDER BY amount DESC", "data": rows(1000)}, 2000)
+
+    assert [row["id"] for row in summary["rows"]] == list(range(len(summary["rows"])))
+
+
+def test_long_cells_are_truncated():
+    data = [{"text": "y" * 5000}, {"text": "z"}]
+    summary = summarize_result({"query": "q", "data": data}, 10_000)
+
+    assert summary["rows"][0]["text"] == "y" * MAX_CELL_CHARS + "..."
+
+
+def test_errors_and_empty_results():
+    assert summarize_result({"query": "q", "error": "boom"}, 100) == {"query": "q", "purpose": "", "error": "boom"}
+    assert summarize_result({"query": "q", "data": []}, 100)["rows"] == []
+
+
+def test_budget_is_split_across_results():
+    summaries = summarize_results([{"query": f"q{i}", "data": rows(500)} for i in range(4)], 4000)
+
+    assert len(summaries) == 4
+    assert all(estimate_tokens(s) <= 1000 for s in summaries)
+    assert len(json.dumps(summaries)) // 4 <= 4000
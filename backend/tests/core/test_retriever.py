@@ -0,0 +1,97 @@
+"""Tests for resolving retrieval references in IntelligentRetriever._fetch_many.
+
+Run with: python -m pytest tests/core/test_retriever.py (from backend dir)
+"""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from app.core.retriever import CHUNK_REF_PATTERN, IntelligentRetriever
+from app.db.models import Document, DocumentChunk
+
+
+class FakeSession:
+    """Answers the IN queries from in-memory rows and records the requested ids."""
+
+    def __init__(self, documents, chunks):
+        self.rows = {Document: documents, DocumentChunk: chunks}
+        self.requested = {}
+
+    async def execute(self, statement):
+        model = statement.column_descriptions[0]["entity"]
+        ids = statement.whereclause.right.value
+        self.requested[model] = ids
+        key = "id" if model is Document else "chunk_id"
+        rows = [row for row in self.rows[model] if getattr(row, key) in ids]
+        return SimpleNamespace(scalars=lambda: rows)
+
+
+def doc(doc_id):
+    return SimpleNamespace(id=doc_id, filename=f"{doc_id}.pdf", content=f"content of {doc_id}")
+
+
+def chunk(chunk_id):
+    return SimpleNamespace(chunk_id=chunk_id, content=f"content of {chunk_id}")
+
+
+DOCUMENT_MAP = {"documents": [
+    {"id": "doc_1", "filename": "one.pdf", "essence": "First",
+     "chunks": [{"chunk_id": "doc_1_c2", "section": "Results", "context": "Middle"}]},
+    {"id": "doc_c12345678901", "filename": "hex.pdf", "essence": "Hex id"},  # also looks like "<id>_c<n>"
+]}
+
+
+def fetch(session, refs):
+    retriever = IntelligentRetriever.__new__(IntelligentRetriever)
+    retriever.db = session
+    return asyncio.run(retriever._fetch_many(refs, DOCUMENT_MAP))
+
+
+@pytest.mark.parametrize("ref, parsed", [
+    ("doc_1_c2", ("doc_1", "2")),
+    ("doc_abc_c12", ("doc_abc", "12")),
+    ("doc_c3_c4", ("doc_c3", "4")),
+])
+def test_chunk_ref_pattern_matches_chunk_references(ref, parsed):
+    assert CHUNK_REF_PATTERN.fullmatch(ref).groups() == parsed
+
+
+@pytest.mark.parametrize("ref", ["doc_1", "doc_1_c", "doc_1_c2a", "doc_1_cx2", "_c2"])
+def test_chunk_ref_pattern_rejects_other_ids(ref):
+    assert CHUNK_REF_PATTERN.fullmatch(ref) is None
+
+
+def test_documents_and_chunks_keep_reference_order():
+    session = FakeSession([doc("doc_1")], [chunk("doc_1_c2")])
+
+    results = fetch(session, ["doc_1_c2", "doc_1"])
+
+    assert [r["id"] for r in results] == ["doc_1_c2", "doc_1"]
+    assert results[0]["context"] == "From document: one.pdf Section: Results Middle"
+    assert results[1]["context"] == "Document: doc_1.pdf. First"
+
+
+def test_chunk_numbers_are_normalized():
+    session = FakeSession([], [chunk("doc_1_c2")])
+
+    results = fetch(session, ["doc_1_c02"])
+
+    assert session.requested[DocumentChunk] == ["doc_1_c2"]
+    assert [r["id"] for r in results] == ["doc_1_c2"]
+
+
+def test_map_document_ids_are_never_parsed_as_chunks():
+    session = FakeSession([doc("doc_c12345678901")], [])
+
+    results = fetch(session, ["doc_c12345678901"])
+
+    assert session.requested == {Document: ["doc_c12345678901"]}
+    assert [r["id"] for r in results] == ["doc_c12345678901"]
+
+
+def test_unknown_references_are_skipped():
+    session = FakeSession([doc("doc_1")], [])
+
+    assert [r["id"] for r in fetch(session, ["doc_missing", "doc_1", "doc_1_c9"])] == ["doc_1"]
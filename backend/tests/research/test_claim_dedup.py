@@ -0,0 +1,94 @@
+"""Unit tests for bulk claim deduplication.
+
+Checks find_similar_pairs against a brute-force top-k search.
+Imports the module directly to avoid triggering the research __init__ chain.
+Run with: python -m pytest tests/research/test_claim_dedup.py (from backend dir)
+"""
+
+import importlib.util
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+_backend_dir = Path(__file__).parent.parent.parent
+_spec = importlib.util.spec_from_file_location(
+    "claim_dedup",
+    _backend_dir / "app" / "research" / "services" / "claim_dedup.py"
+)
+claim_dedup = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(claim_dedup)
+
+
+def brute_force(vectors, threshold, k):
+    """Pairs where j is among i's top k, or i among j's, above threshold."""
+    matrix = vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+    sims = matrix @ matrix.T
+    np.fill_diagonal(sims, -np.inf)
+    pairs = set()
+    for i, row in enumerate(sims):
+        for j in np.argsort(-row, kind="stable")[:k]:
+            if row[j] > threshold:
+                pairs.add((min(i, j), max(i, j)))
+    return pairs
+
+
+def clustered_vectors(n, dim, clusters, noise, seed):
+    """Vectors around a few centres, so many pairs clear the threshold."""
+    rng = np.random.default_rng(seed)
+    centres = rng.standard_normal((clusters, dim))
+    return (centres[rng.integers(clusters, size=n)] + noise * rng.standard_normal((n, dim))).astype(np.float32)
+
+
+@pytest.mark.parametrize("n, block_size, threshold, k, noise", [
+    (300, 64, 0.5, 5, 0.6),
+    (300, 1000, 0.5, 5, 0.6),  # single block
+    (257, 50, 0.9, 3, 0.2),    # ragged last block
+    (200, 32, -1.0, 4, 0.6),   # every pair clears the threshold
+    (400, 64, 0.2, 2, 3.0),    # noisy clusters
+])
+def test_matches_brute_force(n, block_size, threshold, k, noise):
+    vectors = clustered_vectors(n, 32, clusters=5, noise=noise, seed=n)
+
+    pairs = claim_dedup.find_similar_pairs(vectors, threshold, k, block_size)
+
+    found = {(i, j) for i, j, _ in pairs}
+    assert found == brute_force(vectors.astype(np.float64), threshold, k)
+    assert len(found) == len(pairs)
+    assert all(i < j for i, j, _ in pairs)
+    scores = [s for _, _, s in pairs]
+    assert scores == sorted(scores, reverse=True)
+
+
+def test_dense_matches_stay_bounded_by_k():
+    # One tight cluster: all ~125k pairs clear the threshold
+    vectors = clustered_vectors(500, 16, clusters=1, noise=0.01, seed=1)
+
+    pairs = claim_dedup.find_similar_pairs(vectors, -1.0, 3, block_size=64)
+
+    assert 500 * 3 // 2 <= len(pairs) <= 500 * 3
+
+
+def test_similarities_are_cosine_and_capped():
+    vectors = np.array([[1.0, 0.0], [2.0, 0.0], [1.0, 1.0], [0.0, 1.0]], dtype=np.float32)
+
+    pairs = claim_dedup.find_similar_pairs(vectors, 0.5, 3)
+
+    by_pair = {(i, j): s for i, j, s in pairs}
+    assert by_pair[(0, 1)] == 1.0
+    assert by_pair[(0, 2)] == pytest.approx(np.sqrt(0.5), abs=1e-6)
+    assert (0, 3) not in by_pair
+
+
+def test_input_is_not_modified():
+    vectors = np.array([[3.0, 4.0], [4.0, 3.0]], dtype=np.float32)
+
+    claim_dedup.find_similar_pairs(vectors, 0.0, 1)
+
+    assert vectors.tolist() == [[3.0, 4.0], [4.0, 3.0]]
+
+
+def test_trivial_inputs():
+    assert claim_dedup.find_similar_pairs([], 0.5, 5) == []
+    assert claim_dedup.find_similar_pairs([[1.0, 0.0]], 0.5, 5) == []
+    assert claim_dedup.find_similar_pairs([[1.0, 0.0], [1.0, 0.0]], 0.5, 0) == []
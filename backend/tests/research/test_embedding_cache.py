@@ -0,0 +1,98 @@
+"""Unit tests for the SQLite embedding cache.
+
+Imports the module directly to avoid triggering the research __init__ chain.
+Run with: python -m pytest tests/research/test_embedding_cache.py (from backend dir)
+"""
+
+import importlib.util
+import os
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+_backend_dir = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(_backend_dir))
+os.environ.setdefault("GEMINI_API_KEY", "test")
+
+_spec = importlib.util.spec_from_file_location(
+    "embedding_cache",
+    _backend_dir / "app" / "research" / "services" / "embedding_cache.py"
+)
+embedding_cache = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(embedding_cache)
+EmbeddingCache = embedding_cache.EmbeddingCache
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return EmbeddingCache(str(tmp_path / "cache.sqlite3"), max_entries=100)
+
+
+def unit_vectors(n, dim=768, seed=0):
+    vectors = np.random.default_rng(seed).standard_normal((n, dim))
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+def test_keys_depend_on_text_model_and_dimension():
+    key = EmbeddingCache.make_key("claim", "text-embedding-004", 768)
+
+    assert key == EmbeddingCache.make_key("claim", "text-embedding-004", 768)
+    assert key != EmbeddingCache.make_key("claim ", "text-embedding-004", 768)
+    assert key != EmbeddingCache.make_key("claim", "BAAI/bge-base-en-v1.5", 768)
+    assert key != EmbeddingCache.make_key("claim", "text-embedding-004", 256)
+
+
+def test_float16_round_trip_keeps_cosine_similarity(cache):
+    vectors = unit_vectors(50)
+    keys = [f"k{i}" for i in range(50)]
+    cache.set_many({key: vector.tolist() for key, vector in zip(keys, vectors)})
+
+    found = cache.get_many(keys)
+    restored = np.array([found[key] for key in keys])
+
+    assert restored.shape == vectors.shape
+    assert np.abs(restored - vectors).max() < 1e-3
+    exact = vectors @ vectors.T
+    approx = restored @ restored.T / np.outer(np.linalg.norm(restored, axis=1), np.linalg.norm(restored, axis=1))
+    assert np.abs(exact - approx).max() < 1e-3
+
+
+def test_hits_misses_and_duplicate_keys(cache):
+    cache.set_many({"a": [0.5, 0.25]})
+
+    found = cache.get_many(["a", "a", "b"])
+
+    assert found == {"a": [0.5, 0.25]}
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["entries"]) == (1, 1, 1)
+
+
+def test_eviction_drops_least_recently_used(tmp_path):
+    cache = EmbeddingCache(str(tmp_path / "cache.sqlite3"), max_entries=10)
+    cache.set_many({f"old{i}": [float(i)] for i in range(8)})
+    cache.get_many(["old0", "old1"])  # recently used
+    cache.set_many({f"new{i}": [float(i)] for i in range(4)})
+
+    remaining = cache.get_many([f"old{i}" for i in range(8)] + [f"new{i}" for i in range(4)])
+
+    assert len(remaining) == 9  # down to 90% of max_entries
+    assert {"old0", "old1", "new0", "new1", "new2", "new3"} <= set(remaining)
+    assert len({f"old{i}" for i in range(2, 8)} - set(remaining)) == 3
+    assert cache.stats()["evictions"] == 3
+
+
+def test_shared_file_between_instances(tmp_path):
+    path = str(tmp_path / "cache.sqlite3")
+    EmbeddingCache(path, max_entries=100).set_many({"a": [1.0, 2.0]})
+
+    assert EmbeddingCache(path, max_entries=100).get_many(["a"]) == {"a": [1.0, 2.0]}
+
+
+def test_disabled_cache_is_a_no_op(tmp_path):
+    cache = EmbeddingCache(str(tmp_path / "cache.sqlite3"), max_entries=10, enabled=False)
+    cache.set_many({"a": [1.0]})
+
+    assert cache.get_many(["a"]) == {}
+    assert not (tmp_path / "cache.sqlite3").exists()
@@ -0,0 +1,126 @@
+"""Unit tests for bulk similarity candidate upserts.
+
+Imports the db module directly to avoid triggering the research __init__ chain.
+Run with: python -m pytest tests/research/test_similarity_candidates.py (from backend dir)
+"""
+
+import asyncio
+import importlib
+import sys
+import types
+from datetime import datetime
+from pathlib import Path
+from uuid import uuid4
+
+import pytest
+
+# Setup path
+_script_dir = Path(__file__).parent
+_backend_dir = _script_dir.parent.parent
+sys.path.insert(0, str(_backend_dir))
+
+
+@pytest.fixture
+def similarity_module(monkeypatch):
+    """Load app.research.db.similarity without running the package __init__ files."""
+    monkeypatch.setenv("GEMINI_API_KEY", "test")
+    before = set(sys.modules)
+    for name in ("app.research", "app.research.db"):
+        package = types.ModuleType(name)
+        package.__path__ = [str(_backend_dir / name.replace(".", "/"))]
+        monkeypatch.setitem(sys.modules, name, package)
+    module = importlib.import_module("app.research.db.similarity")
+    yield module
+    for name in set(sys.modules) - before:
+        if name.startswith("app.research"):
+            del sys.modules[name]
+
+
+class FakeTable:
+    """similarity_candidates with its UNIQUE (claim_id, similar_claim_id)."""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self._op = None
+
+    def select(self, columns):
+        self._op = ("select", None)
+        return self
+
+    def in_(self, column, values):
+        self._op = ("select", (column, set(values)))
+        return self
+
+    def upsert(self, rows, on_conflict):
+        assert on_conflict == "claim_id,similar_claim_id"
+        self._op = ("upsert", rows)
+        return self
+
+    def execute(self):
+        kind, arg = self._op
+        if kind == "select":
+            column, values = arg
+            return types.SimpleNamespace(data=[r for r in self.rows if r[column] in values])
+
+        stored = []
+        for row in arg:
+            existing = next(
+                (r for r in self.rows
+                 if (r["claim_id"], r["similar_claim_id"]) == (row["claim_id"], row["similar_claim_id"])),
+                None
+            )
+            if existing is None:
+                existing = {"id": str(uuid4()), "status": "pending", "created_at": datetime.now()}
+                self.rows.append(existing)
+            existing.update(row)
+            stored.append(dict(existing))
+        return types.SimpleNamespace(data=stored)
+
+
+class FakeClient:
+    def __init__(self, rows):
+        self.table_ = FakeTable(rows)
+
+    def table(self, name):
+        assert name == "similarity_candidates"
+        return self.table_
+
+
+def row(claim_id, similar_claim_id, score, status="pending"):
+    return {
+        "id": str(uuid4()), "claim_id": claim_id, "similar_claim_id": similar_claim_id,
+        "similarity_score": score, "similarity_type": "semantic",
+        "status": status, "created_at": datetime.now(),
+    }
+
+
+def test_reversed_pair_updates_existing_row(similarity_module):
+    a, b, c = (str(uuid4()) for _ in range(3))
+    rows = [row(b, a, 0.9, status="reviewed")]  # stored by the old per-claim code
+    db = similarity_module.SimilarityOperations(FakeClient(rows))
+
+    stored = asyncio.run(db.upsert_candidates([
+        {"claim_id": a, "similar_claim_id": b, "similarity_score": 0.93},
+        {"claim_id": a, "similar_claim_id": c, "similarity_score": 0.88},
+    ]))
+
+    assert len(rows) == 2
+    assert (rows[0]["claim_id"], rows[0]["similar_claim_id"]) == (b, a)
+    assert rows[0]["similarity_score"] == 0.93
+    assert rows[0]["status"] == "reviewed"
+    assert {(str(s.claim_id), str(s.similar_claim_id)) for s in stored} == {(b, a), (a, c)}
+
+
+def test_rerun_does_not_duplicate_pairs(similarity_module):
+    ids = [str(uuid4()) for _ in range(250)]
+    candidates = [
+        {"claim_id": ids[i], "similar_claim_id": ids[i + 1], "similarity_score": 0.9}
+        for i in range(len(ids) - 1)
+    ]
+    rows = []
+    db = similarity_module.SimilarityOperations(FakeClient(rows))
+
+    asyncio.run(db.upsert_candidates(candidates, batch_size=100))
+    asyncio.run(db.upsert_candidates(candidates, batch_size=100))
+
+    assert len(rows) == len(candidates)
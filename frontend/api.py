@@ -57,6 +57,24 @@ def upload_document(file, extraction_mode: str = "both") -> dict:
     )
 
 
+def queue_documents(files, extraction_mode: str = "both") -> dict:
+    """Queue documents for background ingestion; returns batch id and jobs."""
+    payload = [
+        ("files", (f.name, f.getvalue(), f.type or "application/octet-stream"))
+        for f in files
+    ]
+    return api_request(
+        "POST",
+        f"/api/ingestion/jobs/bulk?extraction_mode={extraction_mode}",
+        files=payload
+    )
+
+
+def load_ingestion_jobs(batch_id: str) -> dict:
+    """Load ingestion job status for a batch."""
+    return api_request("GET", f"/api/ingestion/jobs?batch_id={batch_id}&limit=1000")
+
+
 def delete_document(doc_id: str) -> bool:
     """Delete document from backend."""
     result = api_request("DELETE", f"/api/documents/{doc_id}")
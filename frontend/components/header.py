@@ -1,7 +1,8 @@
 """Header component with stats and upload functionality."""
+import time
 import streamlit as st
-from api import load_documents, load_agentic_stats, upload_document
-from config import ALLOWED_DOC_TYPES
+from api import load_documents, load_agentic_stats, queue_documents, load_ingestion_jobs
+from config import ALLOWED_DOC_TYPES, INGESTION_POLL_SECONDS, INGESTION_STALL_SECONDS
 
 
 def render_header():
@@ -72,25 +73,56 @@ def _render_upload():
 
 
 def _process_uploads(uploaded_files, extraction_mode: str):
-    """Process uploaded files."""
+    """Queue uploaded files and poll their ingestion jobs until they finish or stall."""
     progress = st.empty()
-    results = []
-
-    for i, file in enumerate(uploaded_files):
-        progress.markdown(f"Processing {i+1}/{len(uploaded_files)}: {file.name}...")
-        result = upload_document(file, extraction_mode)
-        results.append((file.name, result))
+    progress.markdown(f"Queueing {len(uploaded_files)} file(s)...")
+
+    batch = queue_documents(uploaded_files, extraction_mode)
+    if not batch or "error" in batch:
+        progress.empty()
+        err = batch.get('error', 'Unknown error') if batch else 'Failed'
+        st.markdown(f"<div class='upload-item upload-err'>ERR {err}</div>", unsafe_allow_html=True)
+        return
+
+    jobs = batch.get("jobs", [])
+    # A crashed worker leaves jobs "running" until the lock is reclaimed;
+    # give up waiting once nothing has changed for the lock timeout
+    last_change = time.monotonic()
+    snapshot = None
+    while jobs and any(j["status"] in ("queued", "running") for j in jobs):
+        current_snapshot = [(j["status"], j.get("stages")) for j in jobs]
+        if current_snapshot != snapshot:
+            snapshot, last_change = current_snapshot, time.monotonic()
+        elif time.monotonic() - last_change > INGESTION_STALL_SECONDS:
+            break
+
+        done = sum(1 for j in jobs if j["status"] in ("completed", "failed"))
+        running = [j for j in jobs if j["status"] == "running"]
+        current = ""
+        if running:
+            stage = next((s for s, state in running[0]["stages"].items() if state == "running"), "")
+            current = f" - {running[0]['filename']}: {stage}"
+        progress.markdown(f"Processed {done}/{len(jobs)}{current}")
+
+        time.sleep(INGESTION_POLL_SECONDS)
+        status = load_ingestion_jobs(batch["batch_id"])
+        if status and "error" not in status:
+            jobs = status.get("jobs", jobs)
 
     progress.empty()
 
     # Show results
     result_html = "<div style='font-size:0.8rem;'>"
-    for name, r in results:
-        if r and "error" not in r:
+    for job in jobs:
+        name = job["filename"]
+        if job["status"] == "completed":
             result_html += f"<div class='upload-item upload-ok'>OK {name}</div>"
+        elif job["status"] in ("queued", "running"):
+            result_html += f"<div class='upload-item'>... {name}: still processing, check the jobs list (/api/ingestion/jobs)</div>"
         else:
-            err = r.get('error', 'Unknown error') if r else 'Failed'
-            result_html += f"<div class='upload-item upload-err'>ERR {name}: {err}</div>"
+            result_html += f"<div class='upload-item upload-err'>ERR {name}: {job.get('error') or job['status']}</div>"
+    for rejected in batch.get("rejected", []):
+        result_html += f"<div class='upload-item upload-err'>ERR {rejected['filename']}: {rejected['error']}</div>"
     result_html += "</div>"
     st.markdown(result_html, unsafe_allow_html=True)
 
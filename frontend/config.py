@@ -10,6 +10,10 @@ OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 # API timeout settings (in seconds)
 API_TIMEOUT = 180.0
 API_TIMEOUT_SHORT = 10.0
+INGESTION_POLL_SECONDS = 2.0
+# Stop waiting on uploads when no job has progressed for this long; matches
+# the backend's ingestion_lock_timeout_seconds, after which stuck jobs are reclaimed
+INGESTION_STALL_SECONDS = float(os.getenv("INGESTION_STALL_SECONDS", "1800"))
 
 # File upload settings
 ALLOWED_DOC_TYPES = ["pdf", "png", "jpg", "jpeg", "webp", "md"]